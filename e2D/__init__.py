@@ -23,7 +23,7 @@ from .types import (
 )
 
 # Import original e2D modules
-from .text_renderer import DEFAULT_16_TEXT_STYLE, MONO_16_TEXT_STYLE, Pivots, TextRenderer, TextLabel, TextStyle
+from .text_renderer import DEFAULT_16_TEXT_STYLE, MONO_16_TEXT_STYLE, Pivots, TextAlign, TextRenderer, TextLabel, DynamicTextLabel, TextLayout, TextStyle
 from .shapes import ShapeRenderer, ShapeLabel, InstancedShapeBatch, FillMode
 from .devices import Keyboard, Mouse, KeyState, Keys, MouseButtons
 from .commons import get_pattr, get_pattr_value, set_pattr_value, get_uniform, PI, PI_HALF, PI_QUARTER, TAU
@@ -938,6 +938,9 @@ __all__ = [
     # Text rendering
     'TextRenderer',
     'TextLabel',
+    'DynamicTextLabel',
+    'TextLayout',
+    'TextAlign',
     'TextStyle',
     'Pivots',
     'DEFAULT_16_TEXT_STYLE',
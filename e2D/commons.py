@@ -1,5 +1,5 @@
 import numpy as np
-from .types import ComputeShaderType, Number, ProgramAttrType, ProgramType, UniformBlockType, UniformType, pArray
+from .types import BufferType, ComputeShaderType, ContextType, Number, ProgramAttrType, ProgramType, UniformBlockType, UniformType, pArray
 
 def _is_array_uniform(u: UniformType) -> bool:
     return u.array_length > 1
@@ -83,6 +83,52 @@ def set_pattr_value(prog_id: str | ProgramType, name: str, value: Number | pArra
     else:
         attr.value = value
 
+class StreamingBuffer:
+    """
+    Ring-allocated vertex buffer for immediate-mode drawing.
+    
+    Every push() sub-allocates the next region of the ring, so consecutive draws never
+    overwrite vertices the GPU may still be reading. When the ring is exhausted the
+    storage is orphaned (the driver keeps the old storage alive for pending draws) and
+    allocation restarts at 0; a single push larger than the buffer grows it.
+    Draw with vao.render(mode, vertices=count, first=push(data)).
+    """
+    ctx: ContextType
+    buffer: BufferType
+    stride: int
+    size: int
+    cursor: int
+    
+    def __init__(self, ctx: ContextType, stride: int, size: int = 65536) -> None:
+        """
+        Args:
+            ctx: ModernGL context
+            stride: Vertex size in bytes, every region starts on a vertex boundary
+            size: Initial buffer size in bytes (rounded down to a multiple of stride)
+        """
+        self.ctx = ctx
+        self.stride = stride
+        self.size = max(stride, size - size % stride)
+        self.buffer = self.ctx.buffer(reserve=self.size, dynamic=True)
+        self.cursor = 0
+    
+    def push(self, data: bytes | np.ndarray) -> int:
+        """Write data into a fresh region of the ring and return its first vertex index."""
+        nbytes = data.nbytes if isinstance(data, np.ndarray) else len(data)
+        if self.cursor + nbytes > self.size:
+            if nbytes > self.size:
+                size = self.size
+                while size < nbytes:
+                    size *= 2
+                self.size = size - size % self.stride
+            self.buffer.orphan(self.size)
+            self.cursor = 0
+        
+        offset = self.cursor
+        self.buffer.write(data, offset=offset)
+        self.cursor += nbytes
+        return offset // self.stride
+
 PI = np.pi
 PI_HALF = np.pi / 2
 PI_QUARTER = np.pi / 4
@@ -0,0 +1,172 @@
+import os
+from itertools import islice
+from typing import Callable, Iterator, Optional
+import numpy as np
+from .types import BufferType, ContextType
+
+# progress(bytes_done, bytes_total), called after every chunk
+ProgressCallback = Callable[[int, int], None]
+
+DEFAULT_CHUNK_ROWS = 1 << 20
+
+def _npy_layout(path: str) -> tuple[int, tuple[int, ...], np.dtype, bool]:
+    """(data offset, shape, dtype, fortran order) from a .npy header, without reading the data."""
+    with open(path, 'rb') as f:
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+        return f.tell(), shape, dtype, fortran_order
+
+def _iter_mapped(path: str, offset: int, rows: int, columns: int, dtype: np.dtype, chunk_rows: int,
+                 first_row: int, progress: Optional[ProgressCallback]) -> Iterator[np.ndarray]:
+    """Map one chunk of rows at a time and yield it as float32, so only one chunk is ever resident."""
+    row_bytes = columns * dtype.itemsize
+    total_bytes = (rows - first_row) * row_bytes
+    for start in range(first_row, rows, chunk_rows):
+        count = min(chunk_rows, rows - start)
+        mapped = np.memmap(path, dtype=dtype, mode='r', offset=offset + start * row_bytes, shape=(count, columns))
+        chunk = np.ascontiguousarray(mapped, dtype='f4')
+        del mapped  # Unmap before the next chunk
+        yield chunk
+        if progress is not None:
+            progress((start - first_row + count) * row_bytes, total_bytes)
+
+def iter_npy_chunks(path: str, chunk_rows: int = DEFAULT_CHUNK_ROWS, last_rows: Optional[int] = None,
+                    progress: Optional[ProgressCallback] = None) -> Iterator[np.ndarray]:
+    """
+    Yield a 1D/2D C-ordered .npy file as (rows, columns) float32 chunks, memory-mapping
+    one chunk at a time.
+
+    Args:
+        path: .npy file
+        chunk_rows: Rows per chunk
+        last_rows: Only read the last rows (e.g. a stream capacity)
+        progress: progress(bytes_done, bytes_total)
+    """
+    offset, shape, dtype, fortran_order = _npy_layout(path)
+    if fortran_order or len(shape) not in (1, 2) or dtype.hasobject:
+        raise ValueError(f"Expected a C-ordered 1D or 2D numeric array in '{path}', got shape {shape}")
+    rows = shape[0]
+    columns = shape[1] if len(shape) == 2 else 1
+    first_row = max(rows - last_rows, 0) if last_rows is not None else 0
+    return _iter_mapped(path, offset, rows, columns, dtype, chunk_rows, first_row, progress)
+
+def iter_bin_chunks(path: str, dtype: np.dtype | str = 'f4', columns: int = 2, offset: int = 0,
+                    chunk_rows: int = DEFAULT_CHUNK_ROWS, last_rows: Optional[int] = None,
+                    progress: Optional[ProgressCallback] = None) -> Iterator[np.ndarray]:
+    """
+    Yield a raw binary file of row-major `columns` x `dtype` records as float32 chunks,
+    memory-mapping one chunk at a time. A trailing partial record is ignored.
+
+    Args:
+        path: Raw binary file
+        dtype: Element type of the file
+        columns: Elements per row
+        offset: Header bytes to skip
+        chunk_rows: Rows per chunk
+        last_rows: Only read the last rows (e.g. a stream capacity)
+        progress: progress(bytes_done, bytes_total)
+    """
+    dtype = np.dtype(dtype)
+    rows = (os.path.getsize(path) - offset) // (columns * dtype.itemsize)
+    first_row = max(rows - last_rows, 0) if last_rows is not None else 0
+    return _iter_mapped(path, offset, rows, columns, dtype, chunk_rows, first_row, progress)
+
+def iter_csv_chunks(path: str, delimiter: str = ',', usecols: Optional[tuple[int, ...]] = None,
+                    skip_header: int = 0, chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                    progress: Optional[ProgressCallback] = None) -> Iterator[np.ndarray]:
+    """
+    Yield a numeric CSV file as (rows, columns) float32 chunks, parsing `chunk_rows` lines
+    at a time with numpy's vectorized text reader. Empty lines are skipped.
+
+    Args:
+        path: CSV file
+        delimiter: Field separator
+        usecols: Columns to keep, all by default
+        skip_header: Lines to skip at the start of the file
+        chunk_rows: Lines per chunk
+        progress: progress(bytes_done, bytes_total)
+    """
+    total_bytes = os.path.getsize(path)
+    done_bytes = 0
+    with open(path, 'rb') as f:
+        for line in islice(f, skip_header):
+            done_bytes += len(line)
+        while True:
+            lines = list(islice(f, chunk_rows))
+            if not lines:
+                break
+            done_bytes += sum(len(line) for line in lines)
+            lines = [line for line in lines if line.strip()]
+            if lines:
+                yield np.loadtxt(lines, delimiter=delimiter, usecols=usecols, ndmin=2, dtype='f4')
+            if progress is not None:
+                progress(done_bytes, total_bytes)
+
+def file_shape(path: str, **options) -> Optional[tuple[int, int]]:
+    """(rows, columns) of a .npy or raw binary file from its header/size, None for CSV."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in ('.csv', '.txt'):
+        return None
+    if extension == '.npy':
+        _, shape, _, _ = _npy_layout(path)
+        return shape[0], shape[1] if len(shape) == 2 else 1
+    dtype = np.dtype(options.get('dtype', 'f4'))
+    columns = options.get('columns', 2)
+    return (os.path.getsize(path) - options.get('offset', 0)) // (columns * dtype.itemsize), columns
+
+def iter_file_chunks(path: str, chunk_rows: int = DEFAULT_CHUNK_ROWS, last_rows: Optional[int] = None,
+                     progress: Optional[ProgressCallback] = None, **options) -> Iterator[np.ndarray]:
+    """
+    Pick the chunk reader from the extension: .npy, .csv/.txt, anything else is raw binary.
+    Extra keyword options go to the matching iter_*_chunks function.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.npy':
+        return iter_npy_chunks(path, chunk_rows, last_rows, progress, **options)
+    if extension in ('.csv', '.txt'):
+        return iter_csv_chunks(path, chunk_rows=chunk_rows, progress=progress, **options)
+    return iter_bin_chunks(path, chunk_rows=chunk_rows, last_rows=last_rows, progress=progress, **options)
+
+def load_into_stream(stream, path: str, chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                     progress: Optional[ProgressCallback] = None, **options) -> int:
+    """
+    Push a file into a GpuStream ((N, 2) rows) or MultiStream ((N, K + 1) rows) chunk by
+    chunk and return the rows pushed. For .npy and binary files only the rows that fit in
+    the stream capacity are read. Render thread only, like push().
+    """
+    push = stream.push_rows if hasattr(stream, 'push_rows') else stream.push
+    pushed = 0
+    for chunk in iter_file_chunks(path, chunk_rows, stream.capacity, progress, **options):
+        push(chunk)
+        pushed += len(chunk)
+    return pushed
+
+def load_buffer(ctx: ContextType, path: str, chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                progress: Optional[ProgressCallback] = None, **options) -> tuple[BufferType, int]:
+    """
+    Load a file into a new float32 GPU buffer chunk by chunk, e.g. for HistogramPlot.set_source
+    or RootEnv compute passes. Returns (buffer, rows); .npy and binary files get an exact-size
+    buffer, CSV files (whose size is not known in advance) one grown by doubling.
+    """
+    shape = file_shape(path, **options)
+    buffer = ctx.buffer(reserve=max(shape[0] * shape[1] * 4, 4)) if shape is not None else None
+    written = 0
+    rows = 0
+    for chunk in iter_file_chunks(path, chunk_rows, None, progress, **options):
+        data = chunk.tobytes()
+        if buffer is None or written + len(data) > buffer.size:
+            # Grow by doubling, copying on the GPU
+            grown = ctx.buffer(reserve=max(len(data) * 2, (buffer.size * 2) if buffer else 0, written + len(data)))
+            if buffer is not None:
+                ctx.copy_buffer(grown, buffer, size=written)
+                buffer.release()
+            buffer = grown
+        buffer.write(data, offset=written)
+        written += len(data)
+        rows += len(chunk)
+    if buffer is None:
+        buffer = ctx.buffer(reserve=4)
+    return buffer, rows
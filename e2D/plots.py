@@ -3,18 +3,31 @@ from e2D import V2, Color, RootEnv, lerp
 import numpy as np
 import moderngl
 import struct
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass
 from enum import Enum
+import hashlib
+import itertools
 import os
+import threading
+import time
+import weakref
 from .commons import set_uniform_block_binding
-from .types import ColorType, ComputeShaderType, Number, VAOType, ContextType, ProgramType, BufferType, ArrayLike
+from .types import ColorType, ComputeShaderType, Number, VAOType, ContextType, ProgramType, BufferType, ArrayLike, TextureType, FramebufferType
 from .vectors import Vector2D
 from .colors import normalize_color
 from .color_defs import GRAY10, GRAY50, WHITE, RED, CYAN
 
 class ShaderManager:
-    """Cache and manage shader files for the plots module."""
+    """
+    Cache and manage shader files for the plots module.
+    Compiled programs are cached per context and keyed on a hash of their sources, so
+    plot objects built from identical shaders share one program. Shared programs keep
+    their uniform values between users, so every draw must set the uniforms it relies on.
+    Cached programs hold their context alive; call release(ctx) before releasing a context.
+    """
     _cache = {}
+    _programs: dict[ContextType, dict[str, ProgramType | ComputeShaderType]] = {}
     
     @staticmethod
     def load_shader(path: str) -> str:
@@ -31,17 +44,126 @@ class ShaderManager:
         return ShaderManager._cache[path]
     
     @staticmethod
-    def create_program(ctx: ContextType, vertex_path: str, fragment_path: str) -> ProgramType:
+    def _source_key(kind: str, *sources: Optional[str]) -> str:
+        digest = hashlib.sha1(kind.encode('utf-8'))
+        for source in sources:
+            digest.update(b'\0' + (source or '').encode('utf-8'))
+        return digest.hexdigest()
+    
+    @staticmethod
+    def program(ctx: ContextType, vertex_shader: str, fragment_shader: Optional[str] = None,
+                geometry_shader: Optional[str] = None) -> ProgramType:
+        """Compile a program from sources, once per context."""
+        programs = ShaderManager._programs.setdefault(ctx, {})
+        key = ShaderManager._source_key('program', vertex_shader, fragment_shader, geometry_shader)
+        if key not in programs:
+            programs[key] = ctx.program(vertex_shader=vertex_shader, fragment_shader=fragment_shader,
+                                        geometry_shader=geometry_shader)
+        return programs[key]
+    
+    @staticmethod
+    def compute(ctx: ContextType, compute_shader: str) -> ComputeShaderType:
+        """Compile a compute shader from source, once per context."""
+        programs = ShaderManager._programs.setdefault(ctx, {})
+        key = ShaderManager._source_key('compute', compute_shader)
+        if key not in programs:
+            programs[key] = ctx.compute_shader(compute_shader)
+        return programs[key]
+    
+    @staticmethod
+    def create_program(ctx: ContextType, vertex_path: str, fragment_path: str,
+                       geometry_path: Optional[str] = None) -> ProgramType:
         """Create a program from shader files."""
         vertex_shader = ShaderManager.load_shader(vertex_path)
         fragment_shader = ShaderManager.load_shader(fragment_path)
-        return ctx.program(vertex_shader=vertex_shader, fragment_shader=fragment_shader)
+        geometry_shader = ShaderManager.load_shader(geometry_path) if geometry_path else None
+        return ShaderManager.program(ctx, vertex_shader, fragment_shader, geometry_shader)
     
     @staticmethod
     def create_compute(ctx: ContextType, compute_path: str) -> ComputeShaderType:
         """Create a compute shader from file."""
         compute_shader = ShaderManager.load_shader(compute_path)
-        return ctx.compute_shader(compute_shader)
+        return ShaderManager.compute(ctx, compute_shader)
+    
+    @staticmethod
+    def release(ctx: ContextType) -> None:
+        """Release the programs and colormap textures cached for a context and forget it."""
+        for program in ShaderManager._programs.pop(ctx, {}).values():
+            program.release()
+        for texture in _colormap_textures.pop(ctx, {}).values():
+            texture.release()
+
+# Colormap control colors, evenly spaced from 0 to 1
+COLORMAPS: dict[str, list[str]] = {
+    'viridis': ['#440154', '#482878', '#3e4989', '#31688e', '#26828e', '#1f9e89', '#35b779', '#6ece58', '#b5de2b', '#fde725'],
+    'magma': ['#000004', '#180f3d', '#440f76', '#721f81', '#9e2f7f', '#cd4071', '#f1605d', '#fd9668', '#feca8d', '#fcfdbf'],
+    'inferno': ['#000004', '#1b0c41', '#4a0c6b', '#781c6d', '#a52c60', '#cf4446', '#ed6925', '#fb9b06', '#f7d13d', '#fcffa4'],
+    'plasma': ['#0d0887', '#46039f', '#7201a8', '#9c179e', '#bd3786', '#d8576b', '#ed7953', '#fb9f3a', '#fdca26', '#f0f921'],
+    'coolwarm': ['#3b4cc0', '#7b9ff9', '#c0d4f5', '#f2cbb7', '#ee8468', '#b40426'],
+    'gray': ['#000000', '#ffffff'],
+}
+
+_colormap_textures: dict[ContextType, dict[str, TextureType]] = {}
+
+def colormap_lut(colormap: str | ArrayLike, size: int = 256) -> np.ndarray:
+    """
+    Sample a colormap into a (size, 4) float32 RGBA lookup table.
+    colormap is a COLORMAPS name or a (K, 3 | 4) array of evenly spaced control colors.
+    """
+    if isinstance(colormap, str):
+        if colormap not in COLORMAPS:
+            raise ValueError(f"Unknown colormap '{colormap}', expected one of {list(COLORMAPS)}")
+        hexes = [h.lstrip('#') for h in COLORMAPS[colormap]]
+        stops = np.array([[int(h[i:i + 2], 16) / 255.0 for i in (0, 2, 4)] for h in hexes], dtype='f4')
+    else:
+        stops = np.asarray(colormap, dtype='f4')
+    if stops.shape[1] == 3:
+        stops = np.concatenate([stops, np.ones((len(stops), 1), dtype='f4')], axis=1)
+    
+    t = np.linspace(0.0, 1.0, size)
+    positions = np.linspace(0.0, 1.0, len(stops))
+    return np.stack([np.interp(t, positions, stops[:, c]) for c in range(4)], axis=1).astype('f4')
+
+def colormap_texture(ctx: ContextType, colormap: str | ArrayLike, size: int = 256) -> TextureType:
+    """
+    (size x 1) RGBA8 lookup texture for a colormap, linearly filtered and clamped.
+    Textures of named colormaps are cached per context until ShaderManager.release(ctx).
+    """
+    cache = _colormap_textures.setdefault(ctx, {}) if isinstance(colormap, str) else None
+    key = f"{colormap}:{size}" if cache is not None else None
+    if cache is not None and key in cache:
+        return cache[key]
+    
+    lut = np.round(colormap_lut(colormap, size) * 255.0).astype(np.uint8)
+    texture = ctx.texture((size, 1), 4, lut.tobytes())
+    texture.filter = (moderngl.LINEAR, moderngl.LINEAR)
+    texture.repeat_x = False
+    texture.repeat_y = False
+    if cache is not None:
+        cache[key] = texture
+    return texture
+
+def pack_colors(colors: ArrayLike) -> np.ndarray:
+    """(N, 3 | 4) float colors in 0..1 -> (N,) uint32 RGBA8, red in the lowest byte."""
+    colors = np.asarray(colors, dtype='f4')
+    if colors.shape[1] == 3:
+        colors = np.concatenate([colors, np.ones((len(colors), 1), dtype='f4')], axis=1)
+    rgba = np.round(np.clip(colors, 0.0, 1.0) * 255.0).astype(np.uint8)
+    return np.ascontiguousarray(rgba).view(np.uint32).ravel()
+
+class AxisLink:
+    """
+    Center and zoom of one axis shared by several View2D, e.g. plots with a common time
+    axis. A view pushes its value when it changes the axis and pulls newer values in flush().
+    """
+    center: float
+    zoom: float
+    version: int
+    
+    def __init__(self, center: float, zoom: float) -> None:
+        self.center = center
+        self.zoom = zoom
+        self.version = 0
 
 class View2D:
     """
@@ -56,6 +178,13 @@ class View2D:
     
     World → NDC:  ndc = (world - center) * scale
     NDC → World:  world = ndc / scale + center
+    
+    pan/zoom/set_viewport only mark the view dirty; the UBO is written once in flush()
+    (or use(), called by Plot2D.render and every draw taking a view), however many changes
+    were made that frame. Draws that take no view must come after use(). Axes can be linked
+    to other views through AxisLink: a linked view pulls newer values in flush() too, so
+    each follower is written at most once per frame. After editing center/zoom directly
+    call mark_dirty(), or update_buffer() to write now.
     """
     ctx: ContextType
     binding: int
@@ -64,6 +193,13 @@ class View2D:
     aspect: float
     resolution: ArrayLike
     buffer: BufferType
+    dirty: bool
+    stamp: int
+    links: list[Optional[AxisLink]]
+    
+    # Last view bound to each (context, binding), so draws that take no view can tell which one they see
+    _bound: "weakref.WeakValueDictionary[tuple[int, int], View2D]" = weakref.WeakValueDictionary()
+    _stamps = itertools.count(1)
     
     def __init__(self, ctx: ContextType, binding: int = 0) -> None:
         self.ctx = ctx
@@ -72,26 +208,72 @@ class View2D:
         self.zoom = np.array([1.0, 1.0], dtype='f4')
         self.aspect = 1.0
         self.resolution = np.array([1920.0, 1080.0], dtype='f4')
+        self.dirty = False
+        self.stamp = 0  # Serial of the last UBO write, unique across views
+        self.links = [None, None]  # AxisLink per axis (x, y)
+        self._link_versions = [-1, -1]
         
         self.buffer = self.ctx.buffer(reserve=32)
-        self.buffer.bind_to_uniform_block(self.binding)
+        self._bind(self.binding)
         self.update_buffer()
 
+    @staticmethod
+    def bound(ctx: ContextType, binding: int = 0) -> Optional['View2D']:
+        """The View2D last bound to `binding` on ctx, if it is still alive."""
+        return View2D._bound.get((id(ctx), binding))
+
+    def _bind(self, binding: int) -> None:
+        self.buffer.bind_to_uniform_block(binding)
+        View2D._bound[(id(self.ctx), binding)] = self
+
+    def mark_dirty(self) -> None:
+        """Schedule a UBO write and publish the linked axes."""
+        self.dirty = True
+        for axis, link in enumerate(self.links):
+            if link is not None and (link.center != self.center[axis] or link.zoom != self.zoom[axis]):
+                link.center = float(self.center[axis])
+                link.zoom = float(self.zoom[axis])
+                link.version += 1
+                self._link_versions[axis] = link.version
+
+    def link_axis(self, axis: int, link: Optional[AxisLink]) -> None:
+        """Follow `link` on axis 0 (x) or 1 (y), None unlinks. The link's values apply on the next flush()."""
+        self.links[axis] = link
+        self._link_versions[axis] = -1
+
+    def flush(self) -> bool:
+        """Pull newer linked axes and write the UBO if anything changed. Returns True when written."""
+        for axis, link in enumerate(self.links):
+            if link is not None and self._link_versions[axis] != link.version:
+                self.center[axis] = link.center
+                self.zoom[axis] = link.zoom
+                self._link_versions[axis] = link.version
+                self.dirty = True
+        if self.dirty:
+            self.update_buffer()
+            return True
+        return False
+
+    def use(self, binding: Optional[int] = None) -> None:
+        """flush() and bind the UBO (to self.binding by default)."""
+        self.flush()
+        self._bind(self.binding if binding is None else binding)
+
     def update_win_size(self, width: float, height: float) -> None:
         self.resolution = np.array([width, height], dtype='f4')
         self.aspect = width / height if height > 0 else 1.0
-        self.update_buffer()
+        self.mark_dirty()
 
     def pan(self, dx: float, dy: float) -> None:
         """dx, dy in NDC units [-1, 1]."""
         self.center[0] -= dx / self.zoom[0]
         self.center[1] -= dy / self.zoom[1]
-        self.update_buffer()
+        self.mark_dirty()
 
     def zoom_step(self, factor: float) -> None:
         """Uniform zoom on both axes."""
         self.zoom *= factor
-        self.update_buffer()
+        self.mark_dirty()
 
     def zoom_at(self, factor: float, ndc_x: float, ndc_y: float) -> None:
         """Uniform zoom by factor, keeping (ndc_x, ndc_y) stationary."""
@@ -99,9 +281,12 @@ class View2D:
         self.zoom *= factor
         self.center[0] += ndc_x * (1.0 / prev_zoom[0] - 1.0 / self.zoom[0])
         self.center[1] += ndc_y * (1.0 / prev_zoom[1] - 1.0 / self.zoom[1])
-        self.update_buffer()
+        self.mark_dirty()
 
     def update_buffer(self) -> None:
+        """Write the UBO now."""
+        self.dirty = False
+        self.stamp = next(View2D._stamps)
         data = struct.pack(
             '2f2f2f1f1f',
             self.resolution[0], self.resolution[1],
@@ -135,7 +320,7 @@ class View2D:
         self.center[1] = lerp(self.center[1], target_cy, center_interpolate)
         self.zoom[0]   = lerp(self.zoom[0],   target_zx, zoom_interpolate)
         self.zoom[1]   = lerp(self.zoom[1],   target_zy, zoom_interpolate)
-        self.update_buffer()
+        self.mark_dirty()
 
 @dataclass
 class PlotSettings:
@@ -146,17 +331,31 @@ class PlotSettings:
     show_grid: bool = True
     grid_color: ColorType = Color(0.2, 0.2, 0.2, 1.0)
     grid_spacing: float = 1.0
+    cache_grid: bool = False  # Opt-in: redraw the grid/axis only when the view or these settings change
 
 @dataclass
 class CurveSettings:
     color: ColorType = WHITE
     width: float = 2.0
     count: int = 1024
+    adaptive: bool = False     # ComputeCurve: view-dependent sampling, `count` becomes the vertex budget
+    tolerance: float = 0.25    # Adaptive: allowed deviation from the true curve, in pixels
+    coarse_count: int = 256    # Adaptive: segments of the first pass (at most 1024)
+
+class ImplicitBackend(Enum):
+    FRAGMENT = 0          # Per-pixel distance estimate in a full-screen fragment shader
+    MARCHING_SQUARES = 1  # Compute-shader contour extraction into reusable line segments
 
 @dataclass
 class ImplicitSettings:
     color: ColorType = CYAN
     thickness: float = 2.0
+    backend: ImplicitBackend = ImplicitBackend.FRAGMENT
+    grid_size: tuple[int, int] = (256, 256)  # Marching squares cells across the view
+    cached: bool = True         # Re-evaluate only when the view, settings or uniforms change
+    progressive: bool = False   # Low resolution while the view moves, full once it settles
+    preview_scale: float = 0.25 # Resolution scale of the progressive preview
+    settle_time: float = 0.15   # Seconds without view changes before the full-resolution pass
 
 class LineType(Enum):
     NONE = 0
@@ -176,6 +375,125 @@ class StreamSettings:
     line_width: float = 2.0
     curve_segments: int = 10
 
+@dataclass
+class ScatterSettings:
+    color: ColorType = CYAN   # Used when no per-point colors or values are given
+    size: float = 4.0         # Point diameter in pixels when no per-point sizes are given
+    colormap: str = 'viridis'
+    value_range: Optional[tuple[float, float]] = None  # None uses the data min/max
+
+@dataclass
+class DensitySettings:
+    colormap: str = 'viridis'
+    bin_size: float = 1.0      # Bin width in pixels
+    hexagonal: bool = False    # Hexagonal bins instead of square ones
+    log_scale: bool = True     # Map log(1 + count) instead of the count
+    opacity: float = 1.0
+
+@dataclass
+class HeatmapSettings:
+    colormap: str = 'viridis'
+    value_range: Optional[tuple[float, float]] = None  # None uses the min/max of the last set_data()
+    interpolate: bool = False  # Bilinear filtering between cells instead of sharp cells
+    opacity: float = 1.0
+
+@dataclass
+class HistogramSettings:
+    bins: int = 64
+    value_range: Optional[tuple[float, float]] = None  # None uses the data min/max, found on the GPU
+    color: ColorType = CYAN
+    bar_gap: float = 0.1       # Fraction of the bin width left between bars
+    baseline: float = 0.0      # World y of the bar bottoms
+    normalize: bool = False    # Tallest bar is `height` world units instead of its count
+    height: float = 1.0
+    log_scale: bool = False    # Bar height from log(1 + count)
+
+class RenderCache:
+    """
+    Keeps the output of an expensive full-viewport pass (implicit functions, grids) in an
+    offscreen texture and composites it on the following frames. The pass only runs again
+    when the caller's key (view center/zoom, settings, uniforms, ...) or the viewport size
+    changes. In progressive mode a changing key renders at preview_scale resolution, and
+    the full-resolution pass runs once the key has been stable for settle_time seconds.
+    """
+    ctx: ContextType
+    key: object
+    scale: float
+    texture: Optional[TextureType]
+    fbo: Optional[FramebufferType]
+    prog: ProgramType
+    quad: BufferType
+    vao: VAOType
+    
+    def __init__(self, ctx: ContextType) -> None:
+        self.ctx = ctx
+        self.key = None    # Key of the cached image, None when invalid
+        self.scale = 1.0   # Resolution scale of the cached image
+        self.texture = None
+        self.fbo = None
+        self._last_key = None
+        self._changed_at = float('-inf')
+        
+        self.prog = ShaderManager.create_program(
+            ctx,
+            "shaders/quad_vertex.glsl",
+            "shaders/cache_fragment.glsl"
+        )
+        self.quad = ctx.buffer(np.array([-1,-1, 1,-1, -1,1, 1,1], dtype='f4'))
+        self.vao = ctx.simple_vertex_array(self.prog, self.quad, "in_vert")
+
+    def invalidate(self) -> None:
+        """Force the next draw() to run its render pass."""
+        self.key = None
+
+    def draw(self, key: object, render, progressive: bool = False,
+             preview_scale: float = 0.25, settle_time: float = 0.15) -> bool:
+        """
+        Composite the cached image into the current viewport, running render() into the
+        cache first when it is stale. render() draws a full-viewport pass with blending
+        disabled, so the cache holds exactly the colors it outputs.
+        Returns True when render() ran.
+        """
+        now = time.perf_counter()
+        if key != self._last_key:
+            if self._last_key is not None:
+                self._changed_at = now
+            self._last_key = key
+        scale = preview_scale if progressive and now - self._changed_at < settle_time else 1.0
+        
+        viewport = self.ctx.viewport
+        size = (max(1, int(viewport[2] * scale)), max(1, int(viewport[3] * scale)))
+        stale = key != self.key or scale != self.scale
+        if self.texture is None or self.texture.size != size:
+            if self.texture is not None:
+                self.fbo.release()
+                self.texture.release()
+            self.texture = self.ctx.texture(size, 4)
+            self.fbo = self.ctx.framebuffer(color_attachments=[self.texture])
+            stale = True
+        
+        if stale:
+            previous_fbo = self.ctx.fbo
+            previous_scissor = self.ctx.scissor
+            self.fbo.use()
+            self.ctx.scissor = None
+            self.fbo.clear(0.0, 0.0, 0.0, 0.0)
+            self.ctx.disable(moderngl.BLEND)
+            render()
+            previous_fbo.use()
+            self.ctx.viewport = viewport
+            self.ctx.scissor = previous_scissor
+            self.key = key
+            self.scale = scale
+        
+        # Sharp 1:1 copy at full resolution, smooth upscale for previews
+        self.texture.filter = (moderngl.NEAREST, moderngl.NEAREST) if self.scale == 1.0 else (moderngl.LINEAR, moderngl.LINEAR)
+        self.texture.use(0)
+        self.prog['image'] = 0
+        self.ctx.enable(moderngl.BLEND)
+        self.vao.render(moderngl.TRIANGLE_STRIP)
+        return stale
+
 class Plot2D:
     """A specific rectangular area on the screen for plotting."""
     ctx: ContextType
@@ -189,6 +507,7 @@ class Plot2D:
     grid_prog: ProgramType
     grid_quad: BufferType
     grid_vao: VAOType
+    grid_cache: RenderCache
     is_dragging: bool
     last_mouse_pos: tuple[float, float]
     
@@ -223,6 +542,7 @@ class Plot2D:
             pass
         self.grid_quad = self.ctx.buffer(np.array([-1,-1, 1,-1, -1,1, 1,1], dtype='f4'))
         self.grid_vao = self.ctx.simple_vertex_array(self.grid_prog, self.grid_quad, "in_vert")
+        self.grid_cache = RenderCache(self.ctx)
 
     def set_rect(self, top_left: tuple[float, float] | Vector2D, bottom_right: tuple[float, float] | Vector2D) -> None:
         self.top_left = top_left
@@ -238,27 +558,82 @@ class Plot2D:
         y = win_height - self.bottom_right[1]
         self.viewport = (int(x), int(y), int(w), int(h))
         
-    def render(self, draw_callback) -> None:
-        last_viewport = self.ctx.viewport
+    def link(self, other: 'Plot2D', x: bool = True, y: bool = True) -> None:
+        """
+        Pan and zoom this plot together with `other` on the chosen axes. Plots of the same
+        size linked on both axes share other's View2D, so one UBO write serves them all;
+        otherwise each linked axis follows an AxisLink shared with `other`.
+        """
+        if x and y and (self.width, self.height) == (other.width, other.height):
+            self.view = other.view
+            return
+        for axis, linked in enumerate((x, y)):
+            if not linked:
+                continue
+            link = other.view.links[axis]
+            if link is None:
+                link = AxisLink(float(other.view.center[axis]), float(other.view.zoom[axis]))
+                other.view.link_axis(axis, link)
+            self.view.link_axis(axis, link)
+
+    def unlink(self) -> None:
+        """Give this plot its own unlinked view, starting from the current center and zoom."""
+        view = View2D(self.ctx)
+        view.center[:] = self.view.center
+        view.zoom[:] = self.view.zoom
+        view.update_win_size(self.width, self.height)
+        self.view = view
+
+    def _render_contents(self, draw_callback) -> None:
         self.ctx.viewport = self.viewport
         self.ctx.scissor = self.viewport
         # self.ctx.clear(*normalize_color(self.settings.bg_color).to_array())
         
-        self.view.buffer.bind_to_uniform_block(0)
+        self.view.use(0)
         
         if self.settings.show_grid or self.settings.show_axis:
-            self.grid_prog['grid_color'] = self.settings.grid_color
-            self.grid_prog['axis_color'] = self.settings.axis_color
-            self.grid_prog['spacing'] = self.settings.grid_spacing
-            self.grid_prog['show_grid'] = self.settings.show_grid
-            self.grid_prog['show_axis'] = self.settings.show_axis
-            self.grid_vao.render(moderngl.TRIANGLE_STRIP)
+            if self.settings.cache_grid:
+                key = (tuple(self.view.center), tuple(self.view.zoom), tuple(self.settings.grid_color),
+                       tuple(self.settings.axis_color), self.settings.grid_spacing,
+                       self.settings.show_grid, self.settings.show_axis)
+                self.grid_cache.draw(key, self._draw_grid)
+            else:
+                self._draw_grid()
         
         draw_callback()
+
+    def render(self, draw_callback) -> None:
+        last_viewport = self.ctx.viewport
+        self._render_contents(draw_callback)
         self.ctx.scissor = None
         
         self.ctx.viewport = last_viewport
 
+    @staticmethod
+    def render_all(plots: list['Plot2D'], draw_callbacks: list) -> None:
+        """
+        Render several plots in one pass, e.g. a grid of linked plots: the previous
+        viewport is saved and restored (and the scissor reset) once for the whole batch
+        instead of once per plot, and views shared between plots are written only once.
+        """
+        if not plots:
+            return
+        ctx = plots[0].ctx
+        last_viewport = ctx.viewport
+        for plot, draw_callback in zip(plots, draw_callbacks):
+            plot._render_contents(draw_callback)
+        ctx.scissor = None
+        
+        ctx.viewport = last_viewport
+
+    def _draw_grid(self) -> None:
+        self.grid_prog['grid_color'] = self.settings.grid_color
+        self.grid_prog['axis_color'] = self.settings.axis_color
+        self.grid_prog['spacing'] = self.settings.grid_spacing
+        self.grid_prog['show_grid'] = self.settings.show_grid
+        self.grid_prog['show_axis'] = self.settings.show_axis
+        self.grid_vao.render(moderngl.TRIANGLE_STRIP)
+
     def contains(self, x, y) -> bool:
         return (self.top_left[0] <= x <= self.bottom_right[0] and 
                 self.top_left[1] <= y <= self.bottom_right[1])
@@ -276,14 +651,453 @@ class Plot2D:
         ndc_y = 1.0 - (rel_y / self.height) * 2.0
         self.view.zoom_at(factor, ndc_x, ndc_y)
 
+class Backpressure(Enum):
+    """What StagingRing.append does when the staging area is full."""
+    DROP_OLDEST = 0  # Discard the oldest staged points, the display always shows the newest data
+    DROP_NEWEST = 1  # Reject the points that don't fit
+    BLOCK = 2        # Wait until the render thread drains (up to the ring timeout)
+
+class StagingRing:
+    """
+    Thread-safe, double-buffered CPU staging area for points produced off the render thread.
+    Any thread (socket readers, asyncio tasks, ...) can append(); the render thread calls
+    swap() once per frame, which only exchanges the two arrays under the lock and returns
+    the filled one, so copying to the GPU never blocks the producers.
+    """
+    capacity: int
+    policy: Backpressure
+    timeout: Optional[float]
+    appended: int
+    dropped: int
+    
+    def __init__(self, capacity: int, width: int = 2, policy: Backpressure = Backpressure.DROP_OLDEST,
+                 timeout: Optional[float] = None) -> None:
+        """
+        Args:
+            capacity: Points that can be staged between two swaps
+            width: Floats per point
+            policy: Backpressure policy when the staging area is full
+            timeout: Longest wait in seconds for Backpressure.BLOCK (None waits forever)
+        """
+        self.capacity = capacity
+        self.policy = policy
+        self.timeout = timeout
+        self._front = np.empty((capacity, width), dtype='f4')
+        self._back = np.empty_like(self._front)
+        self._count = 0
+        self._cond = threading.Condition(threading.Lock())
+        
+        # Counters, in points
+        self.appended = 0
+        self.dropped = 0
+
+    @property
+    def pending(self) -> int:
+        """Points currently waiting for the next swap."""
+        return self._count
+
+    def append(self, points: ArrayLike) -> int:
+        """Stage points from any thread and return how many were accepted."""
+        points = np.asarray(points, dtype='f4').reshape(-1, self._front.shape[1])
+        n = len(points)
+        if n == 0:
+            return 0
+        
+        with self._cond:
+            if self.policy == Backpressure.BLOCK:
+                accepted = 0
+                while accepted < n:
+                    while self._count == self.capacity:
+                        if not self._cond.wait(self.timeout):
+                            self.appended += accepted
+                            self.dropped += n - accepted
+                            return accepted
+                    take = min(n - accepted, self.capacity - self._count)
+                    self._front[self._count:self._count + take] = points[accepted:accepted + take]
+                    self._count += take
+                    accepted += take
+                self.appended += n
+                return n
+            
+            free = self.capacity - self._count
+            if n > free and self.policy == Backpressure.DROP_NEWEST:
+                self._front[self._count:] = points[:free]
+                self._count = self.capacity
+                self.appended += free
+                self.dropped += n - free
+                return free
+            
+            if n >= self.capacity:
+                # Everything staged so far and the head of the new points fall out
+                self.dropped += self._count + n - self.capacity
+                self._front[:] = points[n - self.capacity:]
+                self._count = self.capacity
+            else:
+                if n > free:
+                    overflow = n - free
+                    self._front[:self._count - overflow] = self._front[overflow:self._count]
+                    self._count -= overflow
+                    self.dropped += overflow
+                self._front[self._count:self._count + n] = points
+                self._count += n
+            self.appended += n
+            return n
+
+    def swap(self) -> np.ndarray:
+        """
+        Take everything staged so far (render thread only).
+        The returned array stays valid until the next swap.
+        """
+        with self._cond:
+            count = self._count
+            self._front, self._back = self._back, self._front
+            self._count = 0
+            self._cond.notify_all()
+        return self._back[:count]
+
+class LodLevel:
+    """
+    One level of a LodPyramid: a GPU ring of buckets, each holding the lowest and the
+    highest point of bucket_size consecutive samples as two vec2 in time order.
+    """
+    ctx: ContextType
+    bucket_size: int
+    capacity: int
+    buffer: BufferType
+    done: int
+    partial: bool
+    carry: np.ndarray
+    
+    def __init__(self, ctx: ContextType, bucket_size: int, capacity: int) -> None:
+        self.ctx = ctx
+        self.bucket_size = bucket_size
+        self.capacity = capacity
+        self.buffer = ctx.buffer(data=np.zeros(capacity * 4, dtype='f4').tobytes())
+        self.done = 0        # Completed buckets so far
+        self.partial = False  # Whether bucket `done` is partially filled
+        self.carry = np.empty((0, 4), dtype='f4')  # Completed inputs of the partial bucket
+
+    @property
+    def count(self) -> int:
+        """Buckets written so far, including the partial one."""
+        return self.done + self.partial
+
+    @staticmethod
+    def reduce(items: np.ndarray, factor: int) -> np.ndarray:
+        """(N * factor, 4) items of (x_low, y_low, x_high, y_high) -> (N, 4) merged items."""
+        groups = items.reshape(-1, factor, 4)
+        rows = np.arange(len(groups))
+        low = groups[:, :, 1].argmin(axis=1)
+        high = groups[:, :, 3].argmax(axis=1)
+        return np.stack([groups[rows, low, 0], groups[rows, low, 1],
+                         groups[rows, high, 2], groups[rows, high, 3]], axis=1)
+
+    def push(self, items: np.ndarray, partial: Optional[np.ndarray], factor: int) -> tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        Feed the completed items of the level below (plus its partial item, if any) and
+        return this level's newly completed buckets and its current partial bucket.
+        """
+        merged = np.concatenate([self.carry, items]) if len(self.carry) else items
+        full = len(merged) // factor
+        completed = self.reduce(merged[:full * factor], factor) if full else np.empty((0, 4), dtype='f4')
+        self.carry = merged[full * factor:].copy()
+        
+        tail = self.carry if partial is None else np.concatenate([self.carry, partial[None]])
+        new_partial = self.reduce(tail, len(tail))[0] if len(tail) else None
+        
+        # The previous partial bucket sits at index `done` and is overwritten here
+        out = completed if new_partial is None else np.concatenate([completed, new_partial[None]])
+        if len(out):
+            self._write(self.done, out)
+        self.done += full
+        self.partial = new_partial is not None
+        return completed, new_partial
+
+    def _write(self, first: int, buckets: np.ndarray) -> None:
+        if len(buckets) > self.capacity:
+            first += len(buckets) - self.capacity
+            buckets = buckets[-self.capacity:]
+        
+        # Store each bucket's two points in time order so line strips run forward
+        swap = buckets[:, 2] < buckets[:, 0]
+        data = buckets.astype('f4')
+        data[swap] = data[swap][:, [2, 3, 0, 1]]
+        data = data.tobytes()
+        
+        slot = first % self.capacity
+        count = len(buckets)
+        if slot + count <= self.capacity:
+            self.buffer.write(data, offset=slot * 16)
+        else:
+            first_part = self.capacity - slot
+            self.buffer.write(data[:first_part * 16], offset=slot * 16)
+            self.buffer.write(data[first_part * 16:], offset=0)
+
+class LodPyramid:
+    """
+    Min/max decimation pyramid for a GpuStream.
+    Level L groups factor**L consecutive samples into one bucket keeping their lowest and
+    highest point, so drawing through the buckets keeps every peak visible while costing
+    two vertices per bucket. All levels are updated incrementally on every push.
+    """
+    factor: int
+    levels: list[LodLevel]
+    
+    def __init__(self, ctx: ContextType, capacity: int, factor: int = 4, min_buckets: int = 256) -> None:
+        """
+        Args:
+            ctx: ModernGL context
+            capacity: Sample capacity of the stream
+            factor: Samples (or buckets of the level below) merged into one bucket
+            min_buckets: Coarsest level still kept, in buckets
+        """
+        self.factor = factor
+        self.levels = []
+        bucket_size = factor
+        while capacity // bucket_size >= min_buckets:
+            # +2 covers the partially evicted first bucket and the partial last one
+            self.levels.append(LodLevel(ctx, bucket_size, capacity // bucket_size + 2))
+            bucket_size *= factor
+
+    def push(self, points: np.ndarray) -> None:
+        items = np.concatenate([points, points], axis=1)
+        partial = None
+        for level in self.levels:
+            items, partial = level.push(items, partial, self.factor)
+
+    def shift(self, offset: tuple[float, float] | Vector2D) -> None:
+        """Apply a shift_points() offset to the CPU-side carry of every level."""
+        for level in self.levels:
+            level.carry[:, 0::2] += offset[0]
+            level.carry[:, 1::2] += offset[1]
+
+class SampleIndex:
+    """
+    CPU copy of the x of every sample in a GpuStream ring, so the samples inside an x
+    range are found by binary search whatever the spacing. Pushes also record the last
+    sample where x went backwards and every sample whose step left the running spacing:
+    culling by x needs the live samples ordered, and LOD levels (buckets of a fixed
+    sample count) only match the on-screen density where the spacing is uniform.
+    """
+    capacity: int
+    x: np.ndarray
+    total: int
+    spacing: float
+    last_x: Optional[float]
+    unordered: int
+    irregular: list[int]
+    
+    TOLERANCE = 0.5  # Largest relative step change still counted as uniform spacing
+    
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.x = np.zeros(capacity, dtype='f4')
+        self.total = 0         # Samples pushed since creation
+        self.spacing = 0.0     # Running step, the reference for uniform spacing
+        self.last_x = None
+        self.unordered = -1    # Last sample whose x is below the previous one (or NaN)
+        self.irregular = []    # Live samples whose step is off the running spacing, in order
+
+    @property
+    def size(self) -> int:
+        return min(self.total, self.capacity)
+
+    def push(self, xs: np.ndarray) -> None:
+        """Append the x of N samples, in stored coordinates."""
+        xs = np.asarray(xs, dtype='f4').ravel()
+        if len(xs) == 0:
+            return
+        x64 = xs.astype(np.float64)
+        steps = np.diff(x64) if self.last_x is None else np.diff(x64, prepend=self.last_x)
+        first = self.total + (1 if self.last_x is None else 0)  # Sample ending steps[0]
+        if len(steps):
+            unordered = np.flatnonzero(~(steps >= 0.0))
+            if len(unordered):
+                self.unordered = first + int(unordered[-1])
+            spacing = self.spacing if first > 1 else float(steps[0])
+            irregular = np.abs(steps - spacing) > self.TOLERANCE * abs(spacing)
+            self.irregular.extend((first + np.flatnonzero(irregular)).tolist())
+            regular = steps[~irregular]
+            # Follow the rate: the mean of the steps that matched, or the last one if none did
+            self.spacing = float(regular.mean()) if len(regular) else float(steps[-1])
+        
+        count = len(xs)
+        if count > self.capacity:
+            xs = xs[-self.capacity:]
+        slot = (self.total + count - len(xs)) % self.capacity
+        head = min(len(xs), self.capacity - slot)
+        self.x[slot:slot + head] = xs[:head]
+        self.x[:len(xs) - head] = xs[head:]
+        self.total += count
+        self.last_x = float(xs[-1])
+        del self.irregular[:bisect_left(self.irregular, self.total - self.capacity)]
+
+    def find(self, value: float, side: str = 'left') -> int:
+        """Index (counted since creation) of the first live sample with x >= value, or > value for side='right'."""
+        size = self.size
+        start = (self.total - size) % self.capacity
+        older = self.x[start:min(start + size, self.capacity)]
+        newer = self.x[:size - len(older)]
+        count = int(np.searchsorted(older, value, side))
+        if count == len(older) and len(newer):
+            count += int(np.searchsorted(newer, value, side))
+        return self.total - size + count
+
+    def x_at(self, index: int) -> float:
+        return float(self.x[index % self.capacity])
+
+    def ordered(self, first: int) -> bool:
+        """Whether x never decreases from sample `first` on."""
+        return self.unordered <= first
+
+    def uniform(self, first: int, last: int) -> bool:
+        """Whether samples first..last are ordered and evenly spaced."""
+        if self.unordered > first:
+            return False
+        after = bisect_right(self.irregular, first)
+        return after == len(self.irregular) or self.irregular[after] > last
+
+    def shift(self, dx: float) -> None:
+        self.x += np.float32(dx)
+        if self.last_x is not None:
+            self.last_x += dx
+
+@dataclass
+class Bounds:
+    """Bounding box and mean of a set of points, in world coordinates."""
+    x_min: float
+    y_min: float
+    x_max: float
+    y_max: float
+    mean_x: float
+    mean_y: float
+    count: int
+
+class BoundsReducer:
+    """
+    GPU min/max/mean of a ring range of vec2 points (a GpuStream buffer or any SSBO).
+    A compute pass reduces the range into one tiny partial per workgroup; results are
+    double-buffered, so reduce() first collects the pass queued on the previous frame,
+    which the GPU has long finished, then queues the next one. Nothing waits on the
+    work just submitted and the points never leave the GPU.
+    """
+    ctx: ContextType
+    prog: ComputeShaderType
+    results: list[BufferType]
+    latest: Optional[Bounds]
+    
+    GROUPS = 64  # Workgroups per pass, i.e. partials merged on the CPU
+    PARTIAL_DTYPE = np.dtype([('lo', '2f4'), ('hi', '2f4'), ('sum', '2f4'), ('count', 'u4'), ('_pad', 'u4')])
+    
+    def __init__(self, ctx: ContextType) -> None:
+        self.ctx = ctx
+        self.prog = ShaderManager.create_compute(ctx, "shaders/bounds_compute.glsl")
+        self.results = [ctx.buffer(reserve=self.GROUPS * self.PARTIAL_DTYPE.itemsize) for _ in range(2)]
+        self._offsets: list[Optional[tuple[float, float]]] = [None, None]  # Offset of the pass queued in each slot
+        self._slot = 0
+        self.latest = None
+
+    def _collect(self, slot: int) -> None:
+        offset = self._offsets[slot]
+        if offset is None:
+            return
+        self._offsets[slot] = None
+        partials = np.frombuffer(self.results[slot].read(), dtype=self.PARTIAL_DTYPE)
+        partials = partials[partials['count'] > 0]
+        if len(partials) == 0:
+            self.latest = None
+            return
+        lo = partials['lo'].min(axis=0).astype(np.float64) + offset
+        hi = partials['hi'].max(axis=0).astype(np.float64) + offset
+        count = int(partials['count'].sum(dtype=np.uint64))
+        mean = partials['sum'].astype(np.float64).sum(axis=0) / count + offset
+        self.latest = Bounds(float(lo[0]), float(lo[1]), float(hi[0]), float(hi[1]),
+                             float(mean[0]), float(mean[1]), count)
+
+    def reduce(self, buffer: BufferType, start_index: int, count: int, capacity: int,
+               offset: tuple[float, float] = (0.0, 0.0)) -> Optional[Bounds]:
+        """
+        Queue the reduction of `count` points starting at `start_index` of a ring of
+        `capacity` vec2, and return the bounds queued by the previous call (None at first).
+        `offset` is added to the results, e.g. GpuStream.offset.
+        """
+        previous = 1 - self._slot
+        self._collect(previous)
+        
+        if count > 0:
+            buffer.bind_to_storage_buffer(binding=1)
+            self.results[self._slot].bind_to_storage_buffer(binding=2)
+            self.prog['start_index'] = start_index % capacity
+            self.prog['count'] = count
+            self.prog['capacity'] = capacity
+            self.prog.run(self.GROUPS)
+            self.ctx.memory_barrier()
+            self._offsets[self._slot] = (float(offset[0]), float(offset[1]))
+        self._slot = previous
+        return self.latest
+
+    def flush(self) -> Optional[Bounds]:
+        """Collect every queued pass now (waits for the GPU), e.g. for a one-off fit."""
+        self._collect(1 - self._slot)
+        self._collect(self._slot)
+        return self.latest
+
+    @staticmethod
+    def fit(view: View2D, bounds: Bounds, margin: float = 0.05,
+            center_interpolate: float = 1, zoom_interpolate: float = 1) -> None:
+        """Fit the view to the bounds plus `margin` of their size on every side."""
+        pad_x = (bounds.x_max - bounds.x_min) * margin
+        pad_y = (bounds.y_max - bounds.y_min) * margin
+        view.set_viewport(V2(bounds.x_min - pad_x, bounds.y_max + pad_y),
+                          V2(bounds.x_max + pad_x, bounds.y_min - pad_y),
+                          center_interpolate, zoom_interpolate)
+
 class GpuStream:
-    """Ring-buffer on GPU for high-performance point streaming."""
-    def __init__(self, ctx: ContextType, capacity: int = 100000, settings: Optional[StreamSettings] = None) -> None:
+    """
+    Ring-buffer on GPU for high-performance point streaming.
+    push() writes straight to the GPU and must run on the thread owning the context;
+    stage() can be called from any thread and is uploaded by drain() (called by draw())
+    with at most two buffer writes per frame.
+    
+    For time series (x increasing) a SampleIndex of every x is kept alongside the ring;
+    draw(view) then only renders the samples found inside the view by binary search.
+    With lod=True a LodPyramid of min/max envelopes is kept as well, and where the
+    visible spacing is uniform the coarsest level that still has a bucket per pixel is
+    drawn, so the cost follows the plot width rather than the sample count.
+    
+    Points are drawn at their stored position plus `offset`. In rolling window mode the
+    stream scrolls by updating that offset every frame, so the newest sample stays at
+    x = rolling_anchor with the last rolling_window units of x to its left; this replaces
+    shift_points() for strip charts at O(1) per frame. Samples are stored relative to
+    time_origin (the first x pushed, subtracted in double precision), so large
+    timestamps keep their resolution and nothing drifts.
+    """
+    def __init__(self, ctx: ContextType, capacity: int = 100000, settings: Optional[StreamSettings] = None,
+                 staging_capacity: Optional[int] = None, backpressure: Backpressure = Backpressure.DROP_OLDEST,
+                 backpressure_timeout: Optional[float] = None, lod: bool = False,
+                 rolling_window: Optional[float] = None, rolling_anchor: float = 0.0) -> None:
         self.ctx = ctx
         self.capacity = capacity
         self.settings = settings if settings else StreamSettings()
         self.head = 0
         self.size = 0
+        self.total = 0  # Samples pushed since creation
+        
+        # World position = stored position + offset
+        self.offset = np.zeros(2, dtype='f4')
+        self.rolling_window = rolling_window
+        self.rolling_anchor = rolling_anchor
+        self.time_origin: Optional[float] = None
+        self._origin_lock = threading.Lock()
+        
+        # Culling and level of detail
+        self.samples = SampleIndex(capacity)
+        self.lod = LodPyramid(ctx, capacity) if lod else None
+        
+        # CPU staging for producer threads, drained once per frame by the render thread
+        self.staging = StagingRing(staging_capacity if staging_capacity else capacity,
+                                   policy=backpressure, timeout=backpressure_timeout)
+        self.bounds_reducer: Optional[BoundsReducer] = None  # Created by the first bounds()
         
         # Initialize buffer with zeros to prevent garbage data
         self.buffer = self.ctx.buffer(data=np.zeros(capacity * 2, dtype='f4').tobytes())
@@ -301,7 +1115,8 @@ class GpuStream:
         self.vao = ctx.vertex_array(self.prog, [])
 
         # Smooth line shader (Catmull-Rom)
-        self.smooth_prog = ctx.program(
+        self.smooth_prog = ShaderManager.program(
+            ctx,
             vertex_shader="""
             #version 430
             layout(std140, binding=0) uniform View {
@@ -320,6 +1135,7 @@ class GpuStream:
             uniform int size;
             uniform int segments;
             uniform int type;
+            uniform vec2 offset;
             
             vec2 get_point(int i) {
                 int idx = clamp(i, 0, size - 1);
@@ -353,7 +1169,7 @@ class GpuStream:
                     pos = mix(p1, p2, t);
                 }
                 
-                vec2 diff = pos - view.center;
+                vec2 diff = pos + offset - view.center;
                 vec2 norm = diff * view.scale;
                 gl_Position = vec4(norm, 0.0, 1.0);
             }
@@ -376,9 +1192,30 @@ class GpuStream:
     def clear_buffer(self) -> None:
         self.buffer.clear()
 
+    def _relative(self, points: ArrayLike) -> np.ndarray:
+        """Rolling window mode: make x relative to time_origin before dropping to float32."""
+        points = np.array(points, dtype='f8').reshape(-1, 2)
+        if self.time_origin is None and len(points):
+            with self._origin_lock:
+                if self.time_origin is None:
+                    self.time_origin = float(points[0, 0])
+        points[:, 0] -= self.time_origin
+        return points
+
     def push(self, points: np.ndarray) -> None:
         if points.shape[0] == 0:
             return
+        
+        if self.rolling_window is not None:
+            points = self._relative(points)
+        self._push(np.asarray(points, dtype='f4').reshape(-1, 2))
+
+    def _push(self, points: np.ndarray) -> None:
+        """Write (N, 2) float32 points in stored coordinates to the ring and the LOD levels."""
+        if self.lod is not None:
+            self.lod.push(points)
+        self.samples.push(points[:, 0])
+        self.total += points.shape[0]
             
         count = points.shape[0]
         if count > self.capacity:
@@ -398,102 +1235,971 @@ class GpuStream:
         self.head = (self.head + count) % self.capacity
         self.size = min(self.size + count, self.capacity)
 
-    def draw(self) -> None:
+    def _visible_range(self, view: Optional[View2D]) -> tuple[int, int, int]:
+        """
+        (first sample, last sample, LOD level) to draw for the view, level 0 being the raw
+        ring. The visible samples are found by binary search over their x, and a LOD level
+        is only picked when they are evenly spaced. Falls back to everything at full
+        detail when x is not increasing.
+        """
+        samples = self.samples
+        first, last = self.total - self.size, self.total - 1
+        if samples.last_x is None or not samples.ordered(first):
+            return first, last, 0
+        if self.rolling_window is not None:
+            first = max(first, samples.find(samples.last_x - self.rolling_window))
+        if view is None:
+            return first, last, 0
+        
+        # View bounds in stored coordinates, plus one sample past each edge so lines run off screen
+        half_w = 1.0 / abs(float(view.zoom[0]))
+        x_left = float(view.center[0]) - half_w - float(self.offset[0])
+        x_right = float(view.center[0]) + half_w - float(self.offset[0])
+        s0 = max(first, samples.find(x_left) - 1)
+        s1 = min(last, samples.find(x_right, 'right'))
+        if self.lod is None or s1 <= s0 or not samples.uniform(s0, s1):
+            return s0, s1, 0
+        
+        spacing = (samples.x_at(s1) - samples.x_at(s0)) / (s1 - s0)
+        if not spacing > 0.0:
+            return s0, s1, 0
+        samples_per_pixel = 2.0 * half_w / (spacing * max(float(view.resolution[0]), 1.0))
+        level = 0
+        for index, lod_level in enumerate(self.lod.levels):
+            if lod_level.bucket_size > samples_per_pixel:
+                break
+            level = index + 1
+        return s0, s1, level
+
+    def stage(self, points: ArrayLike) -> int:
+        """Thread-safe push: stage (N, 2) points for the next drain() and return how many were accepted."""
+        if self.rolling_window is not None:
+            points = self._relative(points)
+        return self.staging.append(points)
+
+    @property
+    def dropped(self) -> int:
+        """Points lost to the staging backpressure policy so far."""
+        return self.staging.dropped
+
+    def drain(self) -> int:
+        """Upload the staged points to the GPU ring (render thread only) and return their count."""
+        points = self.staging.swap()
+        if len(points):
+            # Staged points are already relative to time_origin
+            self._push(points)
+        return len(points)
+
+    def draw(self, view: Optional[View2D] = None) -> None:
+        """
+        Draw the stream. With a view, only the visible samples are drawn, from the LOD
+        level matching its zoom; without one every sample is drawn at full detail.
+        """
+        self.drain()
         if self.size == 0:
             return
+        if view is not None:
+            view.use(0)
+        
+        if self.rolling_window is not None and self.samples.last_x is not None:
+            self.offset[0] = self.rolling_anchor - self.samples.last_x
+        
+        s0, s1, level = self._visible_range(view)
+        if s1 < s0:
+            return
+        if level == 0:
+            buffer, capacity = self.buffer, self.capacity
+            start_index = (self.head - (self.total - s0)) % self.capacity
+            size = s1 - s0 + 1
+        else:
+            lod_level = self.lod.levels[level - 1]
+            b0 = max(s0 // lod_level.bucket_size, lod_level.count - lod_level.capacity)
+            b1 = min(s1 // lod_level.bucket_size, lod_level.count - 1)
+            buffer, capacity = lod_level.buffer, lod_level.capacity * 2
+            start_index = (b0 % lod_level.capacity) * 2
+            size = (b1 - b0 + 1) * 2
 
-        self.buffer.bind_to_storage_buffer(binding=1)
-    
-        start_index = (self.head - self.size + self.capacity) % self.capacity
+        buffer.bind_to_storage_buffer(binding=1)
+        offset = tuple(self.offset)
         
         # Draw lines
-        if self.settings.line_type != LineType.NONE and self.size >= 2:
-            if self.settings.line_type == LineType.SMOOTH and self.size >= 2:
+        if self.settings.line_type != LineType.NONE and size >= 2:
+            if self.settings.line_type == LineType.SMOOTH and size >= 2:
                 self.smooth_prog['start_index'] = start_index
-                self.smooth_prog['capacity'] = self.capacity
-                self.smooth_prog['size'] = self.size
+                self.smooth_prog['capacity'] = capacity
+                self.smooth_prog['size'] = size
                 self.smooth_prog['segments'] = self.settings.curve_segments
                 self.smooth_prog['type'] = 4
+                self.smooth_prog['offset'] = offset
                 self.smooth_prog['color'] = self.settings.line_color
                 self.ctx.line_width = self.settings.line_width
                 
-                num_vertices = (self.size - 1) * self.settings.curve_segments + 1
+                num_vertices = (size - 1) * self.settings.curve_segments + 1
                 
                 self.smooth_vao.render(moderngl.LINE_STRIP, vertices=num_vertices)
 
             else:
                 self.prog['start_index'] = start_index
-                self.prog['capacity'] = self.capacity
+                self.prog['capacity'] = capacity
+                self.prog['offset'] = offset
                 self.prog['color'] = self.settings.line_color
                 self.ctx.line_width = self.settings.line_width
-                self.vao.render(moderngl.LINE_STRIP, vertices=self.size)
+                self.vao.render(moderngl.LINE_STRIP, vertices=size)
             
         # Draw points
         if self.settings.show_points:
             self.prog['start_index'] = start_index
-            self.prog['capacity'] = self.capacity
+            self.prog['capacity'] = capacity
+            self.prog['offset'] = offset
             self.prog['color'] = self.settings.point_color
             self.prog['point_size'] = self.settings.point_radius
             if 'round_points' in self.prog:
                 self.prog['round_points'] = self.settings.round_points
-            self.vao.render(moderngl.POINTS, vertices=self.size)
+            self.vao.render(moderngl.POINTS, vertices=size)
+
+    def live_range(self) -> tuple[int, int]:
+        """(ring index of the oldest live sample, sample count), limited to the rolling window when enabled."""
+        if self.size == 0:
+            return 0, 0
+        s0, s1, _ = self._visible_range(None)
+        return (self.head - (self.total - s0)) % self.capacity, max(s1 - s0 + 1, 0)
+
+    def bounds(self) -> Optional[Bounds]:
+        """
+        World bounds and mean of the live samples (the rolling window when enabled),
+        reduced on the GPU and available one call later, see BoundsReducer.
+        """
+        if self.bounds_reducer is None:
+            self.bounds_reducer = BoundsReducer(self.ctx)
+        if self.rolling_window is not None and self.samples.last_x is not None:
+            self.offset[0] = self.rolling_anchor - self.samples.last_x
+        
+        start_index, count = self.live_range()
+        return self.bounds_reducer.reduce(self.buffer, start_index, count, self.capacity, tuple(self.offset))
+
+    def auto_fit(self, view: View2D, margin: float = 0.05,
+                 center_interpolate: float = 1, zoom_interpolate: float = 1) -> None:
+        """Call once per frame to keep the view fitted to the stream, without reading it back."""
+        bounds = self.bounds()
+        if bounds is not None:
+            BoundsReducer.fit(view, bounds, margin, center_interpolate, zoom_interpolate)
 
     def shift_points(self, offset: tuple[float, float] | Vector2D) -> None:
-        """Shifts all existing points by the given offset using a Compute Shader."""
+        """
+        Shifts all existing points by the given offset using a Compute Shader.
+        This touches the whole ring; to scroll a strip chart use rolling_window or `offset`.
+        """
         if not hasattr(self, 'shift_prog'):
             self.shift_prog = ShaderManager.create_compute(
                 self.ctx,
                 "shaders/stream_shift_compute.glsl"
             )
         
-        self.buffer.bind_to_storage_buffer(binding=1)
+        group_size = 64
         self.shift_prog['offset'] = offset
-        self.shift_prog['capacity'] = self.capacity
+        targets = [(self.buffer, self.capacity)]
+        if self.lod is not None:
+            targets += [(level.buffer, level.capacity * 2) for level in self.lod.levels]
+            self.lod.shift(offset)
+        for buffer, capacity in targets:
+            buffer.bind_to_storage_buffer(binding=1)
+            self.shift_prog['capacity'] = capacity
+            num_groups = (capacity + group_size - 1) // group_size
+            self.shift_prog.run(num_groups)
         
-        group_size = 64
-        num_groups = (self.capacity + group_size - 1) // group_size
-        self.shift_prog.run(num_groups)
+        self.samples.shift(offset[0])
 
-class ComputeCurve:
-    """Parametric curve p(t) evaluated entirely on GPU."""
-    def __init__(self, ctx: ContextType, func_body: str, t_range: tuple, count: int = 1024, settings: Optional[CurveSettings] = None):
+class MultiStream:
+    """
+    K channels sharing one GPU ring with a common head and size, e.g. an oscilloscope.
+    Each sample row holds x followed by one y per channel, so a push is one contiguous
+    write, and all channels are drawn with one instanced call per primitive
+    (gl_InstanceID selects the channel). Per-channel colors and y scale/offset live in
+    small uniform arrays, which bounds the channel count to roughly a hundred.
+    """
+    ctx: ContextType
+    channels: int
+    capacity: int
+    stride: int
+    settings: StreamSettings
+    head: int
+    size: int
+    colors: np.ndarray
+    scales: np.ndarray
+    offsets: np.ndarray
+    buffer: BufferType
+    staging: StagingRing
+    prog: ProgramType
+    vao: VAOType
+    
+    def __init__(self, ctx: ContextType, channels: int, capacity: int = 100000, settings: Optional[StreamSettings] = None,
+                 colors: Optional[ArrayLike | list[ColorType]] = None, offsets: Optional[ArrayLike] = None,
+                 scales: Optional[ArrayLike] = None, staging_capacity: Optional[int] = None,
+                 backpressure: Backpressure = Backpressure.DROP_OLDEST, backpressure_timeout: Optional[float] = None) -> None:
+        """
+        Args:
+            ctx: ModernGL context
+            channels: Number of channels (K)
+            capacity: Samples kept per channel
+            settings: Line and point settings shared by all channels (colors are per channel)
+            colors: K colors, defaults to settings.line_color for every channel
+            offsets: K y offsets added after scaling, defaults to 0
+            scales: K y scales, defaults to 1
+            staging_capacity: Rows the thread-safe staging ring can hold between frames
+            backpressure: Policy when the staging ring is full
+            backpressure_timeout: Longest wait for Backpressure.BLOCK
+        """
         self.ctx = ctx
-        self.count = count
-        self.t_range = t_range
-        self.settings = settings if settings else CurveSettings()
-        
-        self.vbo = self.ctx.buffer(reserve=count * 8)
-        
-        cs_src = f"""
-        #version 430
-        layout(local_size_x=64) in;
-        
-        layout(std430, binding=2) buffer Dest {{
-            vec2 vertices[];
-        }};
+        self.channels = channels
+        self.capacity = capacity
+        self.stride = channels + 1
+        self.settings = settings if settings else StreamSettings()
+        self.head = 0
+        self.size = 0
         
-        uniform float t0;
-        uniform float t1;
-        uniform int count;
+        self.colors = np.empty((channels, 4), dtype='f4')
+        self.colors[:] = np.asarray([tuple(c) for c in colors] if colors is not None else tuple(self.settings.line_color), dtype='f4')
+        self.scales = np.ones(channels, dtype='f4') if scales is None else np.asarray(scales, dtype='f4')
+        self.offsets = np.zeros(channels, dtype='f4') if offsets is None else np.asarray(offsets, dtype='f4')
         
-        void main() {{
-            uint id = gl_GlobalInvocationID.x;
-            if (id >= count) return;
-            
-            float t_norm = float(id) / float(count - 1);
-            float t = t0 + t_norm * (t1 - t0);
-            
-            float x, y;
-            {func_body}
-            vertices[id] = vec2(x, y);
-        }}
-        """
-        self.compute_prog = ctx.compute_shader(cs_src)
+        # Initialize buffer with zeros to prevent garbage data
+        self.buffer = self.ctx.buffer(data=np.zeros(capacity * self.stride, dtype='f4').tobytes())
+        self.staging = StagingRing(staging_capacity if staging_capacity else capacity, width=self.stride,
+                                   policy=backpressure, timeout=backpressure_timeout)
         
-        self.render_prog = ShaderManager.create_program(
+        vertex_shader = ShaderManager.load_shader("shaders/multistream_vertex.glsl").replace(
+            "#define CHANNELS 1", f"#define CHANNELS {channels}", 1)
+        self.prog = ShaderManager.program(
             ctx,
-            "shaders/curve_vertex.glsl",
-            "shaders/curve_fragment.glsl"
+            vertex_shader=vertex_shader,
+            fragment_shader=ShaderManager.load_shader("shaders/multistream_fragment.glsl")
+        )
+        try:
+            set_uniform_block_binding(self.prog, 'View', 0)
+        except:
+            pass
+        self.vao = ctx.vertex_array(self.prog, [])
+
+    def set_channel(self, index: int, color: Optional[ColorType] = None, offset: Optional[float] = None,
+                    scale: Optional[float] = None) -> None:
+        if color is not None:
+            self.colors[index] = tuple(color)
+        if offset is not None:
+            self.offsets[index] = offset
+        if scale is not None:
+            self.scales[index] = scale
+
+    def _rows(self, x: ArrayLike, ys: ArrayLike) -> np.ndarray:
+        x = np.asarray(x, dtype='f4').ravel()
+        rows = np.empty((len(x), self.stride), dtype='f4')
+        rows[:, 0] = x
+        rows[:, 1:] = np.asarray(ys, dtype='f4').reshape(len(x), self.channels)
+        return rows
+
+    def push(self, x: ArrayLike, ys: ArrayLike) -> None:
+        """Append N samples: x is (N,), ys is (N, K). Render thread only."""
+        self.push_rows(self._rows(x, ys))
+
+    def push_rows(self, rows: np.ndarray) -> None:
+        """Append (N, K + 1) rows of x followed by the K channel values."""
+        count = rows.shape[0]
+        if count == 0:
+            return
+        if count > self.capacity:
+            rows = rows[-self.capacity:]
+            count = self.capacity
+        
+        row_bytes = self.stride * 4
+        offset = self.head * row_bytes
+        data = np.ascontiguousarray(rows, dtype='f4').tobytes()
+        
+        if self.head + count <= self.capacity:
+            self.buffer.write(data, offset=offset)
+        else:
+            first_part = self.capacity - self.head
+            self.buffer.write(data[:first_part * row_bytes], offset=offset)
+            self.buffer.write(data[first_part * row_bytes:], offset=0)
+        
+        self.head = (self.head + count) % self.capacity
+        self.size = min(self.size + count, self.capacity)
+
+    def stage(self, x: ArrayLike, ys: ArrayLike) -> int:
+        """Thread-safe push, uploaded by the next drain() and returning the accepted sample count."""
+        return self.staging.append(self._rows(x, ys))
+
+    @property
+    def dropped(self) -> int:
+        """Samples lost to the staging backpressure policy so far."""
+        return self.staging.dropped
+
+    def drain(self) -> int:
+        """Upload the staged samples to the GPU ring (render thread only) and return their count."""
+        rows = self.staging.swap()
+        if len(rows):
+            self.push_rows(rows)
+        return len(rows)
+
+    def draw(self) -> None:
+        self.drain()
+        if self.size == 0:
+            return
+        
+        self.buffer.bind_to_storage_buffer(binding=1)
+        
+        start_index = (self.head - self.size + self.capacity) % self.capacity
+        self.prog['start_index'] = start_index
+        self.prog['capacity'] = self.capacity
+        self.prog['colors'].write(self.colors.tobytes())
+        self.prog['transforms'].write(np.stack([self.scales, self.offsets], axis=1).astype('f4').tobytes())
+        
+        # Draw lines (every line type is drawn as a direct polyline)
+        if self.settings.line_type != LineType.NONE and self.size >= 2:
+            self.prog['round_points'] = False
+            self.ctx.line_width = self.settings.line_width
+            self.vao.render(moderngl.LINE_STRIP, vertices=self.size, instances=self.channels)
+        
+        # Draw points
+        if self.settings.show_points:
+            self.prog['point_size'] = self.settings.point_radius
+            self.prog['round_points'] = self.settings.round_points
+            self.vao.render(moderngl.POINTS, vertices=self.size, instances=self.channels)
+
+class ScatterPlot:
+    """
+    Static scatter of up to millions of points with optional per-point size and color.
+    Every attribute lives in its own SSBO (positions vec2, sizes float, colors packed
+    RGBA8 or float values mapped through a colormap), so contiguous numpy arrays of the
+    right dtype are uploaded as they are, without interleaving or conversion. Points are
+    pulled by gl_VertexID and drawn as round antialiased point sprites; after the upload
+    panning and zooming only changes the View2D uniforms.
+    """
+    ctx: ContextType
+    settings: ScatterSettings
+    count: int
+    position_buffer: Optional[BufferType]
+    size_buffer: Optional[BufferType]
+    color_buffer: Optional[BufferType]
+    color_mode: int
+    value_range: tuple[float, float]
+    prog: ProgramType
+    vao: VAOType
+    
+    def __init__(self, ctx: ContextType, positions: Optional[ArrayLike] = None, sizes: Optional[ArrayLike] = None,
+                 colors: Optional[ArrayLike] = None, values: Optional[ArrayLike] = None,
+                 settings: Optional[ScatterSettings] = None) -> None:
+        self.ctx = ctx
+        self.settings = settings if settings else ScatterSettings()
+        self.count = 0
+        self.position_buffer = None
+        self.size_buffer = None
+        self.color_buffer = None
+        self.color_mode = 0
+        self.value_range = (0.0, 1.0)
+        
+        self.prog = ShaderManager.create_program(
+            ctx,
+            "shaders/scatter_vertex.glsl",
+            "shaders/scatter_fragment.glsl"
+        )
+        try:
+            set_uniform_block_binding(self.prog, 'View', 0)
+        except:
+            pass
+        self.vao = ctx.vertex_array(self.prog, [])
+        
+        if positions is not None:
+            self.set_data(positions, sizes, colors, values)
+
+    def _upload(self, buffer: Optional[BufferType], data: np.ndarray) -> BufferType:
+        """Write into the existing buffer when it is large enough, else replace it."""
+        if buffer is not None and buffer.size >= data.nbytes:
+            buffer.write(data)
+            return buffer
+        if buffer is not None:
+            buffer.release()
+        return self.ctx.buffer(data)
+
+    @staticmethod
+    def _color_data(colors: ArrayLike) -> np.ndarray:
+        colors = np.asarray(colors)
+        if colors.ndim == 1 and colors.dtype == np.uint32:
+            return np.ascontiguousarray(colors)  # Already packed
+        return pack_colors(colors)
+
+    def set_data(self, positions: ArrayLike, sizes: Optional[ArrayLike] = None, colors: Optional[ArrayLike] = None,
+                 values: Optional[ArrayLike] = None) -> None:
+        """
+        Replace all points.
+        
+        Args:
+            positions: (N, 2) float32 world positions
+            sizes: (N,) float32 diameters in pixels, None uses settings.size
+            colors: (N,) uint32 packed RGBA8 (see pack_colors) or (N, 3 | 4) floats
+            values: (N,) float32 values mapped through settings.colormap (instead of colors)
+        """
+        if colors is not None and values is not None:
+            raise ValueError("Pass either colors or values, not both")
+        
+        positions = np.ascontiguousarray(positions, dtype='f4').reshape(-1, 2)
+        self.count = len(positions)
+        if self.count == 0:
+            return
+        self.position_buffer = self._upload(self.position_buffer, positions)
+        
+        if sizes is not None:
+            self.size_buffer = self._upload(self.size_buffer, np.ascontiguousarray(sizes, dtype='f4'))
+        elif self.size_buffer is not None:
+            self.size_buffer.release()
+            self.size_buffer = None
+        
+        if values is not None:
+            values = np.ascontiguousarray(values, dtype='f4')
+            self.color_buffer = self._upload(self.color_buffer, values)
+            self.color_mode = 2
+            self.value_range = (float(np.nanmin(values)), float(np.nanmax(values)))
+        elif colors is not None:
+            self.color_buffer = self._upload(self.color_buffer, self._color_data(colors))
+            self.color_mode = 1
+        else:
+            if self.color_buffer is not None:
+                self.color_buffer.release()
+                self.color_buffer = None
+            self.color_mode = 0
+
+    def update(self, first: int, positions: Optional[ArrayLike] = None, sizes: Optional[ArrayLike] = None,
+               colors: Optional[ArrayLike] = None, values: Optional[ArrayLike] = None) -> None:
+        """Overwrite the attributes of points first..first+len-1 in place (same kinds as set_data)."""
+        if positions is not None and self.position_buffer is not None:
+            self.position_buffer.write(np.ascontiguousarray(positions, dtype='f4'), offset=first * 8)
+        if sizes is not None and self.size_buffer is not None:
+            self.size_buffer.write(np.ascontiguousarray(sizes, dtype='f4'), offset=first * 4)
+        if values is not None and self.color_mode == 2:
+            self.color_buffer.write(np.ascontiguousarray(values, dtype='f4'), offset=first * 4)
+        elif colors is not None and self.color_mode == 1:
+            self.color_buffer.write(self._color_data(colors), offset=first * 4)
+
+    def draw(self) -> None:
+        if self.count == 0:
+            return
+        
+        self.position_buffer.bind_to_storage_buffer(binding=1)
+        if self.size_buffer is not None:
+            self.size_buffer.bind_to_storage_buffer(binding=2)
+        if self.color_buffer is not None:
+            self.color_buffer.bind_to_storage_buffer(binding=3)
+        
+        self.prog['per_point_size'] = self.size_buffer is not None
+        self.prog['point_size'] = self.settings.size
+        self.prog['color_mode'] = self.color_mode
+        self.prog['color'] = self.settings.color
+        if self.color_mode == 2:
+            low, high = self.settings.value_range if self.settings.value_range else self.value_range
+            self.prog['value_range'] = (low, high if high != low else low + 1.0)
+            colormap_texture(self.ctx, self.settings.colormap).use(0)
+            self.prog['colormap'] = 0
+        
+        self.ctx.enable(moderngl.BLEND | moderngl.PROGRAM_POINT_SIZE)
+        self.vao.render(moderngl.POINTS, vertices=self.count)
+
+class DensityPlot:
+    """
+    Density rendering for datasets too large for individual markers.
+    Points are binned on the GPU with image atomics into an integer texture covering
+    the view (square or hexagonal bins), the largest bin is found by a second compute
+    pass, and a full-screen pass maps the counts through a colormap. Binning only runs
+    again when the View2D, the settings or the data change; other frames only redraw
+    the colormapped texture.
+    """
+    ctx: ContextType
+    settings: DensitySettings
+    count: int
+    position_buffer: Optional[BufferType]
+    stats_buffer: BufferType
+    bins: Optional[TextureType]
+    compute_prog: ComputeShaderType
+    prog: ProgramType
+    quad: BufferType
+    vao: VAOType
+    
+    GROUP_SIZE = 256
+    MAX_GROUPS = 65535
+    
+    def __init__(self, ctx: ContextType, positions: Optional[ArrayLike] = None, settings: Optional[DensitySettings] = None) -> None:
+        self.ctx = ctx
+        self.settings = settings if settings else DensitySettings()
+        self.count = 0
+        self.position_buffer = None
+        self.stats_buffer = ctx.buffer(reserve=4)
+        self.bins = None
+        self._state = None  # View, settings and data the bins were computed for
+        self._version = 0
+        
+        cells = ShaderManager.load_shader("shaders/density_cells.glsl")
+        self.compute_prog = ShaderManager.compute(
+            ctx, ShaderManager.load_shader("shaders/density_compute.glsl").replace("// @cells", cells, 1))
+        self.prog = ShaderManager.program(
+            ctx,
+            ShaderManager.load_shader("shaders/quad_vertex.glsl"),
+            ShaderManager.load_shader("shaders/density_fragment.glsl").replace("// @cells", cells, 1)
+        )
+        try:
+            set_uniform_block_binding(self.prog, 'View', 0)
+        except:
+            pass
+        self.quad = self.ctx.buffer(np.array([-1,-1, 1,-1, -1,1, 1,1], dtype='f4'))
+        self.vao = ctx.simple_vertex_array(self.prog, self.quad, "in_vert")
+        
+        if positions is not None:
+            self.set_data(positions)
+
+    def set_data(self, positions: ArrayLike) -> None:
+        """Replace the points with an (N, 2) float32 array (uploaded without a copy when contiguous)."""
+        positions = np.ascontiguousarray(positions, dtype='f4').reshape(-1, 2)
+        self.count = len(positions)
+        if self.position_buffer is not None and self.position_buffer.size >= positions.nbytes:
+            self.position_buffer.write(positions)
+        elif self.count:
+            if self.position_buffer is not None:
+                self.position_buffer.release()
+            self.position_buffer = self.ctx.buffer(positions)
+        self._version += 1
+
+    def _bins_size(self, resolution: tuple[float, float]) -> tuple[int, int]:
+        width, height = max(resolution[0], 1.0), max(resolution[1], 1.0)
+        size = max(self.settings.bin_size, 1.0)
+        if self.settings.hexagonal:
+            row_height = 1.5 * size / np.sqrt(3.0)
+            return int(np.ceil(width / size)) + 3, int(np.ceil(height / row_height)) + 3
+        return int(width // size) + 1, int(height // size) + 1
+
+    def _run(self, stage: int, items: int) -> None:
+        self.compute_prog['stage'] = stage
+        groups = min((items + self.GROUP_SIZE - 1) // self.GROUP_SIZE, self.MAX_GROUPS)
+        self.compute_prog.run(max(groups, 1))
+        self.ctx.memory_barrier()
+
+    def _rebin(self, view: View2D) -> None:
+        size = self._bins_size((float(view.resolution[0]), float(view.resolution[1])))
+        if self.bins is None or self.bins.size != size:
+            if self.bins is not None:
+                self.bins.release()
+            self.bins = self.ctx.texture(size, 1, dtype='u4')
+            self.bins.filter = (moderngl.NEAREST, moderngl.NEAREST)
+        
+        self.bins.bind_to_image(0, read=True, write=True)
+        self.stats_buffer.write(np.zeros(1, dtype=np.uint32))
+        self.stats_buffer.bind_to_storage_buffer(binding=2)
+        self.compute_prog['bin_size'] = max(self.settings.bin_size, 1.0)
+        self.compute_prog['hexagonal'] = self.settings.hexagonal
+        self.compute_prog['count'] = self.count
+        
+        texels = size[0] * size[1]
+        self._run(0, texels)
+        if self.count:
+            self.position_buffer.bind_to_storage_buffer(binding=1)
+            self._run(1, self.count)
+        self._run(2, texels)
+
+    def draw(self, view: View2D) -> None:
+        """Draw into the current viewport, which should match the view (e.g. inside Plot2D.render)."""
+        view.use(0)
+        state = (tuple(view.center), tuple(view.zoom), tuple(view.resolution), self._version,
+                 self.settings.bin_size, self.settings.hexagonal)
+        if state != self._state:
+            self._rebin(view)
+            self._state = state
+        
+        self.bins.use(0)
+        colormap_texture(self.ctx, self.settings.colormap).use(1)
+        self.stats_buffer.bind_to_storage_buffer(binding=2)
+        self.prog['bins'] = 0
+        self.prog['colormap'] = 1
+        self.prog['bin_size'] = max(self.settings.bin_size, 1.0)
+        self.prog['hexagonal'] = self.settings.hexagonal
+        self.prog['log_scale'] = self.settings.log_scale
+        self.prog['opacity'] = self.settings.opacity
+        
+        self.ctx.enable(moderngl.BLEND)
+        self.vao.render(moderngl.TRIANGLE_STRIP)
+
+class HeatmapPlot:
+    """
+    2D scalar field (sensor grid, simulation state, ...) shown as a colormapped image.
+    The (H, W) float32 array lives in a single-channel R32F texture stretched over a
+    world-space rect, so it pans and zooms with the View2D; NaN cells are transparent.
+    Updates are written to an orphaned pixel buffer first and copied into the texture
+    from there, so refreshing a large field (or a sub-rectangle of it) every frame
+    doesn't wait for the previous upload to be consumed.
+    """
+    ctx: ContextType
+    settings: HeatmapSettings
+    extent: tuple[float, float, float, float]
+    texture: Optional[TextureType]
+    pbo: Optional[BufferType]
+    value_range: tuple[float, float]
+    row_offset: float
+    prog: ProgramType
+    quad: BufferType
+    vao: VAOType
+    
+    WRAP_ROWS = False  # Repeat the texture vertically (ring-addressed rows)
+    
+    def __init__(self, ctx: ContextType, data: Optional[ArrayLike] = None,
+                 extent: tuple[float, float, float, float] = (-1.0, -1.0, 1.0, 1.0),
+                 settings: Optional[HeatmapSettings] = None) -> None:
+        """
+        Args:
+            ctx: ModernGL context
+            data: (H, W) field, row 0 is drawn at y_min
+            extent: World rect (x_min, y_min, x_max, y_max) covered by the field
+            settings: Colormap, value range and filtering
+        """
+        self.ctx = ctx
+        self.settings = settings if settings else HeatmapSettings()
+        self.extent = extent
+        self.texture = None
+        self.pbo = None
+        self.value_range = (0.0, 1.0)
+        self.row_offset = 0.0
+        
+        self.prog = ShaderManager.create_program(
+            ctx,
+            "shaders/heatmap_vertex.glsl",
+            "shaders/heatmap_fragment.glsl"
+        )
+        try:
+            set_uniform_block_binding(self.prog, 'View', 0)
+        except:
+            pass
+        self.quad = self.ctx.buffer(np.array([0,0, 1,0, 0,1, 1,1], dtype='f4'))
+        self.vao = ctx.simple_vertex_array(self.prog, self.quad, "in_vert")
+        
+        if data is not None:
+            self.set_data(data)
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        """(H, W) of the field, (0, 0) before the first set_data()."""
+        return (self.texture.height, self.texture.width) if self.texture is not None else (0, 0)
+
+    def set_data(self, data: ArrayLike) -> None:
+        """Replace the whole field, resizing the texture if the shape changed."""
+        data = np.ascontiguousarray(data, dtype='f4')
+        height, width = data.shape
+        if self.shape != (height, width):
+            if self.texture is not None:
+                self.texture.release()
+            self.texture = self.ctx.texture((width, height), 1, dtype='f4')
+            self.texture.repeat_x = False
+            self.texture.repeat_y = self.WRAP_ROWS
+        
+        finite = data[np.isfinite(data)]
+        if finite.size:
+            self.value_range = (float(finite.min()), float(finite.max()))
+        self.update(data)
+
+    def update(self, data: ArrayLike, x: int = 0, y: int = 0) -> None:
+        """
+        Overwrite the (h, w) sub-rectangle of cells starting at column x, row y.
+        The automatic value range is not recomputed, set settings.value_range for streaming.
+        """
+        if self.texture is None:
+            self.set_data(data)
+            return
+        data = np.ascontiguousarray(data, dtype='f4')
+        height, width = data.shape
+        
+        # Orphan so the write gets fresh storage instead of waiting on the last upload
+        if self.pbo is None or self.pbo.size < data.nbytes:
+            if self.pbo is not None:
+                self.pbo.release()
+            self.pbo = self.ctx.buffer(reserve=data.nbytes, dynamic=True)
+        else:
+            self.pbo.orphan()
+        self.pbo.write(data)
+        self.texture.write(self.pbo, viewport=(x, y, width, height), alignment=4)
+
+    def draw(self) -> None:
+        if self.texture is None:
+            return
+        
+        mode = moderngl.LINEAR if self.settings.interpolate else moderngl.NEAREST
+        self.texture.filter = (mode, mode)
+        self.texture.use(0)
+        colormap_texture(self.ctx, self.settings.colormap).use(1)
+        
+        low, high = self.settings.value_range if self.settings.value_range else self.value_range
+        self.prog['field'] = 0
+        self.prog['colormap'] = 1
+        self.prog['value_range'] = (low, high if high != low else low + 1.0)
+        self.prog['opacity'] = self.settings.opacity
+        self.prog['extent'] = self.extent
+        self.prog['row_offset'] = self.row_offset
+        
+        self.ctx.enable(moderngl.BLEND)
+        self.vao.render(moderngl.TRIANGLE_STRIP)
+
+class WaterfallPlot(HeatmapPlot):
+    """
+    Scrolling spectrogram: every push() appends rows (e.g. one spectrum per frame) to a
+    ring of `history` texture rows, like GpuStream does for points. Only the new rows are
+    written; the fragment shader starts reading at the oldest row and wraps around the
+    texture, so nothing is ever copied or shifted. The oldest row is drawn at y_min and
+    the newest at y_max (swap them in the extent to scroll the other way). Rows that were
+    never written are NaN and stay transparent.
+    """
+    bins: int
+    history: int
+    head: int
+    rows: int
+    
+    WRAP_ROWS = True
+    
+    def __init__(self, ctx: ContextType, bins: int, history: int = 512,
+                 extent: tuple[float, float, float, float] = (-1.0, -1.0, 1.0, 1.0),
+                 settings: Optional[HeatmapSettings] = None) -> None:
+        """
+        Args:
+            ctx: ModernGL context
+            bins: Values per row (e.g. FFT bins), spread over x_min..x_max
+            history: Rows kept, spread over y_min..y_max
+            extent: World rect (x_min, y_min, x_max, y_max)
+            settings: Colormap, value range and filtering
+        """
+        super().__init__(ctx, np.full((history, bins), np.nan, dtype='f4'), extent, settings)
+        self.bins = bins
+        self.history = history
+        self.head = 0  # Next row to write, also the oldest row once the ring is full
+        self.rows = 0
+        self._seen_range: Optional[tuple[float, float]] = None
+
+    def push(self, rows: ArrayLike) -> None:
+        """Append a (bins,) row or (N, bins) rows, oldest first."""
+        rows = np.ascontiguousarray(rows, dtype='f4').reshape(-1, self.bins)
+        count = len(rows)
+        if count == 0:
+            return
+        if count > self.history:
+            rows = rows[-self.history:]
+            count = self.history
+        
+        first_part = min(count, self.history - self.head)
+        self.update(rows[:first_part], 0, self.head)
+        if first_part < count:
+            self.update(rows[first_part:], 0, 0)
+        
+        self.head = (self.head + count) % self.history
+        self.rows = min(self.rows + count, self.history)
+        self.row_offset = self.head / self.history
+        
+        # Running value range for settings.value_range = None
+        finite = rows[np.isfinite(rows)]
+        if finite.size:
+            low, high = float(finite.min()), float(finite.max())
+            if self._seen_range is not None:
+                low, high = min(low, self._seen_range[0]), max(high, self._seen_range[1])
+            self._seen_range = self.value_range = (low, high)
+
+class HistogramPlot:
+    """
+    Histogram of values that stay on the GPU: a GpuStream's ring, a buffer from
+    RootEnv.create_buffer, or an array uploaded with set_data(). A compute pass bins
+    them with a shared-memory histogram per workgroup, merged into the global counts
+    with one atomic per bin, and the bins are drawn as instanced bars whose heights
+    the vertex shader reads straight from the counts buffer. Without a value_range the
+    min/max is found by an earlier stage of the same pass.
+    """
+    ctx: ContextType
+    settings: HistogramSettings
+    prog: ComputeShaderType
+    bar_prog: ProgramType
+    vao: VAOType
+    histogram_buffer: Optional[BufferType]
+    
+    MAX_BINS = 4096  # Shared-memory histogram size in the compute shader
+    GROUPS = 256     # Workgroups per stage, each walks the values with a grid stride
+    
+    def __init__(self, ctx: ContextType, settings: Optional[HistogramSettings] = None) -> None:
+        self.ctx = ctx
+        self.settings = settings if settings else HistogramSettings()
+        self.histogram_buffer = None
+        self.data_buffer = None
+        self._source = None  # (buffer, start_index, count, capacity, stride, component)
+        self._stream = None
+        self._stream_component = 1
+        self._dirty = False
+        
+        self.prog = ShaderManager.create_compute(ctx, "shaders/histogram_compute.glsl")
+        self.bar_prog = ShaderManager.create_program(
+            ctx,
+            "shaders/histogram_vertex.glsl",
+            "shaders/curve_fragment.glsl"
+        )
+        try:
+            set_uniform_block_binding(self.bar_prog, 'View', 0)
+        except:
+            pass
+        self.vao = ctx.vertex_array(self.bar_prog, [])
+
+    def set_data(self, values: ArrayLike) -> None:
+        """Upload a (N,) array of values into a buffer owned by the plot."""
+        values = np.ascontiguousarray(values, dtype='f4').ravel()
+        if self.data_buffer is None or self.data_buffer.size < max(values.nbytes, 4):
+            if self.data_buffer is not None:
+                self.data_buffer.release()
+            self.data_buffer = self.ctx.buffer(reserve=max(values.nbytes, 4))
+        if values.nbytes:
+            self.data_buffer.write(values.tobytes())
+        self.set_source(self.data_buffer, len(values))
+
+    def set_source(self, buffer: BufferType, count: int, start_index: int = 0, capacity: Optional[int] = None,
+                   stride: int = 1, component: int = 0) -> None:
+        """
+        Bin `count` elements of a float buffer read as a ring of `capacity` elements,
+        starting at `start_index`; each element is `stride` floats and the value is its
+        `component`-th float (e.g. stride=2, component=1 for the y of vec2 points).
+        """
+        if not 0 <= component < stride:
+            raise ValueError(f"component must be in [0, {stride}), got {component}")
+        self._stream = None
+        self._source = (buffer, start_index, count, capacity if capacity else max(count, 1), stride, component)
+        self._dirty = True
+
+    def set_stream(self, stream: 'GpuStream', component: int = 1) -> None:
+        """Follow a GpuStream: its live samples (x: 0, y: 1) are re-binned on every draw."""
+        self._stream = stream
+        self._stream_component = component
+        self._dirty = True
+
+    def update(self) -> None:
+        """Run the binning pass over the current source."""
+        bins = int(self.settings.bins)
+        if not 1 <= bins <= self.MAX_BINS:
+            raise ValueError(f"HistogramPlot supports 1 to {self.MAX_BINS} bins, got {bins}")
+        if self._stream is not None:
+            self._stream.drain()
+            start_index, count = self._stream.live_range()
+            source = (self._stream.buffer, start_index, count, self._stream.capacity, 2, self._stream_component)
+        elif self._source is not None:
+            source = self._source
+        else:
+            return
+        buffer, start_index, count, capacity, stride, component = source
+        
+        size = 16 + bins * 4
+        if self.histogram_buffer is None or self.histogram_buffer.size < size:
+            if self.histogram_buffer is not None:
+                self.histogram_buffer.release()
+            self.histogram_buffer = self.ctx.buffer(reserve=size)
+        
+        auto_range = self.settings.value_range is None
+        buffer.bind_to_storage_buffer(binding=1)
+        self.histogram_buffer.bind_to_storage_buffer(binding=2)
+        self.prog['start_index'] = start_index % capacity
+        self.prog['count'] = count
+        self.prog['capacity'] = capacity
+        self.prog['stride'] = stride
+        self.prog['component'] = component
+        self.prog['bins'] = bins
+        self.prog['auto_range'] = auto_range
+        self.prog['value_range'] = self.settings.value_range if not auto_range else (0.0, 1.0)
+        
+        # Clear, value range (auto only), bin, largest bin
+        for stage in (0, 1, 2, 3):
+            if stage == 1 and not auto_range:
+                continue
+            self.prog['stage'] = stage
+            self.prog.run(self.GROUPS)
+            self.ctx.memory_barrier()
+        self._bins = bins
+        self._dirty = False
+
+    def counts(self) -> np.ndarray:
+        """Read the bin counts back (waits for the GPU)."""
+        if self.histogram_buffer is None:
+            return np.zeros(0, dtype=np.uint32)
+        return np.frombuffer(self.histogram_buffer.read(size=self._bins * 4, offset=16), dtype=np.uint32)
+
+    def value_range(self) -> Optional[tuple[float, float]]:
+        """Read back the range the bins span (waits for the GPU)."""
+        if self.histogram_buffer is None:
+            return None
+        bits = np.frombuffer(self.histogram_buffer.read(size=8), dtype=np.uint32)
+        # Undo the order-preserving transform of the compute shader
+        bits = np.where(bits & 0x80000000, bits & 0x7FFFFFFF, ~bits).astype(np.uint32)
+        low, high = bits.view(np.float32)
+        return float(low), float(high)
+
+    def draw(self) -> None:
+        if self._stream is not None or self._dirty:
+            self.update()
+        if self.histogram_buffer is None:
+            return
+        
+        self.histogram_buffer.bind_to_storage_buffer(binding=2)
+        self.bar_prog['bins'] = self._bins
+        self.bar_prog['bar_gap'] = min(max(self.settings.bar_gap, 0.0), 1.0)
+        self.bar_prog['baseline'] = self.settings.baseline
+        self.bar_prog['height'] = self.settings.height
+        self.bar_prog['normalized'] = self.settings.normalize
+        self.bar_prog['log_scale'] = self.settings.log_scale
+        self.bar_prog['color'] = self.settings.color
+        
+        self.ctx.enable(moderngl.BLEND)
+        self.vao.render(moderngl.TRIANGLES, vertices=6, instances=self._bins)
+
+class ComputeCurve:
+    """
+    Parametric curve p(t) evaluated entirely on GPU.
+    With CurveSettings.adaptive, t_range is first narrowed to the coarse segments that
+    reach the current view, then a pass over coarse_count segments of that span measures
+    how far each one deviates from its chord in pixels; off-screen segments stay single,
+    visible ones are subdivided until the deviation is below tolerance, and the total is
+    scaled to fit `count` vertices. The curve is re-sampled when the view bound at binding 0
+    (View2D.bound) is written, or t_range, count or the settings change, and drawn with an
+    indirect call, so the vertex count never leaves the GPU.
+    """
+    def __init__(self, ctx: ContextType, func_body: str, t_range: tuple, count: int = 1024, settings: Optional[CurveSettings] = None):
+        self.ctx = ctx
+        self.count = count
+        self.t_range = t_range
+        self.settings = settings if settings else CurveSettings()
+        self.func_body = func_body
+        self.adaptive_prog = None  # Adaptive sampling resources, created on first use
+        self._adaptive_state = None
+        
+        self.vbo = self.ctx.buffer(reserve=count * 8)
+        
+        cs_src = f"""
+        #version 430
+        layout(local_size_x=64) in;
+        
+        layout(std430, binding=2) buffer Dest {{
+            vec2 vertices[];
+        }};
+        
+        uniform float t0;
+        uniform float t1;
+        uniform int count;
+        
+        void main() {{
+            uint id = gl_GlobalInvocationID.x;
+            if (id >= count) return;
+            
+            float t_norm = float(id) / float(count - 1);
+            float t = t0 + t_norm * (t1 - t0);
+            
+            float x, y;
+            {func_body}
+            vertices[id] = vec2(x, y);
+        }}
+        """
+        self.compute_prog = ShaderManager.compute(ctx, cs_src)
+        
+        self.render_prog = ShaderManager.create_program(
+            ctx,
+            "shaders/curve_vertex.glsl",
+            "shaders/curve_fragment.glsl"
         )
         try:
             set_uniform_block_binding(self.render_prog, 'View', 0)
@@ -502,6 +2208,9 @@ class ComputeCurve:
         self.vao = ctx.simple_vertex_array(self.render_prog, self.vbo, "in_pos")
 
     def update(self):
+        if self.settings.adaptive:
+            self._update_adaptive()
+            return
         self.vbo.bind_to_storage_buffer(binding=2)
         self.compute_prog['t0'] = self.t_range[0]
         self.compute_prog['t1'] = self.t_range[1]
@@ -511,16 +2220,212 @@ class ComputeCurve:
         num_groups = (self.count + group_size - 1) // group_size
         self.compute_prog.run(num_groups)
 
-    def draw(self):
+    def _update_adaptive(self) -> None:
+        """Plan and evaluate the samples for the view currently bound at binding 0."""
+        if self.adaptive_prog is None:
+            src = ShaderManager.load_shader("shaders/curve_adaptive_compute.glsl").replace("// @func", self.func_body)
+            self.adaptive_prog = ShaderManager.compute(self.ctx, src)
+            self.segment_buffer = self.ctx.buffer(reserve=1024 * 8)
+            self.command_buffer = self.ctx.buffer(reserve=24)  # Draw command, then the planned t span
+        coarse = max(1, min(int(self.settings.coarse_count), 1024, self.count - 1))
+        
+        self.segment_buffer.bind_to_storage_buffer(binding=1)
+        self.vbo.bind_to_storage_buffer(binding=2)
+        self.command_buffer.bind_to_storage_buffer(binding=3)
+        self.adaptive_prog['t0'] = self.t_range[0]
+        self.adaptive_prog['t1'] = self.t_range[1]
+        self.adaptive_prog['coarse'] = coarse
+        self.adaptive_prog['budget'] = self.count
+        self.adaptive_prog['tolerance'] = max(self.settings.tolerance, 1e-3)
+        
+        # Stage 0 is a single workgroup (it prefix-sums the plan), stage 1 one thread per vertex
+        self.adaptive_prog['stage'] = 0
+        self.adaptive_prog.run(1)
+        self.ctx.memory_barrier()
+        self.adaptive_prog['stage'] = 1
+        self.adaptive_prog.run((self.count + 1023) // 1024)
+        self.ctx.memory_barrier()
+
+    def draw(self, view: Optional[View2D] = None):
+        if view is not None:
+            view.use(0)
+        if self.settings.adaptive:
+            # Without a known view at binding 0 there is nothing to compare, so re-plan every draw
+            bound = View2D.bound(self.ctx, 0)
+            state = None if bound is None else (bound.stamp, tuple(self.t_range), self.count,
+                                                self.settings.tolerance, self.settings.coarse_count)
+            if self.adaptive_prog is None or state is None or state != self._adaptive_state:
+                self._update_adaptive()
+                self._adaptive_state = state
+        
         self.render_prog['color'] = self.settings.color
         self.ctx.line_width = self.settings.width
-        self.vao.render(moderngl.LINE_STRIP)
+        if self.settings.adaptive:
+            self.vao.render_indirect(self.command_buffer, moderngl.LINE_STRIP, count=1)
+        else:
+            self.vao.render(moderngl.LINE_STRIP)
+
+class CurveFamily:
+    """
+    Many parametric curves p(t, param) sharing one func_body, e.g. a parameter sweep.
+    Each curve gets a parameter vector (up to 4 floats, `param` in GLSL, with its index
+    as `curve`); all curves are evaluated by one 2D compute dispatch into a single
+    buffer and drawn by one instanced call (gl_InstanceID selects the curve).
+    """
+    ctx: ContextType
+    count: int
+    curves: int
+    t_range: tuple
+    settings: CurveSettings
+    params_buffer: BufferType
+    vertex_buffer: BufferType
+    color_buffer: BufferType
+    
+    def __init__(self, ctx: ContextType, func_body: str, t_range: tuple, params: ArrayLike,
+                 count: int = 1024, settings: Optional[CurveSettings] = None,
+                 colors: Optional[ArrayLike | list[ColorType] | str] = None) -> None:
+        """
+        Args:
+            ctx: ModernGL context
+            func_body: GLSL statements assigning `x` and `y` from `t`, `param` (vec4) and `curve` (int)
+            t_range: (t0, t1) shared by all curves
+            params: (N,) or (N, 1..4) parameters, one row per curve
+            count: Samples per curve
+            settings: Line color and width
+            colors: N colors, or a colormap name spread across the curves,
+                    defaults to settings.color for every curve
+        """
+        self.ctx = ctx
+        self.count = count
+        self.t_range = t_range
+        self.settings = settings if settings else CurveSettings()
+        self.curves = 0
+        self.params_buffer = None
+        self.vertex_buffer = None
+        self.color_buffer = None
+        self.per_curve_color = False
+        self._colors = colors
+        
+        src = ShaderManager.load_shader("shaders/curve_family_compute.glsl").replace("// @func", func_body)
+        self.compute_prog = ShaderManager.compute(ctx, src)
+        self.render_prog = ShaderManager.create_program(
+            ctx,
+            "shaders/curve_family_vertex.glsl",
+            "shaders/multistream_fragment.glsl"
+        )
+        try:
+            set_uniform_block_binding(self.render_prog, 'View', 0)
+        except:
+            pass
+        self.vao = ctx.vertex_array(self.render_prog, [])
+        self.set_params(params)
+
+    def set_params(self, params: ArrayLike) -> None:
+        """Upload new per-curve parameters and re-evaluate; the curve count may change."""
+        params = np.asarray(params, dtype='f4')
+        params = params.reshape(len(params), -1)
+        if params.shape[1] > 4:
+            raise ValueError(f"CurveFamily supports up to 4 parameters per curve, got {params.shape[1]}")
+        
+        padded = np.zeros((len(params), 4), dtype='f4')
+        padded[:, :params.shape[1]] = params
+        if len(padded) != self.curves:
+            self.curves = len(padded)
+            for buffer in (self.params_buffer, self.vertex_buffer):
+                if buffer is not None:
+                    buffer.release()
+            self.params_buffer = self.ctx.buffer(reserve=max(self.curves, 1) * 16)
+            self.vertex_buffer = self.ctx.buffer(reserve=max(self.curves * self.count, 1) * 8)
+            if self._colors is not None and not isinstance(self._colors, str) and len(self._colors) != self.curves:
+                print(f"Warning: CurveFamily colors don't match the new curve count ({self.curves}), using settings.color")
+                self._colors = None
+            self.set_colors(self._colors)
+        if self.curves:
+            self.params_buffer.write(padded.tobytes())
+        self.update()
+
+    def set_colors(self, colors: Optional[ArrayLike | list[ColorType] | str]) -> None:
+        """N colors, a colormap name spread across the curves, or None for settings.color."""
+        self._colors = colors
+        self.per_curve_color = colors is not None and self.curves > 0
+        if not self.per_curve_color:
+            return
+        if isinstance(colors, str):
+            packed = pack_colors(colormap_lut(colors, self.curves))
+        else:
+            colors = np.asarray(colors, dtype='f4')
+            if len(colors) != self.curves:
+                raise ValueError(f"Expected {self.curves} colors, got {len(colors)}")
+            packed = pack_colors(colors)
+        if self.color_buffer is None or self.color_buffer.size < packed.nbytes:
+            if self.color_buffer is not None:
+                self.color_buffer.release()
+            self.color_buffer = self.ctx.buffer(reserve=packed.nbytes)
+        self.color_buffer.write(packed.tobytes())
+
+    def update(self) -> None:
+        """Evaluate every curve in one dispatch (x: samples, y: curves)."""
+        if self.curves == 0:
+            return
+        self.params_buffer.bind_to_storage_buffer(binding=1)
+        self.vertex_buffer.bind_to_storage_buffer(binding=2)
+        self.compute_prog['t0'] = self.t_range[0]
+        self.compute_prog['t1'] = self.t_range[1]
+        self.compute_prog['count'] = self.count
+        self.compute_prog['curves'] = self.curves
+        
+        group_size = 64
+        self.compute_prog.run((self.count + group_size - 1) // group_size, self.curves)
+        self.ctx.memory_barrier()
+
+    def draw(self) -> None:
+        if self.curves == 0:
+            return
+        self.vertex_buffer.bind_to_storage_buffer(binding=2)
+        if self.per_curve_color:
+            self.color_buffer.bind_to_storage_buffer(binding=3)
+        self.render_prog['count'] = self.count
+        self.render_prog['per_curve_color'] = self.per_curve_color
+        self.render_prog['color'] = self.settings.color
+        self.render_prog['round_points'] = False
+        
+        self.ctx.line_width = self.settings.width
+        self.ctx.enable(moderngl.BLEND)
+        self.vao.render(moderngl.LINE_STRIP, vertices=self.count, instances=self.curves)
 
 class ImplicitPlot:
-    """Rendering of f(x,y)=0 via Fragment Shader and SDF."""
-    def __init__(self, ctx: ContextType, func_body: str, settings: Optional[ImplicitSettings] = None):
+    """
+    Rendering of f(x,y)=0 via Fragment Shader and SDF.
+    When drawn with its view, the result is cached in a RenderCache and the function is
+    only evaluated again after the view, the viewport size, the settings or a uniform change.
+    
+    With ImplicitBackend.MARCHING_SQUARES a compute shader samples val on a grid over the
+    view and emits the contour as line segments into an SSBO, counted by an atomic that is
+    also the vertex count of an indirect draw. The segments are reused until the view,
+    grid size or a uniform changes (color and thickness don't re-extract), and segments()
+    reads them back for export or hit testing.
+    """
+    def __init__(self, ctx: ContextType, func_body: str, settings: Optional[ImplicitSettings] = None,
+                 uniforms: Optional[dict[str, str]] = None):
+        """
+        Args:
+            ctx: ModernGL context
+            func_body: GLSL statements assigning `val` from `x` and `y`
+            settings: Color, thickness and caching options
+            uniforms: Extra uniforms used by func_body, name -> GLSL type (e.g. {'t': 'float'}),
+                      set with set_uniform()
+        """
         self.ctx = ctx
         self.settings = settings if settings else ImplicitSettings()
+        self.func_body = func_body
+        self.uniform_types = dict(uniforms or {})
+        self.uniforms = {}
+        self._uniforms_version = 0
+        self.cache = RenderCache(ctx)
+        self.contour_prog = None  # Marching squares resources, created on first use
+        self._contour_state = None
+        declarations = "\n".join(f"uniform {glsl_type} {name};" for name, glsl_type in self.uniform_types.items())
+        self._declarations = declarations
         
         self.quad = self.ctx.buffer(np.array([-1,-1, 1,-1, -1,1, 1,1], dtype='f4'))
         
@@ -535,6 +2440,7 @@ class ImplicitPlot:
         
         uniform vec4 color;
         uniform float thickness;
+        {declarations}
         
         in vec2 uv;
         out vec4 f_color;
@@ -567,81 +2473,292 @@ class ImplicitPlot:
         }
         """
         
-        self.prog = ctx.program(vertex_shader=vs_src, fragment_shader=fs_src)
+        self.prog = ShaderManager.program(ctx, vs_src, fs_src)
         try:
             set_uniform_block_binding(self.prog, 'View', 0)
         except:
             pass
         self.vao = ctx.simple_vertex_array(self.prog, self.quad, "in_vert")
 
-    def draw(self):
+    def set_uniform(self, name: str, value) -> None:
+        """Set a uniform declared in the constructor, invalidating the cached image or contour."""
+        if name not in self.uniform_types:
+            print(f"Warning: ImplicitPlot has no declared uniform '{name}'")
+            return
+        self.uniforms[name] = value
+        self._uniforms_version += 1
+
+    def _set_uniforms(self, prog: ProgramType) -> None:
+        for name, value in self.uniforms.items():
+            if name in prog:
+                prog[name] = value
+
+    def _render(self) -> None:
         self.prog['color'] = self.settings.color
         self.prog['thickness'] = self.settings.thickness
+        self._set_uniforms(self.prog)
         self.vao.render(moderngl.TRIANGLE_STRIP)
 
+    def _init_contour(self) -> None:
+        src = ShaderManager.load_shader("shaders/contour_compute.glsl")
+        src = src.replace("// @uniforms", self._declarations).replace("// @func", self.func_body)
+        self.contour_prog = ShaderManager.compute(self.ctx, src)
+        self.values_buffer = None
+        self.segment_buffer = None
+        self.command_buffer = self.ctx.buffer(reserve=16)
+        # The geometry shader widens each segment into a quad of `thickness` pixels
+        self.line_prog = ShaderManager.create_program(
+            self.ctx,
+            "shaders/curve_vertex.glsl",
+            "shaders/curve_fragment.glsl",
+            "shaders/thick_line_geometry.glsl"
+        )
+        try:
+            set_uniform_block_binding(self.line_prog, 'View', 0)
+        except:
+            pass
+        self.line_vao = None
+
+    def extract(self) -> None:
+        """Run marching squares over the view currently bound at binding 0."""
+        if self.contour_prog is None:
+            self._init_contour()
+        cells_x, cells_y = (max(1, int(n)) for n in self.settings.grid_size)
+        max_segments = 2 * cells_x * cells_y  # Saddle cells emit two segments
+        
+        if self.segment_buffer is None or self.segment_buffer.size < max_segments * 16:
+            if self.segment_buffer is not None:
+                self.line_vao.release()
+                self.segment_buffer.release()
+                self.values_buffer.release()
+            self.values_buffer = self.ctx.buffer(reserve=(cells_x + 1) * (cells_y + 1) * 4)
+            self.segment_buffer = self.ctx.buffer(reserve=max_segments * 16)
+            self.line_vao = self.ctx.vertex_array(self.line_prog, [(self.segment_buffer, '2f', 'in_pos')])
+        elif self.values_buffer.size < (cells_x + 1) * (cells_y + 1) * 4:
+            self.values_buffer.orphan((cells_x + 1) * (cells_y + 1) * 4)
+        
+        self.command_buffer.write(struct.pack('4I', 0, 1, 0, 0))
+        self.values_buffer.bind_to_storage_buffer(binding=1)
+        self.segment_buffer.bind_to_storage_buffer(binding=2)
+        self.command_buffer.bind_to_storage_buffer(binding=3)
+        self.contour_prog['cells'] = (cells_x, cells_y)
+        self.contour_prog['max_segments'] = max_segments
+        self._set_uniforms(self.contour_prog)
+        
+        # Stage 0 samples the (cells + 1) corners, stage 1 walks the cells
+        self.contour_prog['stage'] = 0
+        self.contour_prog.run((cells_x + 16) // 16, (cells_y + 16) // 16)
+        self.ctx.memory_barrier()
+        self.contour_prog['stage'] = 1
+        self.contour_prog.run((cells_x + 15) // 16, (cells_y + 15) // 16)
+        self.ctx.memory_barrier()
+
+    def segments(self) -> np.ndarray:
+        """Read the last extracted contour back as (N, 2, 2) world-space segment endpoints."""
+        if self.contour_prog is None or self.segment_buffer is None:
+            return np.zeros((0, 2, 2), dtype='f4')
+        vertex_count = struct.unpack('I', self.command_buffer.read(4))[0]
+        count = min(vertex_count // 2, self.segment_buffer.size // 16)
+        return np.frombuffer(self.segment_buffer.read(count * 16), dtype='f4').reshape(count, 2, 2)
+
+    def _draw_contour(self, view: Optional[View2D]) -> None:
+        if view is None:
+            self.extract()
+        else:
+            state = (tuple(view.center), tuple(view.zoom), tuple(self.settings.grid_size), self._uniforms_version)
+            if state != self._contour_state or self.contour_prog is None:
+                self.extract()
+                self._contour_state = state
+        
+        self.line_prog['color'] = self.settings.color
+        self.line_prog['width'] = self.settings.thickness
+        self.ctx.enable(moderngl.BLEND)
+        self.line_vao.render_indirect(self.command_buffer, moderngl.LINES, count=1)
+
+    def draw(self, view: Optional[View2D] = None) -> None:
+        """
+        Draw into the current viewport. With the view (e.g. plot.view inside Plot2D.render)
+        the cached image is reused while nothing changed; without it the function is
+        evaluated every call.
+        """
+        if view is not None:
+            view.use(0)
+        if self.settings.backend == ImplicitBackend.MARCHING_SQUARES:
+            self._draw_contour(view)
+            return
+        if view is None or not self.settings.cached:
+            self._render()
+            return
+        key = (tuple(view.center), tuple(view.zoom), tuple(self.settings.color),
+               self.settings.thickness, self._uniforms_version)
+        self.cache.draw(key, self._render, self.settings.progressive,
+                        self.settings.preview_scale, self.settings.settle_time)
+
 class SegmentDisplay:
-    """Simple 7-segment display renderer for numbers."""
-    def __init__(self, ctx: ContextType):
+    """
+    Instanced 7-segment display renderer for numbers.
+    Every digit is one instance carrying its position, size, color and a segment
+    bit mask; the fragment shader draws the lit segments as rounded bars with a
+    distance field, so a whole wall of readouts renders in a single draw call.
+    Queue digits with add_number()/add_numbers_numpy() and draw them with flush().
+    """
+    ctx: ContextType
+    prog: ProgramType
+    thickness: float
+    quad_vbo: BufferType
+    instance_buffer: BufferType
+    vao: VAOType
+    instance_data: list[np.ndarray]
+    instance_count: int
+    
+    FLOATS_PER_INSTANCE = 8  # origin(2f), size(1f), mask(1f), color(4f)
+    DIGIT_ADVANCE = 0.8      # Horizontal advance per character, in digit heights
+    
+    # 7-segment definitions: 0 top, 1 top-left, 2 top-right, 3 middle,
+    # 4 bottom-left, 5 bottom-right, 6 bottom, 7 decimal point
+    digits = {
+        '0': [0, 1, 2, 4, 5, 6],
+        '1': [2, 5],
+        '2': [0, 2, 3, 4, 6],
+        '3': [0, 2, 3, 5, 6],
+        '4': [1, 2, 3, 5],
+        '5': [0, 1, 3, 5, 6],
+        '6': [0, 1, 3, 4, 5, 6],
+        '7': [0, 2, 5],
+        '8': [0, 1, 2, 3, 4, 5, 6],
+        '9': [0, 1, 2, 3, 5, 6],
+        '-': [3],
+        '.': [7]
+    }
+    
+    # ASCII code -> segment bit mask, 0 for characters without segments
+    SEGMENT_MASKS = np.zeros(128, dtype=np.uint8)
+    for _char, _segs in digits.items():
+        SEGMENT_MASKS[ord(_char)] = sum(1 << seg for seg in _segs)
+    del _char, _segs
+    
+    def __init__(self, ctx: ContextType, thickness: float = 0.1, max_instances: int = 4096) -> None:
+        """
+        Args:
+            ctx: ModernGL context
+            thickness: Segment thickness as a fraction of the digit height
+            max_instances: Initial instance buffer capacity in digits (grows when exceeded)
+        """
         self.ctx = ctx
+        self.thickness = thickness
         self.prog = ShaderManager.create_program(
             ctx,
             "shaders/segment_vertex.glsl",
             "shaders/segment_fragment.glsl"
         )
-        self.vbo = ctx.buffer(reserve=4096)
-        self.vao = ctx.simple_vertex_array(self.prog, self.vbo, 'in_pos')
-        
-        # 7-segment definitions (0-9)
-        self.digits = {
-            '0': [0, 1, 2, 4, 5, 6],
-            '1': [2, 5],
-            '2': [0, 2, 3, 4, 6],
-            '3': [0, 2, 3, 5, 6],
-            '4': [1, 2, 3, 5],
-            '5': [0, 1, 3, 5, 6],
-            '6': [0, 1, 3, 4, 5, 6],
-            '7': [0, 2, 5],
-            '8': [0, 1, 2, 3, 4, 5, 6],
-            '9': [0, 1, 2, 3, 5, 6],
-            '.': [7]
-        }
+        
+        # Template quad (6 vertices for 2 triangles) shared by all digits
+        quad_verts = np.array([
+            0.0, 0.0,
+            1.0, 0.0,
+            0.0, 1.0,
+            1.0, 0.0,
+            0.0, 1.0,
+            1.0, 1.0
+        ], dtype='f4')
+        self.quad_vbo = ctx.buffer(quad_verts.tobytes())
+        self.instance_buffer = ctx.buffer(reserve=max_instances * self.FLOATS_PER_INSTANCE * 4, dynamic=True)
+        self.vao = ctx.vertex_array(
+            self.prog,
+            [
+                (self.quad_vbo, '2f', 'in_corner'),
+                (self.instance_buffer, '2f 1f 1f 4f/i', 'in_origin', 'in_size', 'in_mask', 'in_color')
+            ]
+        )
+        
+        self.instance_data = []
+        self.instance_count = 0
 
-    def draw_number(self, text: str, x: float, y: float, size: float = 20.0, color: ColorType = WHITE):
-        vertices = []
+    def add_number(self, text: str, x: float, y: float, size: float = 20.0, color: ColorType = WHITE) -> None:
+        """Queue one number (any string of digits, '-' and '.') with its top-left corner at (x, y)."""
+        data = []
         cursor_x = x
-        w = size * 0.5
-        h = size
-        
         for char in str(text):
             if char not in self.digits:
                 cursor_x += size * 0.5
                 continue
-                
-            segs = self.digits[char]
-            lines = []
-            if 0 in segs: lines.extend([(0,0), (w,0)])
-            if 1 in segs: lines.extend([(0,0), (0,h/2)])
-            if 2 in segs: lines.extend([(w,0), (w,h/2)])
-            if 3 in segs: lines.extend([(0,h/2), (w,h/2)])
-            if 4 in segs: lines.extend([(0,h/2), (0,h)])
-            if 5 in segs: lines.extend([(w,h/2), (w,h)])
-            if 6 in segs: lines.extend([(0,h), (w,h)])
-            if 7 in segs: lines.extend([(w/2, h-size*0.1), (w/2, h)])
-            
-            for lx, ly in lines:
-                vertices.append(cursor_x + lx)
-                vertices.append(y + ly)
-            
-            cursor_x += size * 0.8
-            
-        if not vertices:
+            data.append([cursor_x, y, size, self.SEGMENT_MASKS[ord(char)], *color])
+            cursor_x += size * self.DIGIT_ADVANCE
+        
+        if data:
+            self.instance_data.append(np.array(data, dtype='f4'))
+            self.instance_count += len(data)
+
+    def add_numbers_numpy(self, values: ArrayLike, positions: ArrayLike, size: float | ArrayLike = 20.0,
+                          colors: ColorType | ArrayLike = WHITE, decimals: int = 0, width: int = 0) -> None:
+        """
+        Queue many numbers at once without a Python loop per digit.
+        Values are formatted with numpy as fixed-point text and every character cell
+        advances by the same amount, so readouts with a width stay right-aligned.
+        
+        Args:
+            values: (N,) array of numbers
+            positions: (N, 2) array of top-left (x, y) positions in pixels
+            size: Digit height in pixels, scalar or (N,) array
+            colors: Single color or (N, 4) array of (r, g, b, a) colors
+            decimals: Digits after the decimal point
+            width: Minimum number of characters, shorter numbers are padded on the left
+        """
+        values = np.asarray(values, dtype='f8').ravel()
+        n = len(values)
+        if n == 0:
             return
+        
+        # Format on the numpy side and read the characters back as ASCII codes
+        text = np.char.encode(np.char.mod(f"%{width}.{decimals}f", values), 'ascii')
+        length = text.dtype.itemsize
+        codes = text.view(np.uint8).reshape(n, length)
+        masks = self.SEGMENT_MASKS[codes & 0x7f]
+        
+        positions = np.asarray(positions, dtype='f4').reshape(n, 2)
+        sizes = np.broadcast_to(np.asarray(size, dtype='f4'), (n,))
+        if isinstance(colors, Color):
+            colors = tuple(colors)
+        elif isinstance(colors, (list, tuple)) and len(colors) and isinstance(colors[0], Color):
+            colors = [tuple(c) for c in colors]
+        colors = np.broadcast_to(np.asarray(colors, dtype='f4'), (n, 4))
+        
+        # Format: origin(2), size(1), mask(1), color(4) = 8 floats per character cell
+        data = np.empty((n, length, self.FLOATS_PER_INSTANCE), dtype='f4')
+        data[:, :, 0] = positions[:, 0:1] + np.arange(length, dtype='f4') * (sizes[:, None] * self.DIGIT_ADVANCE)
+        data[:, :, 1] = positions[:, 1:2]
+        data[:, :, 2] = sizes[:, None]
+        data[:, :, 3] = masks
+        data[:, :, 4:8] = colors[:, None, :]
+        
+        # Blank cells (padding, unknown characters) are not drawn
+        data = data[masks != 0]
+        self.instance_data.append(data)
+        self.instance_count += len(data)
 
-        data = np.array(vertices, dtype='f4')
-        self.vbo.write(data.tobytes())
+    def flush(self) -> None:
+        """Draw all queued digits in a single draw call."""
+        if self.instance_count == 0:
+            return
+        
+        data = np.concatenate(self.instance_data) if len(self.instance_data) > 1 else self.instance_data[0]
+        # Orphan every frame so the write never waits on the previous draw, growing if needed
+        self.instance_buffer.orphan(max(self.instance_buffer.size, data.nbytes))
+        self.instance_buffer.write(data)
         
-        fb_size = self.ctx.viewport[2:]
-        self.prog['resolution'] = fb_size
-        self.prog['color'] = color
+        self.ctx.enable(moderngl.BLEND)
+        self.prog['resolution'] = self.ctx.viewport[2:]
+        self.prog['thickness'] = self.thickness
+        self.vao.render(moderngl.TRIANGLES, vertices=6, instances=self.instance_count)
         
-        self.vao.render(moderngl.LINES, vertices=len(vertices)//2)
\ No newline at end of file
+        self.clear()
+
+    def clear(self) -> None:
+        """Clear the queued digits without drawing."""
+        self.instance_data.clear()
+        self.instance_count = 0
+
+    def draw_number(self, text: str, x: float, y: float, size: float = 20.0, color: ColorType = WHITE) -> None:
+        """Draw one number immediately (queued digits are drawn in the same call)."""
+        self.add_number(text, x, y, size, color)
+        self.flush()
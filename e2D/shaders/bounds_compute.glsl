@@ -0,0 +1,68 @@
+#version 430
+layout(local_size_x=256) in;
+
+// Ring of vec2 points, e.g. a GpuStream buffer
+layout(std430, binding=1) readonly buffer Points {
+    vec2 points[];
+};
+
+// One partial result per workgroup, merged on the CPU
+struct Partial {
+    vec2 lo;
+    vec2 hi;
+    vec2 sum;
+    uint count;
+    uint _pad;
+};
+layout(std430, binding=2) writeonly buffer Partials {
+    Partial partials[];
+};
+
+uniform uint start_index;
+uniform uint count;
+uniform uint capacity;
+
+shared vec2 s_lo[256];
+shared vec2 s_hi[256];
+shared vec2 s_sum[256];
+shared uint s_count[256];
+
+void main() {
+    uint lid = gl_LocalInvocationID.x;
+    uint threads = gl_NumWorkGroups.x * gl_WorkGroupSize.x;
+
+    vec2 lo = vec2(3.4e38);
+    vec2 hi = vec2(-3.4e38);
+    vec2 sum = vec2(0.0);
+    uint n = 0u;
+
+    // Grid-stride loop over the ring range, skipping NaN gaps
+    for (uint i = gl_GlobalInvocationID.x; i < count; i += threads) {
+        vec2 p = points[(start_index + i) % capacity];
+        if (any(isnan(p))) continue;
+        lo = min(lo, p);
+        hi = max(hi, p);
+        sum += p;
+        n++;
+    }
+
+    s_lo[lid] = lo;
+    s_hi[lid] = hi;
+    s_sum[lid] = sum;
+    s_count[lid] = n;
+    barrier();
+
+    for (uint stride = 128u; stride > 0u; stride >>= 1) {
+        if (lid < stride) {
+            s_lo[lid] = min(s_lo[lid], s_lo[lid + stride]);
+            s_hi[lid] = max(s_hi[lid], s_hi[lid + stride]);
+            s_sum[lid] += s_sum[lid + stride];
+            s_count[lid] += s_count[lid + stride];
+        }
+        barrier();
+    }
+
+    if (lid == 0u) {
+        partials[gl_WorkGroupID.x] = Partial(s_lo[0], s_hi[0], s_sum[0], s_count[0], 0u);
+    }
+}
@@ -0,0 +1,9 @@
+#version 430
+uniform sampler2D image;
+
+in vec2 uv;
+out vec4 f_color;
+
+void main() {
+    f_color = texture(image, uv);
+}
@@ -0,0 +1,104 @@
+#version 430
+layout(local_size_x=16, local_size_y=16) in;
+
+layout(std140, binding=0) uniform View {
+    vec2 resolution;
+    vec2 center;
+    vec2 scale;
+    float aspect;
+} view;
+
+layout(std430, binding=1) buffer Values {
+    float values[];  // (cells.x + 1) * (cells.y + 1) grid corners, row-major
+};
+
+layout(std430, binding=2) writeonly buffer Segments {
+    vec4 segments[];  // (x0, y0, x1, y1) in world space
+};
+
+// DrawArraysIndirect command, vertex_count doubles as the segment counter
+layout(std430, binding=3) buffer Command {
+    uint vertex_count;
+    uint instance_count;
+    uint first;
+    uint base_instance;
+};
+
+uniform int stage;  // 0 sample val on the grid corners, 1 emit the contour segments
+uniform ivec2 cells;
+uniform uint max_segments;
+// @uniforms
+
+float sample_val(vec2 p) {
+    float x = p.x;
+    float y = p.y;
+    float val;
+    // @func
+    return val;
+}
+
+vec2 corner_pos(ivec2 corner) {
+    vec2 lo = view.center - 1.0 / view.scale;
+    vec2 hi = view.center + 1.0 / view.scale;
+    return mix(lo, hi, vec2(corner) / vec2(cells));
+}
+
+float corner_val(ivec2 corner) {
+    return values[corner.y * (cells.x + 1) + corner.x];
+}
+
+// Crossing point on cell edge e: 0 bottom, 1 right, 2 top, 3 left
+vec2 edge_point(int e, ivec2 cell, vec4 v) {
+    ivec2 offsets[4] = ivec2[](ivec2(0, 0), ivec2(1, 0), ivec2(1, 1), ivec2(0, 1));
+    int a = e;
+    int b = (e + 1) % 4;
+    float t = v[a] / (v[a] - v[b]);
+    return mix(corner_pos(cell + offsets[a]), corner_pos(cell + offsets[b]), t);
+}
+
+void emit(int e0, int e1, ivec2 cell, vec4 v) {
+    uint index = atomicAdd(vertex_count, 2u) / 2u;
+    if (index < max_segments) {
+        segments[index] = vec4(edge_point(e0, cell, v), edge_point(e1, cell, v));
+    }
+}
+
+void main() {
+    ivec2 id = ivec2(gl_GlobalInvocationID.xy);
+
+    if (stage == 0) {
+        if (any(greaterThan(id, cells))) return;
+        values[id.y * (cells.x + 1) + id.x] = sample_val(corner_pos(id));
+        return;
+    }
+
+    if (any(greaterThanEqual(id, cells))) return;
+    vec4 v = vec4(corner_val(id), corner_val(id + ivec2(1, 0)),
+                  corner_val(id + ivec2(1, 1)), corner_val(id + ivec2(0, 1)));
+    if (any(isnan(v)) || any(isinf(v))) return;
+
+    int code = int(v.x > 0.0) | int(v.y > 0.0) << 1 | int(v.z > 0.0) << 2 | int(v.w > 0.0) << 3;
+    if (code == 0 || code == 15) return;
+
+    // Saddles: the cell center decides which diagonal corners are connected
+    if (code == 5 || code == 10) {
+        bool center_inside = (v.x + v.y + v.z + v.w) > 0.0;
+        if ((code == 5) == center_inside) {
+            emit(0, 1, id, v);
+            emit(2, 3, id, v);
+        } else {
+            emit(3, 0, id, v);
+            emit(1, 2, id, v);
+        }
+        return;
+    }
+
+    // Edge pairs for the remaining cases, complementary codes share their edges
+    ivec2 edges[16] = ivec2[](
+        ivec2(-1), ivec2(3, 0), ivec2(0, 1), ivec2(3, 1),
+        ivec2(1, 2), ivec2(-1), ivec2(0, 2), ivec2(3, 2),
+        ivec2(3, 2), ivec2(0, 2), ivec2(-1), ivec2(1, 2),
+        ivec2(3, 1), ivec2(0, 1), ivec2(3, 0), ivec2(-1)
+    );
+    emit(edges[code].x, edges[code].y, id, v);
+}
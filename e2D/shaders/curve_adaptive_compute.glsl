@@ -0,0 +1,173 @@
+#version 430
+#define MAX_SEGMENTS 1024
+layout(local_size_x=MAX_SEGMENTS) in;
+
+layout(std140, binding=0) uniform View {
+    vec2 resolution;
+    vec2 center;
+    vec2 scale;
+    float aspect;
+} view;
+
+layout(std430, binding=1) buffer Segments {
+    uvec2 segments[];  // (first vertex, subdivisions) per coarse segment
+};
+
+layout(std430, binding=2) writeonly buffer Dest {
+    vec2 vertices[];
+};
+
+// DrawArraysIndirect command and the planned t span, written by stage 0
+layout(std430, binding=3) buffer Command {
+    uint vertex_count;
+    uint instance_count;
+    uint first;
+    uint base_instance;
+    vec2 span;
+};
+
+uniform int stage;  // 0 estimate the error and plan the samples, 1 evaluate the samples
+uniform float t0;
+uniform float t1;
+uniform uint coarse;     // Coarse segments (<= MAX_SEGMENTS)
+uniform uint budget;     // Largest vertex count
+uniform float tolerance; // Allowed deviation from the true curve, in pixels
+
+shared uint scan[MAX_SEGMENTS];
+shared uint visible_first;
+shared uint visible_last;
+
+vec2 curve_point(float t) {
+    float x, y;
+    // @func
+    return vec2(x, y);
+}
+
+vec2 to_pixels(vec2 p) {
+    return (p - view.center) * view.scale * 0.5 * view.resolution;
+}
+
+float segment_distance(vec2 p, vec2 a, vec2 b) {
+    vec2 ab = b - a;
+    float h = clamp(dot(p - a, ab) / max(dot(ab, ab), 1e-12), 0.0, 1.0);
+    return length(p - a - ab * h);
+}
+
+// Inclusive prefix sum of scan[] over the workgroup
+void prefix_sum(uint i) {
+    for (uint offset = 1u; offset < MAX_SEGMENTS; offset <<= 1) {
+        uint value = i >= offset ? scan[i - offset] : 0u;
+        barrier();
+        scan[i] += value;
+        barrier();
+    }
+}
+
+// Probe one coarse segment: whether it may be on screen, and the subdivisions it needs beyond the first
+bool measure(float ta, float dt, out uint extra) {
+    vec2 a = to_pixels(curve_point(ta));
+    vec2 b = to_pixels(curve_point(ta + dt));
+    vec2 q1 = to_pixels(curve_point(ta + dt * 0.25));
+    vec2 q2 = to_pixels(curve_point(ta + dt * 0.5));
+    vec2 q3 = to_pixels(curve_point(ta + dt * 0.75));
+
+    // Segments entirely outside the view keep a single subdivision
+    vec2 lo = min(min(min(a, b), min(q1, q2)), q3);
+    vec2 hi = max(max(max(a, b), max(q1, q2)), q3);
+    vec2 half_size = 0.5 * view.resolution;
+    bool visible = all(lessThanEqual(lo, half_size)) && all(greaterThanEqual(hi, -half_size));
+
+    // Chord deviation shrinks with the square of the subdivisions
+    float error = max(max(segment_distance(q1, a, b), segment_distance(q2, a, b)), segment_distance(q3, a, b));
+    extra = 0u;
+    if (visible && error > tolerance && !isnan(error)) {
+        extra = uint(min(ceil(sqrt(error / tolerance)), float(budget))) - 1u;
+    }
+    return visible;
+}
+
+void plan() {
+    uint i = gl_LocalInvocationID.x;
+    uint extra = 0u;  // Subdivisions beyond the first
+
+    // Narrow t0..t1 to the coarse segments that reach the view, so a zoomed-in view
+    // gets every coarse segment instead of the few that happen to fall inside it
+    if (i == 0u) {
+        visible_first = MAX_SEGMENTS;
+        visible_last = 0u;
+    }
+    barrier();
+    float dt = (t1 - t0) / float(coarse);
+    if (i < coarse && measure(t0 + dt * float(i), dt, extra)) {
+        atomicMin(visible_first, i);
+        atomicMax(visible_last, i);
+    }
+    barrier();
+    vec2 range = vec2(t0, t1);
+    if (visible_first <= visible_last) {
+        range = vec2(t0 + dt * float(visible_first), visible_last + 1u == coarse ? t1 : t0 + dt * float(visible_last + 1u));
+    }
+
+    dt = (range.y - range.x) / float(coarse);
+    extra = 0u;
+    if (i < coarse) {
+        measure(range.x + dt * float(i), dt, extra);
+    }
+
+    scan[i] = extra;
+    barrier();
+    prefix_sum(i);
+
+    // Scale the refinement down when it exceeds the vertex budget
+    uint total = scan[MAX_SEGMENTS - 1u];
+    uint available = budget - 1u - coarse;
+    barrier();
+    if (total > available) {
+        extra = uint(floor(float(extra) * float(available) / float(total)));
+        scan[i] = extra;
+        barrier();
+        prefix_sum(i);
+        total = scan[MAX_SEGMENTS - 1u];
+    }
+
+    if (i < coarse) {
+        segments[i] = uvec2(i + scan[i] - extra, extra + 1u);
+    }
+    if (i == 0u) {
+        vertex_count = coarse + total + 1u;  // Plus the final endpoint
+        instance_count = 1u;
+        first = 0u;
+        base_instance = 0u;
+        span = range;
+    }
+}
+
+void evaluate() {
+    uint j = gl_GlobalInvocationID.x;
+    if (j >= vertex_count) return;
+
+    float dt = (span.y - span.x) / float(coarse);
+    if (j == vertex_count - 1u) {
+        vertices[j] = curve_point(span.y);
+        return;
+    }
+
+    // Last coarse segment starting at or before j
+    uint low = 0u;
+    uint high = coarse - 1u;
+    while (low < high) {
+        uint mid = (low + high + 1u) / 2u;
+        if (segments[mid].x <= j) low = mid; else high = mid - 1u;
+    }
+    uvec2 segment = segments[low];
+    float t = span.x + dt * (float(low) + float(j - segment.x) / float(segment.y));
+    vertices[j] = curve_point(t);
+}
+
+void main() {
+    if (stage == 0) {
+        plan();
+    } else {
+        evaluate();
+    }
+}
@@ -0,0 +1,29 @@
+#version 430
+layout(local_size_x=64, local_size_y=1) in;
+
+layout(std430, binding=1) readonly buffer Params {
+    vec4 params[];  // One parameter vector per curve, unused components are 0
+};
+
+layout(std430, binding=2) writeonly buffer Dest {
+    vec2 vertices[];  // Curve-major: count samples of curve 0, then curve 1, ...
+};
+
+uniform float t0;
+uniform float t1;
+uniform int count;
+uniform int curves;
+
+void main() {
+    int id = int(gl_GlobalInvocationID.x);
+    int curve = int(gl_GlobalInvocationID.y);
+    if (id >= count || curve >= curves) return;
+    
+    float t_norm = float(id) / float(count - 1);
+    float t = t0 + t_norm * (t1 - t0);
+    vec4 param = params[curve];
+    
+    float x, y;
+    // @func
+    vertices[curve * count + id] = vec2(x, y);
+}
@@ -0,0 +1,27 @@
+#version 430
+layout(std140, binding=0) uniform View {
+    vec2 resolution;
+    vec2 center;
+    vec2 scale;
+    float aspect;
+} view;
+
+layout(std430, binding=2) readonly buffer Vertices {
+    vec2 vertices[];
+};
+layout(std430, binding=3) readonly buffer Colors {
+    uint colors[];  // Packed RGBA8 per curve
+};
+
+uniform int count;
+uniform bool per_curve_color;
+uniform vec4 color;
+
+out vec4 v_color;
+
+void main() {
+    // The instance is the curve
+    vec2 p = vertices[gl_InstanceID * count + gl_VertexID];
+    gl_Position = vec4((p - view.center) * view.scale, 0.0, 1.0);
+    v_color = per_curve_color ? unpackUnorm4x8(colors[gl_InstanceID]) : color;
+}
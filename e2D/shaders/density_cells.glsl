@@ -0,0 +1,24 @@
+// Bin lookup shared by the density compute and fragment shaders
+uniform float bin_size;  // Bin width in pixels
+uniform bool hexagonal;
+
+ivec2 cell_of(vec2 pixel) {
+    if (!hexagonal) {
+        return ivec2(floor(pixel / bin_size));
+    }
+    // Pointy-top hexagons bin_size wide: axial coordinates, cube rounding, then odd-r offset
+    float radius = bin_size / sqrt(3.0);
+    float q = (sqrt(3.0) / 3.0 * pixel.x - pixel.y / 3.0) / radius;
+    float r = (2.0 / 3.0 * pixel.y) / radius;
+    vec3 cube = vec3(q, r, -q - r);
+    vec3 rounded = round(cube);
+    vec3 diff = abs(rounded - cube);
+    if (diff.x > diff.y && diff.x > diff.z) {
+        rounded.x = -rounded.y - rounded.z;
+    } else if (diff.y > diff.z) {
+        rounded.y = -rounded.x - rounded.z;
+    }
+    int row = int(rounded.y);
+    int col = int(rounded.x) + (row - (row & 1)) / 2;
+    return ivec2(col + 1, row + 1);  // +1 keeps the half cells on the left/top edge in range
+}
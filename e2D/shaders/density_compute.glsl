@@ -0,0 +1,54 @@
+#version 430
+layout(local_size_x=256) in;
+
+layout(std140, binding=0) uniform View {
+    vec2 resolution;
+    vec2 center;
+    vec2 scale;
+    float aspect;
+} view;
+
+layout(std430, binding=1) readonly buffer Positions {
+    vec2 positions[];
+};
+
+layout(std430, binding=2) buffer Stats {
+    uint max_count;
+};
+
+layout(r32ui, binding=0) uniform uimage2D bins;
+
+uniform int stage;  // 0 clear the bins, 1 bin the points, 2 find the largest bin
+uniform uint count;
+
+// @cells
+
+void main() {
+    uint id = gl_GlobalInvocationID.x;
+    uint threads = gl_NumWorkGroups.x * gl_WorkGroupSize.x;
+    ivec2 size = imageSize(bins);
+    uint texels = uint(size.x * size.y);
+    
+    if (stage == 1) {
+        // Grid-stride loop, dispatches are capped well below the point count
+        for (uint i = id; i < count; i += threads) {
+            vec2 ndc = (positions[i] - view.center) * view.scale;
+            if (any(greaterThan(abs(ndc), vec2(1.0)))) continue;
+            vec2 pixel = (ndc * 0.5 + 0.5) * view.resolution;
+            ivec2 cell = cell_of(pixel);
+            if (all(greaterThanEqual(cell, ivec2(0))) && all(lessThan(cell, size))) {
+                imageAtomicAdd(bins, cell, 1u);
+            }
+        }
+        return;
+    }
+    
+    for (uint i = id; i < texels; i += threads) {
+        ivec2 cell = ivec2(int(i) % size.x, int(i) / size.x);
+        if (stage == 0) {
+            imageStore(bins, cell, uvec4(0u));
+        } else {
+            atomicMax(max_count, imageLoad(bins, cell).r);
+        }
+    }
+}
@@ -0,0 +1,33 @@
+#version 430
+layout(std140, binding=0) uniform View {
+    vec2 resolution;
+    vec2 center;
+    vec2 scale;
+    float aspect;
+} view;
+
+layout(std430, binding=2) readonly buffer Stats {
+    uint max_count;
+};
+
+uniform usampler2D bins;
+uniform sampler2D colormap;
+uniform bool log_scale;
+uniform float opacity;
+
+// @cells
+
+in vec2 uv;
+out vec4 f_color;
+
+void main() {
+    ivec2 cell = clamp(cell_of(uv * view.resolution), ivec2(0), textureSize(bins, 0) - 1);
+    uint count = texelFetch(bins, cell, 0).r;
+    if (count == 0u) discard;
+    
+    float top = float(max(max_count, 1u));
+    float t = log_scale ? log(1.0 + float(count)) / log(1.0 + top) : float(count) / top;
+    float texel = 1.0 / float(textureSize(colormap, 0).x);
+    vec4 color = texture(colormap, vec2(mix(0.5 * texel, 1.0 - 0.5 * texel, t), 0.5));
+    f_color = vec4(color.rgb, color.a * opacity);
+}
@@ -0,0 +1,19 @@
+#version 430
+uniform sampler2D field;
+uniform sampler2D colormap;
+uniform vec2 value_range;
+uniform float opacity;
+uniform float row_offset;  // Ring start for waterfalls, rows wrap around the texture
+
+in vec2 uv;
+out vec4 f_color;
+
+void main() {
+    float value = texture(field, vec2(uv.x, uv.y + row_offset)).r;
+    if (isnan(value)) discard;
+    
+    float t = clamp((value - value_range.x) / (value_range.y - value_range.x), 0.0, 1.0);
+    float texel = 1.0 / float(textureSize(colormap, 0).x);
+    vec4 color = texture(colormap, vec2(mix(0.5 * texel, 1.0 - 0.5 * texel, t), 0.5));
+    f_color = vec4(color.rgb, color.a * opacity);
+}
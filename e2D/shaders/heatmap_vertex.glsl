@@ -0,0 +1,18 @@
+#version 430
+layout(std140, binding=0) uniform View {
+    vec2 resolution;
+    vec2 center;
+    vec2 scale;
+    float aspect;
+} view;
+
+uniform vec4 extent;  // World rect: x_min, y_min, x_max, y_max
+
+in vec2 in_vert;  // 0..1 over the quad
+out vec2 uv;
+
+void main() {
+    uv = in_vert;
+    vec2 p = mix(extent.xy, extent.zw, in_vert);
+    gl_Position = vec4((p - view.center) * view.scale, 0.0, 1.0);
+}
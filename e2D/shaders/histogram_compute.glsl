@@ -0,0 +1,101 @@
+#version 430
+#define MAX_BINS 4096
+layout(local_size_x=256) in;
+
+// Source values: element i of the ring is values[((start + i) % capacity) * stride + component]
+layout(std430, binding=1) readonly buffer Values {
+    float values[];
+};
+
+layout(std430, binding=2) buffer Histogram {
+    uint range_bits[2];  // Order-preserving bits of the value range (min, max)
+    uint max_count;
+    uint total;
+    uint counts[];
+};
+
+uniform int stage;  // 0 clear, 1 find the value range, 2 bin the values, 3 find the largest bin
+uniform uint start_index;
+uniform uint count;
+uniform uint capacity;
+uniform uint stride;
+uniform uint component;
+uniform uint bins;
+uniform bool auto_range;
+uniform vec2 value_range;  // Used when auto_range is off
+
+shared uint local_counts[MAX_BINS];
+
+// Float bits whose unsigned order matches the float order, for atomicMin/atomicMax
+uint ordered(float f) {
+    uint u = floatBitsToUint(f);
+    return (u & 0x80000000u) != 0u ? ~u : u | 0x80000000u;
+}
+
+float unordered(uint u) {
+    return uintBitsToFloat((u & 0x80000000u) != 0u ? u & 0x7FFFFFFFu : ~u);
+}
+
+float value_at(uint i) {
+    return values[((start_index + i) % capacity) * stride + component];
+}
+
+void main() {
+    uint id = gl_GlobalInvocationID.x;
+    uint lid = gl_LocalInvocationID.x;
+    uint threads = gl_NumWorkGroups.x * gl_WorkGroupSize.x;
+
+    if (stage == 0) {
+        for (uint b = id; b < bins; b += threads) counts[b] = 0u;
+        if (id == 0u) {
+            range_bits[0] = auto_range ? ordered(3.4e38) : ordered(value_range.x);
+            range_bits[1] = auto_range ? ordered(-3.4e38) : ordered(value_range.y);
+            max_count = 0u;
+            total = 0u;
+        }
+        return;
+    }
+
+    if (stage == 1) {
+        float lo = 3.4e38;
+        float hi = -3.4e38;
+        for (uint i = id; i < count; i += threads) {
+            float v = value_at(i);
+            if (isnan(v) || isinf(v)) continue;
+            lo = min(lo, v);
+            hi = max(hi, v);
+        }
+        if (lo <= hi) {
+            atomicMin(range_bits[0], ordered(lo));
+            atomicMax(range_bits[1], ordered(hi));
+        }
+        return;
+    }
+
+    if (stage == 3) {
+        for (uint b = id; b < bins; b += threads) atomicMax(max_count, counts[b]);
+        return;
+    }
+
+    // Stage 2: per-workgroup histogram in shared memory, merged once per bin
+    for (uint b = lid; b < bins; b += gl_WorkGroupSize.x) local_counts[b] = 0u;
+    barrier();
+
+    float lo = unordered(range_bits[0]);
+    float hi = unordered(range_bits[1]);
+    float width = hi > lo ? hi - lo : 1.0;
+    uint binned = 0u;
+    for (uint i = id; i < count; i += threads) {
+        float v = value_at(i);
+        if (isnan(v) || v < lo || v > hi) continue;
+        uint b = min(uint((v - lo) / width * float(bins)), bins - 1u);  // max lands in the last bin
+        atomicAdd(local_counts[b], 1u);
+        binned++;
+    }
+    barrier();
+
+    for (uint b = lid; b < bins; b += gl_WorkGroupSize.x) {
+        if (local_counts[b] > 0u) atomicAdd(counts[b], local_counts[b]);
+    }
+    if (binned > 0u) atomicAdd(total, binned);
+}
@@ -0,0 +1,48 @@
+#version 430
+layout(std140, binding=0) uniform View {
+    vec2 resolution;
+    vec2 center;
+    vec2 scale;
+    float aspect;
+} view;
+
+layout(std430, binding=2) readonly buffer Histogram {
+    uint range_bits[2];
+    uint max_count;
+    uint total;
+    uint counts[];
+};
+
+uniform uint bins;
+uniform float bar_gap;    // Fraction of the bin width left empty
+uniform float baseline;   // World y of the bar bottoms
+uniform float height;     // World height of the tallest bar when normalized
+uniform bool normalized;  // Scale bars so the tallest one is `height` tall
+uniform bool log_scale;   // Bar height from log(1 + count)
+
+float unordered(uint u) {
+    return uintBitsToFloat((u & 0x80000000u) != 0u ? u & 0x7FFFFFFFu : ~u);
+}
+
+void main() {
+    // Two triangles per bar, the instance is the bin
+    const vec2 corners[6] = vec2[](vec2(0, 0), vec2(1, 0), vec2(0, 1), vec2(1, 0), vec2(1, 1), vec2(0, 1));
+    vec2 corner = corners[gl_VertexID];
+    uint bin = uint(gl_InstanceID);
+
+    float lo = unordered(range_bits[0]);
+    float hi = unordered(range_bits[1]);
+    float bin_width = (hi > lo ? hi - lo : 1.0) / float(bins);
+
+    float value = float(counts[bin]);
+    float top = float(max_count);
+    if (log_scale) {
+        value = log(1.0 + value);
+        top = log(1.0 + top);
+    }
+    float bar = normalized ? (top > 0.0 ? value / top * height : 0.0) : value;
+
+    float x = lo + bin_width * (float(bin) + mix(0.5 * bar_gap, 1.0 - 0.5 * bar_gap, corner.x));
+    float y = baseline + bar * corner.y;
+    gl_Position = vec4((vec2(x, y) - view.center) * view.scale, 0.0, 1.0);
+}
@@ -0,0 +1,11 @@
+#version 430
+uniform bool round_points;
+in vec4 v_color;
+out vec4 f_color;
+void main() {
+    if (round_points) {
+        vec2 coord = gl_PointCoord - vec2(0.5);
+        if (length(coord) > 0.5) discard;
+    }
+    f_color = v_color;
+}
@@ -0,0 +1,34 @@
+#version 430
+#define CHANNELS 1  // Replaced with the channel count when the program is built
+
+layout(std140, binding=0) uniform View {
+    vec2 resolution;
+    vec2 center;
+    vec2 scale;
+    float aspect;
+} view;
+
+// Sample-major rows: x, then one y per channel
+layout(std430, binding=1) buffer SampleBuffer {
+    float samples[];
+};
+
+uniform int start_index;
+uniform int capacity;
+uniform float point_size;
+uniform vec4 colors[CHANNELS];
+uniform vec2 transforms[CHANNELS];  // (scale, offset) applied to each channel's y
+
+out vec4 v_color;
+
+void main() {
+    // Handle ring buffer wrapping, the instance is the channel
+    int idx = (start_index + gl_VertexID) % capacity;
+    int row = idx * (CHANNELS + 1);
+    vec2 t = transforms[gl_InstanceID];
+    vec2 p = vec2(samples[row], samples[row + 1 + gl_InstanceID] * t.x + t.y);
+    
+    gl_Position = vec4((p - view.center) * view.scale, 0.0, 1.0);
+    gl_PointSize = point_size;
+    v_color = colors[gl_InstanceID];
+}
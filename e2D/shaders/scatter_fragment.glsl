@@ -0,0 +1,11 @@
+#version 430
+in vec4 v_color;
+in float v_size;
+out vec4 f_color;
+void main() {
+    // Round point SDF: distance from the center in pixels, the sprite is v_size + 1 wide
+    float d = length(gl_PointCoord - vec2(0.5)) * (v_size + 1.0);
+    float alpha = clamp(v_size * 0.5 - d + 0.5, 0.0, 1.0);
+    if (alpha <= 0.0) discard;
+    f_color = vec4(v_color.rgb, v_color.a * alpha);
+}
@@ -0,0 +1,48 @@
+#version 430
+layout(std140, binding=0) uniform View {
+    vec2 resolution;
+    vec2 center;
+    vec2 scale;
+    float aspect;
+} view;
+
+// One array per attribute so numpy arrays upload without interleaving
+layout(std430, binding=1) readonly buffer Positions {
+    vec2 positions[];
+};
+layout(std430, binding=2) readonly buffer Sizes {
+    float sizes[];
+};
+layout(std430, binding=3) readonly buffer Colors {
+    uint colors[];  // Packed RGBA8, or float values (color_mode 2)
+};
+
+uniform bool per_point_size;
+uniform int color_mode;  // 0 uniform color, 1 packed RGBA8 per point, 2 value through the colormap
+uniform float point_size;
+uniform vec4 color;
+uniform vec2 value_range;
+uniform sampler2D colormap;
+
+out vec4 v_color;
+out float v_size;
+
+void main() {
+    vec2 p = positions[gl_VertexID];
+    gl_Position = vec4((p - view.center) * view.scale, 0.0, 1.0);
+    
+    float size = per_point_size ? sizes[gl_VertexID] : point_size;
+    gl_PointSize = size + 1.0;  // One extra pixel for the antialiased edge
+    v_size = size;
+    
+    if (color_mode == 1) {
+        v_color = unpackUnorm4x8(colors[gl_VertexID]);
+    } else if (color_mode == 2) {
+        float value = uintBitsToFloat(colors[gl_VertexID]);
+        float t = clamp((value - value_range.x) / (value_range.y - value_range.x), 0.0, 1.0);
+        float texel = 1.0 / float(textureSize(colormap, 0).x);
+        v_color = texture(colormap, vec2(mix(0.5 * texel, 1.0 - 0.5 * texel, t), 0.5));
+    } else {
+        v_color = color;
+    }
+}
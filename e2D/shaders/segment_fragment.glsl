@@ -1,6 +1,46 @@
 #version 430
-uniform vec4 color;
+uniform float thickness;
+
+in vec2 v_local;
+flat in int v_mask;
+flat in vec4 v_color;
 out vec4 f_color;
+
+// Segment endpoints in digit heights (width 0.5, height 1.0)
+const vec4 SEGMENTS[7] = vec4[7](
+    vec4(0.0, 0.0, 0.5, 0.0),  // 0 top
+    vec4(0.0, 0.0, 0.0, 0.5),  // 1 top-left
+    vec4(0.5, 0.0, 0.5, 0.5),  // 2 top-right
+    vec4(0.0, 0.5, 0.5, 0.5),  // 3 middle
+    vec4(0.0, 0.5, 0.0, 1.0),  // 4 bottom-left
+    vec4(0.5, 0.5, 0.5, 1.0),  // 5 bottom-right
+    vec4(0.0, 1.0, 0.5, 1.0)   // 6 bottom
+);
+
+float segment_distance(vec2 p, vec2 a, vec2 b) {
+    vec2 pa = p - a;
+    vec2 ba = b - a;
+    float h = clamp(dot(pa, ba) / dot(ba, ba), 0.0, 1.0);
+    return length(pa - ba * h);
+}
+
 void main() {
-    f_color = color;
+    float radius = thickness * 0.5;
+    float gap = thickness * 0.9;  // Shorten segments so neighbours stay visibly separate
+    float d = 1e6;
+    
+    for (int i = 0; i < 7; i++) {
+        if ((v_mask & (1 << i)) == 0) continue;
+        vec2 a = SEGMENTS[i].xy;
+        vec2 b = SEGMENTS[i].zw;
+        vec2 dir = normalize(b - a);
+        d = min(d, segment_distance(v_local, a + dir * gap, b - dir * gap) - radius);
+    }
+    if ((v_mask & 128) != 0) {
+        d = min(d, length(v_local - vec2(0.25, 1.0)) - radius * 1.2);
+    }
+    
+    float alpha = clamp(0.5 - d / fwidth(d), 0.0, 1.0);
+    if (alpha <= 0.0) discard;
+    f_color = vec4(v_color.rgb, v_color.a * alpha);
 }
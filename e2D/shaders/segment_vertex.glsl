@@ -1,9 +1,31 @@
 #version 430
 uniform vec2 resolution;
-in vec2 in_pos;
+uniform float thickness;  // Segment thickness as a fraction of the digit height
+
+// Per-vertex: unit quad corner (0..1)
+in vec2 in_corner;
+
+// Per-instance: one digit cell
+in vec2 in_origin;  // Top-left corner of the digit in pixels
+in float in_size;   // Digit height in pixels
+in float in_mask;   // Lit segments, bit i = segment i (7 = decimal point)
+in vec4 in_color;
+
+out vec2 v_local;   // Position inside the digit, in digit heights
+flat out int v_mask;
+flat out vec4 v_color;
+
 void main() {
+    // Cover the 0.5 x 1.0 digit plus room for the rounded segment ends
+    vec2 local = mix(vec2(-thickness), vec2(0.5 + thickness, 1.0 + thickness), in_corner);
+    vec2 pos = in_origin + local * in_size;
+    
     // Convert pixel coords to NDC
-    vec2 ndc = (in_pos / resolution) * 2.0 - 1.0;
+    vec2 ndc = (pos / resolution) * 2.0 - 1.0;
     ndc.y = -ndc.y; // Flip Y
     gl_Position = vec4(ndc, 0.0, 1.0);
+    
+    v_local = local;
+    v_mask = int(in_mask + 0.5);
+    v_color = in_color;
 }
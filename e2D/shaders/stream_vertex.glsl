@@ -13,11 +13,12 @@ layout(std430, binding=1) buffer PointBuffer {
 uniform int start_index;
 uniform int capacity;
 uniform float point_size;
+uniform vec2 offset;  // Added to every stored point
 
 void main() {
     // Handle ring buffer wrapping
     int idx = (start_index + gl_VertexID) % capacity;
-    vec2 p = points[idx];
+    vec2 p = points[idx] + offset;
     
     gl_Position = vec4((p - view.center) * view.scale, 0.0, 1.0);
     gl_PointSize = point_size;
@@ -0,0 +1,34 @@
+#version 430
+layout(lines) in;
+layout(triangle_strip, max_vertices=4) out;
+
+layout(std140, binding=0) uniform View {
+    vec2 resolution;
+    vec2 center;
+    vec2 scale;
+    float aspect;
+} view;
+
+uniform float width;  // Line width in pixels
+
+// Expand each line segment into a quad `width` pixels wide, since core profiles ignore glLineWidth
+void main() {
+    vec2 a = gl_in[0].gl_Position.xy;
+    vec2 b = gl_in[1].gl_Position.xy;
+    vec2 dir = (b - a) * view.resolution;
+    if (dot(dir, dir) < 1e-12) {
+        dir = vec2(1.0, 0.0);
+    }
+    // Perpendicular of half the width in pixels, back to NDC
+    vec2 offset = normalize(vec2(-dir.y, dir.x)) * width / view.resolution;
+
+    gl_Position = vec4(a - offset, 0.0, 1.0);
+    EmitVertex();
+    gl_Position = vec4(a + offset, 0.0, 1.0);
+    EmitVertex();
+    gl_Position = vec4(b - offset, 0.0, 1.0);
+    EmitVertex();
+    gl_Position = vec4(b + offset, 0.0, 1.0);
+    EmitVertex();
+    EndPrimitive();
+}
@@ -1,10 +1,18 @@
+from bisect import bisect_right
+from collections import OrderedDict
 from enum import Enum
 from typing import Optional
 from PIL import Image, ImageFont
+import PIL
+import hashlib
+import json
+import os
+import re
 from attr import dataclass
 import numpy as np
 import moderngl
 from .types import ColorType, VAOType, ContextType, ProgramType, BufferType, TextureType
+from .commons import StreamingBuffer
 from .colors import normalize_color
 from .color_defs import WHITE, BLACK
 
@@ -28,6 +36,11 @@ class Pivots(Enum):
     BOTTOM_MIDDLE = 7
     BOTTOM_RIGHT = 8
 
+class TextAlign(Enum):
+    LEFT = 0
+    CENTER = 1
+    RIGHT = 2
+
 DEFAULT_12_TEXT_STYLE = TextStyle(font_size=12)
 DEFAULT_16_TEXT_STYLE = TextStyle(font_size=16)
 DEFAULT_32_TEXT_STYLE = TextStyle(font_size=32)
@@ -38,6 +51,382 @@ MONO_16_TEXT_STYLE = TextStyle(font="consola.ttf", font_size=16)
 MONO_32_TEXT_STYLE = TextStyle(font="consola.ttf", font_size=32)
 MONO_64_TEXT_STYLE = TextStyle(font="consola.ttf", font_size=64)
 
+ATLAS_CACHE_VERSION = 1
+DEFAULT_ATLAS_CACHE_DIR = os.path.join(
+    os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "e2D", "font_atlas"
+)
+
+class GlyphAtlasArray:
+    """
+    Single-channel texture array shared by glyph atlases of the same width.
+    Each atlas owns one layer and keeps its glyphs in the top-left corner of it,
+    so text in any mix of those fonts and sizes samples one texture and can be
+    drawn in a single call. Layers are as large as the largest atlas of the array;
+    the array is rebuilt from the atlases' CPU copies when it needs more layers or
+    texels. TextRenderer keeps one array per atlas width, so one large font doesn't
+    inflate the layers of every small one.
+    """
+    ctx: ContextType
+    width: int
+    height: int
+    capacity: int
+    atlases: list["GlyphAtlas"]
+    texture: TextureType
+
+    def __init__(self, ctx: ContextType, capacity: int = 4) -> None:
+        self.ctx = ctx
+        self.width = 0
+        self.height = 0
+        self.capacity = capacity
+        self.atlases = []
+        self.texture = None
+
+    def add(self, atlas: "GlyphAtlas") -> int:
+        """Register an atlas and return its layer index."""
+        self.atlases.append(atlas)
+        layer = atlas.layer = len(self.atlases) - 1
+        if layer >= self.capacity or atlas.width > self.width or atlas.height > self.height:
+            self._rebuild()
+        else:
+            self.upload(atlas)
+        return layer
+
+    def resized(self, atlas: "GlyphAtlas") -> None:
+        """Called after an atlas grew, re-uploads it (or everything if the layers are too small)."""
+        if atlas.width > self.width or atlas.height > self.height:
+            self._rebuild()
+        else:
+            self.upload(atlas)
+
+    def upload(self, atlas: "GlyphAtlas") -> None:
+        self.texture.write(np.ascontiguousarray(atlas.bitmap).tobytes(),
+                           viewport=(0, 0, atlas.layer, atlas.width, atlas.height, 1))
+
+    def write(self, layer: int, x: int, y: int, pixels: np.ndarray) -> None:
+        h, w = pixels.shape
+        self.texture.write(np.ascontiguousarray(pixels).tobytes(), viewport=(x, y, layer, w, h, 1))
+
+    def _rebuild(self) -> None:
+        while self.capacity < len(self.atlases):
+            self.capacity *= 2
+        self.width = max(self.width, *(atlas.width for atlas in self.atlases))
+        self.height = max(self.height, *(atlas.height for atlas in self.atlases))
+
+        if self.texture is not None:
+            self.texture.release()
+        self.texture = self.ctx.texture_array((self.width, self.height, self.capacity), 1,
+                                              bytes(self.width * self.height * self.capacity))
+        self.texture.filter = (moderngl.LINEAR, moderngl.LINEAR)
+        for atlas in self.atlases:
+            self.upload(atlas)
+
+class GlyphAtlas:
+    """
+    Dynamic texture atlas holding the glyphs of a single (font, size) pair.
+    Glyphs are rasterized the first time they are requested, shelf-packed into a
+    free slot and uploaded with a partial texture write. When the atlas is full it
+    grows up to max_size texels tall, then the least recently used glyphs that are
+    not pinned by a label are evicted.
+
+    The atlas is a single R8 channel sized to the packed extents of the preload
+    characters, stored as one layer of a GlyphAtlasArray. UVs are stored in texels,
+    so growing the atlas never invalidates vertices that were already generated.
+    """
+    ctx: ContextType
+    font: ImageFont.FreeTypeFont | ImageFont.ImageFont
+    width: int
+    height: int
+    max_size: int
+    padding: int
+    bitmap: np.ndarray
+    array: GlyphAtlasArray
+    layer: int
+    char_data: OrderedDict[str, dict]
+    line_height: int
+    word_widths: dict[str, float]
+
+    MAX_CACHED_WIDTHS = 65536
+
+    def __init__(self, ctx: ContextType, font: ImageFont.FreeTypeFont | ImageFont.ImageFont,
+                 preload: str = "", max_size: int = 2048, padding: int = 2,
+                 cached: Optional[tuple[np.ndarray, dict]] = None, array: Optional[GlyphAtlasArray] = None,
+                 arrays: Optional[dict[int, GlyphAtlasArray]] = None) -> None:
+        """
+        Args:
+            preload: Characters rasterized up front, they determine the initial page size
+            max_size: Maximum atlas height in texels before glyphs start being evicted
+            padding: Empty texels kept between glyphs
+            cached: (bitmap, metadata) produced by a previous to_cache_meta(),
+                    restores the atlas without rasterizing anything
+            array: Texture array the atlas is added to as a new layer
+            arrays: Texture arrays by atlas width, used when `array` is None: the atlas joins
+                    the one matching its width, created if needed (a private array if both are None)
+        """
+        self.ctx = ctx
+        self.array = array
+        self._arrays = arrays
+        self.layer = -1
+        self.font = font
+        self.max_size = max_size
+        self.padding = padding
+
+        # char -> {x, y, w, h, uv, slot}, ordered from least to most recently used
+        self.char_data = OrderedDict()
+        self._shelves: list[dict] = []
+        self._next_shelf_y = 0
+        self._pins: dict[str, int] = {}
+
+        # Unscaled advance of measured strings, glyph metrics never change for a font
+        self.word_widths = {}
+
+        if cached is not None:
+            self._restore(*cached)
+            self._attach()
+            return
+
+        # Reference height used for vertical alignment of every glyph
+        self.line_height = font.getmask('M').size[1]
+
+        # Size the page from the preload glyphs: pack them into a CPU bitmap as tall as
+        # allowed, then crop it to the used rows before creating the texture
+        masks = [(char, self._render_mask(char)) for char in dict.fromkeys(preload)]
+        area = sum((m.shape[1] + padding) * (m.shape[0] + padding) for _, m in masks)
+        width = 64
+        while width * width < area and width < max_size:
+            width *= 2
+        self.width = width
+        self.height = max_size
+        self.bitmap = np.zeros((max_size, width), dtype=np.uint8)
+        for char, mask in masks:
+            self._insert(char, mask, set())
+
+        self.height = max(self._next_shelf_y, 16)
+        self.bitmap = np.ascontiguousarray(self.bitmap[:self.height])
+        self._attach()
+
+    def _attach(self) -> None:
+        """Add the atlas as a layer of its texture array, picked by width once the width is known."""
+        if self.array is None:
+            if self._arrays is None:
+                self.array = GlyphAtlasArray(self.ctx)
+            else:
+                if self.width not in self._arrays:
+                    self._arrays[self.width] = GlyphAtlasArray(self.ctx)
+                self.array = self._arrays[self.width]
+        self.layer = self.array.add(self)
+
+    @property
+    def texture(self) -> TextureType:
+        """The shared texture array, recreated whenever it has to be resized."""
+        return self.array.texture
+
+    def request(self, text: str) -> dict[str, dict]:
+        """
+        Return the glyph data of every character in text, rasterizing missing ones.
+        Glyphs of the same request never evict each other; characters that still
+        don't fit in the atlas are left out of the result.
+        """
+        glyphs = {}
+        protected = None
+        for char in text:
+            if char in glyphs:
+                continue
+            data = self.char_data.get(char)
+            if data is None:
+                if protected is None:
+                    protected = set(text)
+                data = self._rasterize(char, protected)
+                if data is None:
+                    continue
+            else:
+                self.char_data.move_to_end(char)
+            glyphs[char] = data
+        return glyphs
+
+    def measure(self, text: str) -> float:
+        """Unscaled advance width of text, cached per string (typically a word)."""
+        width = self.word_widths.get(text)
+        if width is None:
+            glyphs = self.request(text)
+            # Same 2px glyph spacing used by the renderer
+            width = float(sum(glyphs[char]['w'] + 2 for char in text if char in glyphs))
+            if len(glyphs) == len(set(text)):
+                if len(self.word_widths) >= self.MAX_CACHED_WIDTHS:
+                    self.word_widths.clear()
+                self.word_widths[text] = width
+        return width
+
+    def pin(self, text: str) -> None:
+        """Prevent the glyphs of text from being evicted until unpin() is called."""
+        for char in set(text):
+            self._pins[char] = self._pins.get(char, 0) + 1
+
+    def unpin(self, text: str) -> None:
+        for char in set(text):
+            count = self._pins.get(char, 0) - 1
+            if count > 0:
+                self._pins[char] = count
+            else:
+                self._pins.pop(char, None)
+
+    def to_cache_meta(self) -> dict:
+        """Serializable packing state and glyph metrics, saved next to `bitmap`."""
+        shelf_index = {id(shelf): i for i, shelf in enumerate(self._shelves)}
+        return {
+            'width': self.width,
+            'height': self.height,
+            'line_height': self.line_height,
+            'next_shelf_y': self._next_shelf_y,
+            'shelves': [[shelf['y'], shelf['h'], shelf['x'], shelf['free']] for shelf in self._shelves],
+            'glyphs': {
+                char: [d['x'], d['y'], d['w'], d['h'], shelf_index[id(d['slot'][0])] if d['slot'] else -1]
+                for char, d in self.char_data.items()
+            }
+        }
+
+    def _restore(self, bitmap: np.ndarray, meta: dict) -> None:
+        self.width = meta['width']
+        self.height = meta['height']
+        self.line_height = meta['line_height']
+        self.bitmap = bitmap
+        self._next_shelf_y = meta['next_shelf_y']
+        self._shelves = [
+            {'y': y, 'h': h, 'x': x, 'free': [tuple(run) for run in free]}
+            for y, h, x, free in meta['shelves']
+        ]
+        for char, (x, y, w, h, shelf) in meta['glyphs'].items():
+            slot = (self._shelves[shelf], x, w + self.padding) if shelf >= 0 else None
+            self.char_data[char] = {'x': x, 'y': y, 'w': w, 'h': h, 'uv': (x, y, w, h), 'slot': slot}
+
+    def _render_mask(self, char: str) -> np.ndarray:
+        mask = self.font.getmask(char)
+        w, h = mask.size
+        mask_img = Image.new('L', (w, h))
+        if w and h:
+            mask_img.im.paste(mask, (0, 0, w, h))
+        return np.asarray(mask_img)
+
+    def _rasterize(self, char: str, protected: set[str]) -> Optional[dict]:
+        return self._insert(char, self._render_mask(char), protected)
+
+    def _insert(self, char: str, mask: np.ndarray, protected: set[str]) -> Optional[dict]:
+        h, w = mask.shape
+
+        if w == 0 or h == 0:
+            # Whitespace-like glyphs only contribute their advance, no texels needed
+            data = {'x': 0, 'y': 0, 'w': w, 'h': h, 'uv': (0, 0, 0, 0), 'slot': None}
+            self.char_data[char] = data
+            return data
+
+        slot = self._allocate(w + self.padding, h + self.padding, protected)
+        if slot is None:
+            return None
+        shelf, x = slot
+        y = shelf['y']
+        self._write(x, y, mask)
+
+        data = {
+            'x': x, 'y': y, 'w': w, 'h': h,
+            'uv': (x, y, w, h),  # In texels, normalized by the shader
+            'slot': (shelf, x, w + self.padding)
+        }
+        self.char_data[char] = data
+        return data
+
+    def _write(self, x: int, y: int, pixels: np.ndarray) -> None:
+        h, w = pixels.shape
+        self.bitmap[y:y + h, x:x + w] = pixels
+        if self.layer >= 0:
+            self.array.write(self.layer, x, y, pixels)
+
+    def _allocate(self, w: int, h: int, protected: set[str]) -> Optional[tuple[dict, int]]:
+        """Find a free (shelf, x) slot of at least w x h texels, growing or evicting LRU glyphs if needed."""
+        while True:
+            slot = self._find_slot(w, h)
+            if slot is not None:
+                return slot
+            if self.height < self.max_size:
+                self._grow()
+            elif not self._evict_one(protected):
+                return None
+
+    def _grow(self) -> None:
+        """Double the atlas height, re-uploading the CPU copy into the texture array."""
+        height = min(self.height * 2, self.max_size)
+        bitmap = np.zeros((height, self.width), dtype=np.uint8)
+        bitmap[:self.height] = self.bitmap
+        self.bitmap = bitmap
+        self.height = height
+        if self.layer >= 0:
+            self.array.resized(self)
+
+    def _find_slot(self, w: int, h: int) -> Optional[tuple[dict, int]]:
+        # Prefer shelves of a similar height, then a new shelf, then any shelf tall enough
+        loose = None
+        for shelf in self._shelves:
+            if shelf['h'] < h:
+                continue
+            x = self._take_from_shelf(shelf, w, commit=False)
+            if x is None:
+                continue
+            if shelf['h'] <= h * 2:
+                return shelf, self._take_from_shelf(shelf, w)
+            if loose is None:
+                loose = shelf
+
+        if self._next_shelf_y + h <= self.height and w <= self.width:
+            shelf = {'y': self._next_shelf_y, 'h': h, 'x': 0, 'free': []}
+            self._shelves.append(shelf)
+            self._next_shelf_y += h
+            return shelf, self._take_from_shelf(shelf, w)
+
+        if loose is not None:
+            return loose, self._take_from_shelf(loose, w)
+        return None
+
+    def _take_from_shelf(self, shelf: dict, w: int, commit: bool = True) -> Optional[int]:
+        free = shelf['free']
+        for i, (fx, fw) in enumerate(free):
+            if fw >= w:
+                if commit:
+                    if fw == w:
+                        free.pop(i)
+                    else:
+                        free[i] = (fx + w, fw - w)
+                return fx
+        if shelf['x'] + w <= self.width:
+            x = shelf['x']
+            if commit:
+                shelf['x'] += w
+            return x
+        return None
+
+    def _evict_one(self, protected: set[str]) -> bool:
+        for char, data in self.char_data.items():
+            if data['slot'] is None or char in protected or char in self._pins:
+                continue
+            shelf, x, w = data['slot']
+            # Clear stale texels so a smaller glyph reusing the slot doesn't bleed
+            self._write(data['x'], data['y'], np.zeros((data['h'], data['w']), dtype=np.uint8))
+            self._release_slot(shelf, x, w)
+            del self.char_data[char]
+            return True
+        return False
+
+    def _release_slot(self, shelf: dict, x: int, w: int) -> None:
+        free = sorted(shelf['free'] + [(x, w)])
+        merged = []
+        for fx, fw in free:
+            if merged and merged[-1][0] + merged[-1][1] == fx:
+                merged[-1] = (merged[-1][0], merged[-1][1] + fw)
+            else:
+                merged.append((fx, fw))
+        # A free run touching the shelf cursor just moves the cursor back
+        if merged and merged[-1][0] + merged[-1][1] == shelf['x']:
+            shelf['x'] = merged.pop()[0]
+        shelf['free'] = merged
+
 class TextLabel:
     ctx: ContextType
     prog: ProgramType
@@ -49,22 +438,30 @@ class TextLabel:
     bg_vertices: Optional[list[float]]
     bg_vbo: Optional[BufferType]
     bg_vao: Optional[VAOType]
+    atlas: Optional[GlyphAtlas]
+    text: str
     
     def __init__(self, ctx: ContextType, prog: ProgramType, texture: TextureType, vertices: list[float],
-                 bg_prog: Optional[ProgramType] = None, bg_vertices: Optional[list[float]] = None) -> None:
+                 bg_prog: Optional[ProgramType] = None, bg_vertices: Optional[list[float]] = None,
+                 atlas: Optional[GlyphAtlas] = None, text: str = "") -> None:
         """
         A pre-rendered text label for efficient drawing.
         To generate select a option below:
             - use TextRenderer.create_label()
             - rootEnv.print(..., save_cache = True) will return a TextLabel.
+        The glyphs of text stay pinned in the atlas until release() is called.
         """
         self.ctx = ctx
+        self.atlas = atlas
+        self.text = text
+        if self.atlas is not None:
+            self.atlas.pin(text)
         self.prog = prog
         self.texture = texture
         self.vertices = vertices
         self.vbo = self.ctx.buffer(np.array(vertices, dtype='f4').tobytes())
         self.vao = self.ctx.vertex_array(self.prog, [
-            (self.vbo, '2f 2f 4f', 'in_pos', 'in_uv', 'in_color')
+            (self.vbo, '2f 3f 4f', 'in_pos', 'in_uv', 'in_color')
         ])
         
         # Background rendering
@@ -87,29 +484,386 @@ class TextLabel:
             self.bg_prog['resolution'] = self.ctx.viewport[2:]
             self.bg_vao.render(moderngl.TRIANGLES)
         
-        # Draw text
+        # Draw text, the atlas texture is recreated whenever the atlas grows
         self.prog['resolution'] = self.ctx.viewport[2:]
-        self.texture.use(0)
+        texture = self.atlas.texture if self.atlas is not None else self.texture
+        texture.use(0)
         self.vao.render(moderngl.TRIANGLES)
 
+    def release(self) -> None:
+        """Free the label's GPU buffers and unpin its glyphs from the atlas."""
+        if self.atlas is not None:
+            self.atlas.unpin(self.text)
+            self.atlas = None
+        self.vao.release()
+        self.vbo.release()
+        if self.bg_vao and self.bg_vbo:
+            self.bg_vao.release()
+            self.bg_vbo.release()
+            self.bg_vao = None
+            self.bg_vbo = None
+
+class DynamicTextLabel:
+    """
+    A text label for values that change every frame (counters, clocks, readouts).
+    Vertices live in a buffer reserved for `capacity` glyphs at creation; set_text()
+    only rewrites the glyphs from the first changed character onwards with an
+    offset write and adjusts the vertex count, so updates never allocate GPU memory.
+    Use TextRenderer.create_dynamic_label() to create one.
+    """
+    ctx: ContextType
+    renderer: "TextRenderer"
+    atlas: GlyphAtlas
+    capacity: int
+    text: str
+    pos: tuple[float, float]
+    scale: float
+    style: TextStyle
+    pivot: Pivots | int
+    vbo: BufferType
+    vao: VAOType
+    bg_vbo: Optional[BufferType]
+    bg_vao: Optional[VAOType]
+
+    FLOATS_PER_GLYPH = 6 * 9
+
+    def __init__(self, renderer: "TextRenderer", capacity: int, pos: tuple[float, float], scale: float = 1.0,
+                 style: TextStyle = DEFAULT_16_TEXT_STYLE, pivot: Pivots | int = Pivots.TOP_LEFT) -> None:
+        self.renderer = renderer
+        self.ctx = renderer.ctx
+        self.atlas = renderer._get_or_create_font_atlas(style.font, style.font_size)
+        self.capacity = capacity
+        self.text = ""
+        self.pos = pos
+        self.scale = scale
+        self.style = style
+        self.pivot = pivot
+
+        # CPU mirror of the reserved buffer, color is constant and filled once
+        self._vertices = np.zeros((capacity, 6, 9), dtype='f4')
+        self._vertices[:, :, 4] = self.atlas.layer
+        self._vertices[:, :, 5:9] = style.color
+        self._advances = np.zeros(capacity, dtype='f4')
+        self._start = (float('nan'), float('nan'))
+
+        self.vbo = self.ctx.buffer(reserve=capacity * self.FLOATS_PER_GLYPH * 4, dynamic=True)
+        self.vao = self.ctx.vertex_array(renderer.prog, [
+            (self.vbo, '2f 3f 4f', 'in_pos', 'in_uv', 'in_color')
+        ])
+
+        if style.bg_color[3] > 0:
+            self.bg_vbo = self.ctx.buffer(reserve=6 * 14 * 4, dynamic=True)
+            self.bg_vao = self.ctx.vertex_array(renderer.bg_prog, [
+                (self.bg_vbo, '2f 4f 4f 4f', 'in_pos', 'in_color', 'in_rect', 'in_radius')
+            ])
+        else:
+            self.bg_vbo = None
+            self.bg_vao = None
+
+    def set_text(self, text: str) -> None:
+        """Replace the label text, truncated to the label capacity."""
+        text = text[:self.capacity]
+        if text == self.text:
+            return
+
+        atlas = self.atlas
+        atlas.pin(text)
+        atlas.unpin(self.text)
+        glyphs = atlas.request(text)
+
+        scale = self.scale
+        advances = self._advances
+        for i, char in enumerate(text):
+            data = glyphs.get(char)
+            advances[i] = (data['w'] * scale) + (2 * scale) if data else 0.0
+        n = len(text)
+        total_w = float(advances[:n].sum())
+        line_height = atlas.line_height * scale
+
+        # Same pivot handling as TextRenderer._generate_vertices
+        start_x, start_y = self.pos
+        if self.pivot == Pivots.TOP_RIGHT:
+            start_x -= total_w
+        elif self.pivot == Pivots.BOTTOM_LEFT:
+            start_y -= line_height
+        elif self.pivot == Pivots.BOTTOM_RIGHT:
+            start_x -= total_w
+            start_y -= line_height
+        elif self.pivot == Pivots.CENTER:
+            start_x -= total_w / 2
+            start_y -= line_height / 2
+
+        # Glyphs before the first changed character keep their quads, unless the pivot moved the line
+        first = 0
+        if (start_x, start_y) == self._start:
+            old = self.text
+            limit = min(len(old), n)
+            while first < limit and old[first] == text[first]:
+                first += 1
+        self._start = (start_x, start_y)
+
+        cursor_x = start_x + float(advances[:first].sum())
+        for i in range(first, n):
+            data = glyphs.get(text[i])
+            quad = self._vertices[i]
+            if data is None:
+                quad[:, 0:4] = 0.0
+                continue
+            w = data['w'] * scale
+            h = data['h'] * scale
+            x0, x1 = cursor_x, cursor_x + w
+            y0 = start_y + line_height - h
+            y1 = y0 + h
+            u0, v0, uw, vh = data['uv']
+            # TL, TR, BL, TR, BL, BR
+            quad[:, 0] = (x0, x1, x0, x1, x0, x1)
+            quad[:, 1] = (y0, y0, y1, y0, y1, y1)
+            quad[:, 2] = (u0, u0 + uw, u0, u0 + uw, u0, u0 + uw)
+            quad[:, 3] = (v0, v0, v0 + vh, v0, v0 + vh, v0 + vh)
+            cursor_x += float(advances[i])
+
+        if first < n:
+            self.vbo.write(self._vertices[first:n], offset=first * self.FLOATS_PER_GLYPH * 4)
+        self.text = text
+
+        if self.bg_vbo is not None:
+            renderer = self.renderer
+            bg_vertices = renderer._generate_background_vertices(
+                start_x, start_y, total_w, line_height, self.style.bg_color,
+                renderer._normalize_margin(self.style.bg_margin),
+                renderer._normalize_radius(self.style.bg_border_radius)
+            )
+            self.bg_vbo.write(np.array(bg_vertices, dtype='f4'))
+
+    def draw(self) -> None:
+        if not self.text:
+            return
+        self.ctx.enable(moderngl.BLEND)
+
+        if self.bg_vao is not None:
+            self.renderer.bg_prog['resolution'] = self.ctx.viewport[2:]
+            self.bg_vao.render(moderngl.TRIANGLES, vertices=6)
+
+        prog = self.renderer.prog
+        prog['resolution'] = self.ctx.viewport[2:]
+        self.atlas.texture.use(0)
+        self.vao.render(moderngl.TRIANGLES, vertices=len(self.text) * 6)
+
+    def release(self) -> None:
+        """Free the label's GPU buffers and unpin its glyphs from the atlas."""
+        self.atlas.unpin(self.text)
+        self.text = ""
+        self.vao.release()
+        self.vbo.release()
+        if self.bg_vao is not None and self.bg_vbo is not None:
+            self.bg_vao.release()
+            self.bg_vbo.release()
+            self.bg_vao = None
+            self.bg_vbo = None
+
+_LAYOUT_TOKEN_RE = re.compile(r'\n|[^\S\n]+|\S+')
+
+class TextLayout:
+    """
+    A multi-line paragraph laid out by TextRenderer.layout_text().
+    `lines` holds (start, end, width) character ranges into `text`, and `vertices`
+    the glyph quads of every line in the same format as TextLabel. Appending text
+    with TextRenderer.append_text() only lays out the last line and the new text
+    again and uploads just the vertices that changed. Appended text is kept as a list
+    of chunks and only joined when `text` is read, so streaming stays linear.
+    """
+    ctx: ContextType
+    renderer: "TextRenderer"
+    atlas: GlyphAtlas
+    pos: tuple[float, float]
+    max_width: Optional[float]
+    align: TextAlign
+    line_spacing: float
+    scale: float
+    style: TextStyle
+    lines: list[tuple[int, int, float]]
+    line_vertex_starts: list[int]
+    vertex_count: int
+    vbo: Optional[BufferType]
+    vao: Optional[VAOType]
+
+    def __init__(self, renderer: "TextRenderer", pos: tuple[float, float], max_width: Optional[float],
+                 align: TextAlign, line_spacing: float, scale: float, style: TextStyle) -> None:
+        self.renderer = renderer
+        self.ctx = renderer.ctx
+        self.atlas = renderer._get_or_create_font_atlas(style.font, style.font_size)
+        self._chunks: list[str] = []
+        self._chunk_starts: list[int] = []  # Offset of each chunk in the text
+        self._length = 0
+        self.pos = pos
+        self.max_width = max_width
+        self.align = align
+        self.line_spacing = line_spacing
+        self.scale = scale
+        self.style = style
+        self.lines = []
+        self.line_vertex_starts = []
+        self.vertex_count = 0
+        self.vbo = None
+        self.vao = None
+        self._vertices = np.zeros((0, 9), dtype='f4')
+        self._uploaded = 0
+        self._pinned: set[str] = set()
+
+    @property
+    def text(self) -> str:
+        """The whole paragraph, the appended chunks are joined on first access."""
+        if len(self._chunks) > 1:
+            self._chunks = ["".join(self._chunks)]
+            self._chunk_starts = [0]
+        return self._chunks[0] if self._chunks else ""
+
+    def _append(self, text: str) -> None:
+        if text:
+            self._chunks.append(text)
+            self._chunk_starts.append(self._length)
+            self._length += len(text)
+
+    def _text_from(self, start: int) -> str:
+        """text[start:], copying only the chunks it spans."""
+        if not self._chunks:
+            return ""
+        index = max(bisect_right(self._chunk_starts, start) - 1, 0)
+        return self._chunks[index][start - self._chunk_starts[index]:] + "".join(self._chunks[index + 1:])
+
+    @property
+    def vertices(self) -> np.ndarray:
+        """(vertex_count, 9) array of x, y, u, v, layer, r, g, b, a."""
+        return self._vertices[:self.vertex_count]
+
+    @property
+    def line_height(self) -> float:
+        return self.atlas.line_height * self.scale
+
+    @property
+    def width(self) -> float:
+        return max((width for _, _, width in self.lines), default=0.0)
+
+    @property
+    def height(self) -> float:
+        if not self.lines:
+            return 0.0
+        return (len(self.lines) - 1) * self.line_height * self.line_spacing + self.line_height
+
+    def _pin(self, text: str) -> None:
+        new_chars = set(text) - self._pinned
+        if new_chars:
+            self.atlas.pin("".join(new_chars))
+            self._pinned |= new_chars
+
+    def _set_vertices(self, first_line: int, blocks: list[list[float]]) -> None:
+        """Replace the vertices of lines[first_line:] with the given per-line blocks."""
+        start = self.line_vertex_starts[first_line] if first_line < len(self.line_vertex_starts) else self.vertex_count
+        del self.line_vertex_starts[first_line:]
+        count = start + sum(len(block) // 9 for block in blocks)
+        if count > len(self._vertices):
+            grown = np.zeros((max(count, len(self._vertices) * 2), 9), dtype='f4')
+            grown[:start] = self._vertices[:start]
+            self._vertices = grown
+        cursor = start
+        for block in blocks:
+            self.line_vertex_starts.append(cursor)
+            n = len(block) // 9
+            if n:
+                self._vertices[cursor:cursor + n] = np.asarray(block, dtype='f4').reshape(n, 9)
+            cursor += n
+        self.vertex_count = count
+        self._uploaded = min(self._uploaded, start)
+
+    def draw(self) -> None:
+        if self.vertex_count == 0:
+            return
+        renderer = self.renderer
+        self.ctx.enable(moderngl.BLEND)
+
+        if self.style.bg_color[3] > 0:
+            box_w = self.max_width if self.max_width is not None else self.width
+            bg_vertices = renderer._generate_background_vertices(
+                self.pos[0], self.pos[1], box_w, self.height, self.style.bg_color,
+                renderer._normalize_margin(self.style.bg_margin),
+                renderer._normalize_radius(self.style.bg_border_radius)
+            )
+            first = renderer.bg_stream.push(np.array(bg_vertices, dtype='f4'))
+            renderer.bg_prog['resolution'] = self.ctx.viewport[2:]
+            renderer.bg_vao.render(moderngl.TRIANGLES, vertices=6, first=first)
+
+        # Upload only what changed since the last draw, the buffer grows by doubling
+        needed = self.vertex_count * 9 * 4
+        if self.vbo is None:
+            self.vbo = self.ctx.buffer(reserve=max(needed, 4096), dynamic=True)
+            self.vao = self.ctx.vertex_array(renderer.prog, [
+                (self.vbo, '2f 3f 4f', 'in_pos', 'in_uv', 'in_color')
+            ])
+        elif needed > self.vbo.size:
+            self.vbo.orphan(max(needed, self.vbo.size * 2))
+            self._uploaded = 0
+        if self._uploaded < self.vertex_count:
+            self.vbo.write(self._vertices[self._uploaded:self.vertex_count], offset=self._uploaded * 9 * 4)
+            self._uploaded = self.vertex_count
+
+        renderer.prog['resolution'] = self.ctx.viewport[2:]
+        self.atlas.texture.use(0)
+        self.vao.render(moderngl.TRIANGLES, vertices=self.vertex_count)
+
+    def release(self) -> None:
+        """Free the layout's GPU buffers and unpin its glyphs from the atlas."""
+        self.atlas.unpin("".join(self._pinned))
+        self._pinned = set()
+        if self.vao is not None and self.vbo is not None:
+            self.vao.release()
+            self.vbo.release()
+            self.vao = None
+            self.vbo = None
+
 class TextRenderer:
     """
     Renders text using a texture atlas generated from a TTF font via Pillow.
     Supports multiple fonts and sizes with caching for optimization.
+    Glyphs in `chars` are rasterized when a font is first used; any other
+    character is rasterized on demand into the font's dynamic atlas.
     """
     ctx: ContextType
-    font_cache: dict[tuple[str, int], dict]
+    font_cache: dict[tuple[str, int], GlyphAtlas]
+    atlas_arrays: dict[int, GlyphAtlasArray]
+    atlas_cache_dir: Optional[str]
     chars: str
     bg_prog: ProgramType
+    bg_stream: StreamingBuffer
+    bg_vao: VAOType
     prog: ProgramType
+    stream: StreamingBuffer
+    vao: VAOType
     
-    def __init__(self, ctx: ContextType) -> None:
+    def __init__(self, ctx: ContextType, atlas_cache_dir: Optional[str] = None) -> None:
+        """
+        Args:
+            ctx: ModernGL context
+            atlas_cache_dir: Directory where generated atlases are stored between runs
+                             (None, the default, disables the on-disk cache;
+                             DEFAULT_ATLAS_CACHE_DIR is the per-user cache folder)
+        """
         self.ctx = ctx
         
-        # Cache for font atlases: (font_path, font_size) -> {font, char_data, texture}
+        # Cache for font atlases: (font_path, font_size) -> GlyphAtlas, each one a layer of
+        # the texture array for its width in atlas_arrays
         self.font_cache = {}
+        self.atlas_arrays = {}
+        
+        # Vertices queued between begin_batch() and end_batch() per texture array, None when not batching
+        self._batch: Optional[dict[GlyphAtlasArray, list[float]]] = None
+        self._bg_batch: list[float] = []
+        self._batch_pins: list[tuple[GlyphAtlas, str]] = []
+        
+        # On-disk cache of preloaded atlases, keyed by font file hash, size and charset
+        self.atlas_cache_dir = atlas_cache_dir
+        self._font_hashes: dict[str, str] = {}
         
-        # Character set to render
+        # Character set rasterized up front for every font
         self.chars = " !\"#$%&'()*+,-./0123456789:;<=>?@ABCDEFGHIJKLMNOPQRSTUVWXYZ[\\]^_`abcdefghijklmnopqrstuvwxyz{|}~"
         
         # Background shader for rounded rectangles
@@ -173,10 +927,10 @@ class TextRenderer:
             """
         )
         
-        # Background VBO
-        self.bg_vbo = self.ctx.buffer(reserve=4096)
+        # Background streaming VBO (one quad per draw)
+        self.bg_stream = StreamingBuffer(self.ctx, stride=14 * 4, size=16384)
         self.bg_vao = self.ctx.vertex_array(self.bg_prog, [
-            (self.bg_vbo, '2f 4f 4f 4f', 'in_pos', 'in_color', 'in_rect', 'in_radius')
+            (self.bg_stream.buffer, '2f 4f 4f 4f', 'in_pos', 'in_color', 'in_rect', 'in_radius')
         ])
         
         # Shader
@@ -186,10 +940,10 @@ class TextRenderer:
             uniform vec2 resolution;
             
             in vec2 in_pos;
-            in vec2 in_uv;
+            in vec3 in_uv;  // texel u, v and atlas layer
             in vec4 in_color;
             
-            out vec2 v_uv;
+            out vec3 v_uv;
             out vec4 v_color;
             
             void main() {
@@ -203,26 +957,28 @@ class TextRenderer:
             """,
             fragment_shader="""
             #version 430
-            uniform sampler2D tex;
+            uniform sampler2DArray tex;
             
-            in vec2 v_uv;
+            in vec3 v_uv;
             in vec4 v_color;
             out vec4 f_color;
             
             void main() {
-                float alpha = texture(tex, v_uv).a;
+                // UVs are in texels, every atlas layer is a single coverage channel
+                vec2 uv = v_uv.xy / vec2(textureSize(tex, 0).xy);
+                float alpha = texture(tex, vec3(uv, v_uv.z)).r;
                 f_color = vec4(v_color.rgb, v_color.a * alpha);
             }
             """
         )
         
-        # Dynamic VBO for immediate mode
-        self.vbo = self.ctx.buffer(reserve=65536) # 64KB
+        # Streaming VBO for immediate mode, each draw gets its own region and long text grows it
+        self.stream = StreamingBuffer(self.ctx, stride=9 * 4, size=262152) # ~256KB
         self.vao = self.ctx.vertex_array(self.prog, [
-            (self.vbo, '2f 2f 4f', 'in_pos', 'in_uv', 'in_color')
+            (self.stream.buffer, '2f 3f 4f', 'in_pos', 'in_uv', 'in_color')
         ])
 
-    def _get_or_create_font_atlas(self, font_path: str, font_size: int) -> dict:
+    def _get_or_create_font_atlas(self, font_path: str, font_size: int) -> GlyphAtlas:
         """Get or create a cached font atlas for the given font and size."""
         cache_key = (font_path, font_size)
         
@@ -236,78 +992,76 @@ class TextRenderer:
             print(f"Warning: Could not load font '{font_path}'. Using default.")
             font = ImageFont.load_default()
         
-        # Generate Atlas
-        char_data = {}
-        atlas_w, atlas_h = 1024, 1024
-        atlas_img = Image.new('RGBA', (atlas_w, atlas_h), (0, 0, 0, 0))
-        
-        x, y = 0, 0
-        max_h = 0
-        
-        for char in self.chars:
-            mask = font.getmask(char)
-            w, h = mask.size
-            
-            if x + w >= atlas_w:
-                x = 0
-                y += max_h + 2
-                max_h = 0
-            
-            # Create char image
-            char_img = Image.new('RGBA', (w, h), (255, 255, 255, 255))
-            mask_img = Image.new('L', (w, h))
-            mask_img.im.paste(mask, (0, 0, w, h))
-            atlas_img.paste(char_img, (x, y), mask_img)
-            
-            char_data[char] = {
-                'x': x, 'y': y, 'w': w, 'h': h,
-                'uv': (x/atlas_w, y/atlas_h, w/atlas_w, h/atlas_h)
-            }
-            
-            x += w + 2
-            max_h = max(max_h, h)
-        
-        # Create texture
-        texture = self.ctx.texture(atlas_img.size, 4, atlas_img.tobytes())
-        texture.filter = (moderngl.LINEAR, moderngl.LINEAR)
+        # Generate Atlas (or reuse the one from a previous run), other characters are added lazily on first use
+        disk_key = self._atlas_disk_key(font, font_size)
+        cached = self._load_cached_atlas(disk_key) if disk_key else None
+        font_atlas = GlyphAtlas(self.ctx, font, preload=self.chars, cached=cached, arrays=self.atlas_arrays)
+        if disk_key and cached is None:
+            self._save_cached_atlas(disk_key, font_atlas)
         
         # Cache it
-        font_atlas = {
-            'font': font,
-            'char_data': char_data,
-            'texture': texture
-        }
         self.font_cache[cache_key] = font_atlas
         
         return font_atlas
 
+    def _atlas_disk_key(self, font: ImageFont.FreeTypeFont | ImageFont.ImageFont, font_size: int) -> Optional[str]:
+        """File name stem for the on-disk atlas, None if the font can't be cached."""
+        path = getattr(font, 'path', None)
+        if self.atlas_cache_dir is None or not isinstance(path, str):
+            return None
+        
+        font_hash = self._font_hashes.get(path)
+        if font_hash is None:
+            try:
+                with open(path, 'rb') as f:
+                    font_hash = hashlib.sha1(f.read()).hexdigest()
+            except OSError:
+                return None
+            self._font_hashes[path] = font_hash
+        
+        # The charset hash also covers the rasterizer version and the cache format
+        layout = f"{self.chars}|{PIL.__version__}|{ATLAS_CACHE_VERSION}"
+        charset_hash = hashlib.sha1(layout.encode('utf-8')).hexdigest()
+        return f"{font_hash[:16]}_{font_size}_{charset_hash[:12]}"
+
+    def _load_cached_atlas(self, disk_key: str) -> Optional[tuple[np.ndarray, dict]]:
+        base = os.path.join(self.atlas_cache_dir, disk_key)
+        if not (os.path.exists(base + '.npy') and os.path.exists(base + '.json')):
+            return None
+        try:
+            with open(base + '.json', 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            # Copy-on-write map: pages are only read as the texture upload touches them
+            bitmap = np.load(base + '.npy', mmap_mode='c')
+        except (OSError, ValueError) as e:
+            print(f"Warning: Ignoring corrupted font atlas cache '{base}': {e}")
+            return None
+        if bitmap.shape != (meta['height'], meta['width']):
+            return None
+        return bitmap, meta
+
+    def _save_cached_atlas(self, disk_key: str, atlas: GlyphAtlas) -> None:
+        base = os.path.join(self.atlas_cache_dir, disk_key)
+        try:
+            os.makedirs(self.atlas_cache_dir, exist_ok=True)
+            # Write to temporary files first so a concurrent reader never sees half a cache entry
+            np.save(base + '.tmp.npy', atlas.bitmap)
+            with open(base + '.tmp.json', 'w', encoding='utf-8') as f:
+                json.dump(atlas.to_cache_meta(), f, ensure_ascii=False)
+            os.replace(base + '.tmp.npy', base + '.npy')
+            os.replace(base + '.tmp.json', base + '.json')
+        except OSError as e:
+            print(f"Warning: Could not write font atlas cache '{base}': {e}")
+
     def get_text_width(self, text: str, scale: float = 1.0, style: TextStyle = DEFAULT_16_TEXT_STYLE) -> float:
         """Calculate the width of the text."""
         font_atlas = self._get_or_create_font_atlas(style.font, style.font_size)
-        char_data = font_atlas['char_data']
-        
-        total_w = 0
-        for char in text:
-            if char in char_data:
-                data = char_data[char]
-                total_w += (data['w'] * scale) + (2 * scale)
-        return total_w
+        return font_atlas.measure(text) * scale
     
     def _get_text_bounds(self, text: str, scale: float = 1.0, style: TextStyle = DEFAULT_16_TEXT_STYLE) -> tuple[float, float]:
         """Calculate the bounding box dimensions (width, height) of the text."""
         font_atlas = self._get_or_create_font_atlas(style.font, style.font_size)
-        char_data = font_atlas['char_data']
-        
-        total_w = 0
-        ref_char = 'M' if 'M' in char_data else self.chars[0]
-        line_height = char_data[ref_char]['h'] * scale
-        
-        for char in text:
-            if char in char_data:
-                data = char_data[char]
-                total_w += (data['w'] * scale) + (2 * scale)
-        
-        return total_w, line_height
+        return font_atlas.measure(text) * scale, font_atlas.line_height * scale
     
     def _normalize_margin(self, margin: float | tuple[float, float, float, float] | tuple[float, float] | list[float]) -> tuple[float, float, float, float]:
         """Normalize margin to (top, right, bottom, left)."""
@@ -360,19 +1114,19 @@ class TextRenderer:
         return vertices
 
     def _generate_vertices(self, text: str, pos: tuple[float, float], scale: float = 1.0, 
-            color: ColorType = WHITE, pivot: Pivots | int = Pivots.TOP_LEFT, char_data: dict = {} ) -> list[float]:
+            color: ColorType = WHITE, pivot: Pivots | int = Pivots.TOP_LEFT, atlas: Optional[GlyphAtlas] = None) -> list[float]:
 
-        if not char_data:
-            raise ValueError("char_data is required for _generate_vertices")
+        if atlas is None:
+            raise ValueError("atlas is required for _generate_vertices")
+        char_data = atlas.request(text)
         # Calculate text size first for pivoting
         total_w = 0
         max_h = 0
         
         # Determine max height for proper vertical alignment instead of per-glyph height
         # This fixes the "jittery" baseline issue by ensuring all chars use the same vertical metric
-        # Use 'M' or 'H' or '|' as a reference for height if available, otherwise use max found
-        ref_char = 'M' if 'M' in char_data else self.chars[0]
-        line_height = char_data[ref_char]['h'] * scale
+        # The atlas uses the height of 'M' as the reference
+        line_height = atlas.line_height * scale
         
         for char in text:
             if char in char_data:
@@ -397,6 +1151,12 @@ class TextRenderer:
             start_y -= max_h / 2
             
         vertices = []
+        self._append_glyph_quads(vertices, text, char_data, atlas.layer, start_x, start_y, max_h, scale, color)
+        return vertices
+
+    def _append_glyph_quads(self, vertices: list[float], text: str, char_data: dict[str, dict], layer: int,
+                            start_x: float, start_y: float, max_h: float, scale: float, color: ColorType) -> None:
+        """Append two triangles per glyph of a single line of text, top-left at (start_x, start_y)."""
         cursor_x = start_x
         cursor_y = start_y
         
@@ -412,27 +1172,25 @@ class TextRenderer:
             # Offset smaller characters down so they sit on the same baseline as taller ones
             y_offset = max_h - h
             
-            # Quad vertices (x, y, u, v, r, g, b, a)
+            # Quad vertices (x, y, u, v, layer, r, g, b, a)
             # TL
-            vertices.extend([cursor_x, cursor_y + y_offset, data['uv'][0], data['uv'][1], *color])
+            vertices.extend([cursor_x, cursor_y + y_offset, data['uv'][0], data['uv'][1], layer, *color])
             
             # TR
-            vertices.extend([cursor_x + w, cursor_y + y_offset, data['uv'][0] + data['uv'][2], data['uv'][1], *color])
+            vertices.extend([cursor_x + w, cursor_y + y_offset, data['uv'][0] + data['uv'][2], data['uv'][1], layer, *color])
             
             # BL
-            vertices.extend([cursor_x, cursor_y + y_offset + h, data['uv'][0], data['uv'][1] + data['uv'][3], *color])
+            vertices.extend([cursor_x, cursor_y + y_offset + h, data['uv'][0], data['uv'][1] + data['uv'][3], layer, *color])
             
             # Triangle 2
             # TR
-            vertices.extend([cursor_x + w, cursor_y + y_offset, data['uv'][0] + data['uv'][2], data['uv'][1], *color])
+            vertices.extend([cursor_x + w, cursor_y + y_offset, data['uv'][0] + data['uv'][2], data['uv'][1], layer, *color])
             # BL
-            vertices.extend([cursor_x, cursor_y + y_offset + h, data['uv'][0], data['uv'][1] + data['uv'][3], *color])
+            vertices.extend([cursor_x, cursor_y + y_offset + h, data['uv'][0], data['uv'][1] + data['uv'][3], layer, *color])
             # BR
-            vertices.extend([cursor_x + w, cursor_y + y_offset + h, data['uv'][0] + data['uv'][2], data['uv'][1] + data['uv'][3], *color])
+            vertices.extend([cursor_x + w, cursor_y + y_offset + h, data['uv'][0] + data['uv'][2], data['uv'][1] + data['uv'][3], layer, *color])
             
             cursor_x += w + (2 * scale) # Spacing
-            
-        return vertices
 
     def draw_text(self, text: str, pos: tuple[float, float], scale: float = 1.0, style: TextStyle = DEFAULT_16_TEXT_STYLE, pivot: Pivots | int = Pivots.TOP_LEFT) -> None:
         if not text:
@@ -440,8 +1198,6 @@ class TextRenderer:
         
         # Get font atlas for this style
         font_atlas = self._get_or_create_font_atlas(style.font, style.font_size)
-        char_data = font_atlas['char_data']
-        texture = font_atlas['texture']
             
         # Get text dimensions for background
         text_width, text_height = self._get_text_bounds(text, scale, style)
@@ -466,42 +1222,81 @@ class TextRenderer:
             bg_vertices = self._generate_background_vertices(bg_x, bg_y, text_width, text_height,
                                                             style.bg_color, margin, radius)
             
-            bg_data = np.array(bg_vertices, dtype='f4').tobytes()
-            self.bg_vbo.write(bg_data)
-            self.bg_prog['resolution'] = self.ctx.viewport[2:]
-            self.ctx.enable(moderngl.BLEND)
-            self.bg_vao.render(moderngl.TRIANGLES, vertices=len(bg_vertices)//14)
+            if self._batch is not None:
+                self._bg_batch.extend(bg_vertices)
+            else:
+                bg_data = np.array(bg_vertices, dtype='f4')
+                first = self.bg_stream.push(bg_data)
+                self.bg_prog['resolution'] = self.ctx.viewport[2:]
+                self.ctx.enable(moderngl.BLEND)
+                self.bg_vao.render(moderngl.TRIANGLES, vertices=len(bg_vertices)//14, first=first)
         
         # Draw text
-        vertices = self._generate_vertices(text, pos, scale, style.color, pivot, char_data)
+        vertices = self._generate_vertices(text, pos, scale, style.color, pivot, font_atlas)
         if not vertices:
             return
+        
+        if self._batch is not None:
+            # Keep the glyphs resident until the batch is drawn
+            font_atlas.pin(text)
+            self._batch_pins.append((font_atlas, text))
+            self._batch.setdefault(font_atlas.array, []).extend(vertices)
+            return
 
         # Update VBO
-        data_bytes = np.array(vertices, dtype='f4').tobytes()
-        self.vbo.write(data_bytes)
+        first = self.stream.push(np.array(vertices, dtype='f4'))
 
-        # Update Uniforms
+        # Update Uniforms (fetch the texture after layout, new glyphs may have grown the atlas)
         self.prog['resolution'] = self.ctx.viewport[2:]
-        texture.use(0)
+        font_atlas.texture.use(0)
 
         # Draw
         self.ctx.enable(moderngl.BLEND)
-        self.vao.render(moderngl.TRIANGLES, vertices=len(vertices)//8)
+        self.vao.render(moderngl.TRIANGLES, vertices=len(vertices)//9, first=first)
+
+    def begin_batch(self) -> None:
+        """
+        Queue every following draw_text() call instead of drawing it immediately.
+        Since fonts and sizes share a texture array per atlas width, end_batch() then
+        draws all queued backgrounds in one call and the queued text in one call per array.
+        """
+        if self._batch is None:
+            self._batch = {}
+
+    def end_batch(self) -> None:
+        """Draw everything queued since begin_batch() and leave batch mode."""
+        if self._batch is None:
+            return
+        batches, bg_vertices = self._batch, self._bg_batch
+        self._batch = None
+        self._bg_batch = []
+        
+        self.ctx.enable(moderngl.BLEND)
+        if bg_vertices:
+            first = self.bg_stream.push(np.array(bg_vertices, dtype='f4'))
+            self.bg_prog['resolution'] = self.ctx.viewport[2:]
+            self.bg_vao.render(moderngl.TRIANGLES, vertices=len(bg_vertices)//14, first=first)
+        self.prog['resolution'] = self.ctx.viewport[2:]
+        for array, vertices in batches.items():
+            first = self.stream.push(np.array(vertices, dtype='f4'))
+            array.texture.use(0)
+            self.vao.render(moderngl.TRIANGLES, vertices=len(vertices)//9, first=first)
+        
+        for atlas, text in self._batch_pins:
+            atlas.unpin(text)
+        self._batch_pins = []
 
     def create_label(self, text: str, x: float, y: float, scale: float = 1.0, style: TextStyle = DEFAULT_16_TEXT_STYLE, pivot: Pivots | int = Pivots.TOP_LEFT) -> TextLabel:
         if not text:
             # Return empty label with default texture
             font_atlas = self._get_or_create_font_atlas(style.font, style.font_size)
-            return TextLabel(self.ctx, self.prog, font_atlas['texture'], [])
+            return TextLabel(self.ctx, self.prog, font_atlas.texture, [])
         
         # Get font atlas for this style
         font_atlas = self._get_or_create_font_atlas(style.font, style.font_size)
-        char_data = font_atlas['char_data']
-        texture = font_atlas['texture']
         
         # Generate text vertices
-        vertices = self._generate_vertices(text, (x, y), scale, style.color, pivot, char_data)
+        vertices = self._generate_vertices(text, (x, y), scale, style.color, pivot, font_atlas)
         
         # Generate background vertices if needed
         bg_vertices = None
@@ -526,4 +1321,128 @@ class TextRenderer:
             bg_vertices = self._generate_background_vertices(bg_x, bg_y, text_width, text_height,
                                                             style.bg_color, margin, radius)
         
-        return TextLabel(self.ctx, self.prog, texture, vertices, self.bg_prog, bg_vertices)
\ No newline at end of file
+        return TextLabel(self.ctx, self.prog, font_atlas.texture, vertices, self.bg_prog, bg_vertices, font_atlas, text)
+
+    def create_dynamic_label(self, capacity: int, x: float, y: float, text: str = "", scale: float = 1.0,
+                             style: TextStyle = DEFAULT_16_TEXT_STYLE, pivot: Pivots | int = Pivots.TOP_LEFT) -> DynamicTextLabel:
+        """Create a label of at most `capacity` glyphs whose text can be updated in place with set_text()."""
+        label = DynamicTextLabel(self, capacity, (x, y), scale, style, pivot)
+        label.set_text(text)
+        return label
+
+    def layout_text(self, text: str, pos: tuple[float, float], max_width: Optional[float] = None,
+                    align: TextAlign = TextAlign.LEFT, line_spacing: float = 1.2, scale: float = 1.0,
+                    style: TextStyle = DEFAULT_16_TEXT_STYLE) -> TextLayout:
+        """
+        Lay out a paragraph with word wrap.
+        
+        Args:
+            text: Text to lay out, '\n' starts a new line
+            pos: Top-left corner of the paragraph
+            max_width: Wrap width in pixels (None only breaks on '\n')
+            align: Horizontal alignment of each line inside max_width (or the widest line)
+            line_spacing: Distance between lines as a multiple of the line height
+        """
+        layout = TextLayout(self, pos, max_width, align, line_spacing, scale, style)
+        self.append_text(layout, text)
+        return layout
+
+    def append_text(self, layout: TextLayout, text: str) -> None:
+        """Append text to a layout, laying out again only from the start of its last line."""
+        if not text and layout.lines:
+            return
+        layout._pin(text)
+        layout._append(text)
+        
+        # Centered/right lines depend on the widest line when there is no wrap width
+        if layout.max_width is None and layout.align != TextAlign.LEFT:
+            first_line = 0
+        else:
+            first_line = max(len(layout.lines) - 1, 0)
+        start = layout.lines[first_line][0] if layout.lines else 0
+        
+        # Only text[start:] is laid out again, plus the character before it to know how the line began
+        tail_start = max(start - 1, 0)
+        tail = layout._text_from(tail_start)
+        del layout.lines[first_line:]
+        layout.lines.extend((line_start + tail_start, line_end + tail_start, line_w) for line_start, line_end, line_w
+                            in self._break_lines(layout.atlas, tail, start - tail_start, layout.max_width, layout.scale))
+        
+        box_w = layout.max_width if layout.max_width is not None else layout.width
+        line_height = layout.line_height
+        line_advance = line_height * layout.line_spacing
+        blocks = []
+        for index in range(first_line, len(layout.lines)):
+            line_start, line_end, line_w = layout.lines[index]
+            line_text = tail[line_start - tail_start:line_end - tail_start]
+            x = layout.pos[0]
+            if layout.align == TextAlign.CENTER:
+                x += (box_w - line_w) / 2
+            elif layout.align == TextAlign.RIGHT:
+                x += box_w - line_w
+            y = layout.pos[1] + index * line_advance
+            block = []
+            self._append_glyph_quads(block, line_text, layout.atlas.request(line_text), layout.atlas.layer,
+                                     x, y, line_height, layout.scale, layout.style.color)
+            blocks.append(block)
+        layout._set_vertices(first_line, blocks)
+
+    @staticmethod
+    def _break_lines(atlas: GlyphAtlas, text: str, start: int, max_width: Optional[float],
+                     scale: float) -> list[tuple[int, int, float]]:
+        """Greedy word wrap of text[start:], returns (start, end, width) for each line."""
+        lines = []
+        line_start = line_end = start
+        line_w = 0.0
+        space_w = 0.0
+        # Leading spaces are kept at the start of a paragraph and dropped after a wrap
+        wrapped = start > 0 and text[start - 1] != '\n'
+        
+        for match in _LAYOUT_TOKEN_RE.finditer(text, start):
+            token = match.group()
+            i, j = match.span()
+            if token == '\n':
+                lines.append((line_start, line_end, line_w))
+                line_start = line_end = j
+                line_w = space_w = 0.0
+                wrapped = False
+                continue
+            
+            w = atlas.measure(token) * scale
+            if token.isspace():
+                if line_end > line_start:
+                    space_w = w
+                elif wrapped:
+                    line_start = line_end = j
+                else:
+                    line_end = j
+                    line_w += w
+                continue
+            
+            if line_end > line_start:
+                if max_width is not None and line_w + space_w + w > max_width:
+                    lines.append((line_start, line_end, line_w))
+                    line_start = line_end = i
+                    line_w = 0.0
+                    wrapped = True
+                else:
+                    line_w += space_w
+            space_w = 0.0
+            
+            if max_width is not None and line_w + w > max_width:
+                # Word wider than a line: hard wrap it between characters
+                for k, char in enumerate(token):
+                    char_w = atlas.measure(char) * scale
+                    if line_end > line_start and line_w + char_w > max_width:
+                        lines.append((line_start, line_end, line_w))
+                        line_start = line_end = i + k
+                        line_w = 0.0
+                        wrapped = True
+                    line_end = i + k + 1
+                    line_w += char_w
+            else:
+                line_end = j
+                line_w += w
+        
+        lines.append((line_start, line_end, line_w))
+        return lines
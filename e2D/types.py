@@ -28,6 +28,7 @@ ComputeShaderType = object  # moderngl.ComputeShader
 BufferType = object  # moderngl.Buffer
 VAOType = object  # moderngl.VertexArray
 TextureType = object  # moderngl.Texture
+FramebufferType = object  # moderngl.Framebuffer
 
 ProgramAttrType = object  # moderngl.Uniform | moderngl.UniformBlock | moderngl.Attribute | moderngl.Varying
 UniformType = object  # moderngl.Uniform
@@ -48,5 +49,6 @@ __all__ = [
     'BufferType',
     'VAOType',
     'TextureType',
+    'FramebufferType',
     'WindowType',
 ]
@@ -34,6 +34,7 @@ ComputeShaderType = moderngl.ComputeShader
 BufferType = moderngl.Buffer
 VAOType = moderngl.VertexArray
 TextureType = moderngl.Texture
+FramebufferType = moderngl.Framebuffer
 
 ProgramAttrType = moderngl.Uniform | moderngl.UniformBlock | moderngl.Attribute | moderngl.Varying
 UniformType = moderngl.Uniform
@@ -55,5 +56,6 @@ __all__ = [
     'BufferType',
     'VAOType',
     'TextureType',
+    'FramebufferType',
     'WindowType',
 ]
\ No newline at end of file
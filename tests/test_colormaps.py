@@ -0,0 +1,56 @@
+"""
+Unit tests for e2D plot colormaps
+Tests colormap lookup tables and color packing without a GL context (headless)
+"""
+
+import numpy as np
+from e2D.plots import COLORMAPS, colormap_lut, pack_colors
+
+def test_colormap_lut():
+    """Test sampling named and custom colormaps"""
+    print("\n=== Colormap LUT ===")
+
+    for name in COLORMAPS:
+        lut = colormap_lut(name, 64)
+        assert lut.shape == (64, 4) and lut.dtype == np.float32, f"{name} LUT should be (64, 4) float32"
+        assert np.all((lut >= 0.0) & (lut <= 1.0)), f"{name} LUT should stay in 0..1"
+
+    gray = colormap_lut('gray', 3)
+    assert np.allclose(gray, [[0, 0, 0, 1], [0.5, 0.5, 0.5, 1], [1, 1, 1, 1]]), "Gray should ramp linearly"
+
+    custom = colormap_lut([[1, 0, 0, 0], [0, 0, 1, 1]], 2)
+    assert np.allclose(custom, [[1, 0, 0, 0], [0, 0, 1, 1]]), "Custom stops should be the LUT ends"
+
+    try:
+        colormap_lut('not-a-colormap')
+        assert False, "Unknown names should raise"
+    except ValueError:
+        pass
+    print("✓ Colormap LUT")
+
+def test_pack_colors():
+    """Test RGBA8 packing used by per-point colors"""
+    print("\n=== Pack Colors ===")
+
+    packed = pack_colors([[1.0, 0.0, 0.0, 1.0], [0.0, 0.0, 1.0, 0.0]])
+    assert packed.dtype == np.uint32 and packed.shape == (2,), "Should pack to one uint32 per color"
+    assert packed[0] == 0xFF0000FF, "Red should be in the lowest byte"
+    assert packed[1] == 0x00FF0000, "Blue should be in the third byte"
+    assert pack_colors([[0.0, 1.0, 0.0]])[0] == 0xFF00FF00, "RGB colors should get full alpha"
+    assert pack_colors([[2.0, -1.0, 0.0, 1.0]])[0] == 0xFF0000FF, "Components should be clamped"
+    print("✓ Pack colors")
+
+def run_all_tests():
+    print("\n" + "="*50)
+    print("Running e2D Colormap Tests (Headless)")
+    print("="*50)
+
+    test_colormap_lut()
+    test_pack_colors()
+
+    print("\n" + "="*50)
+    print("✓ ALL COLORMAP TESTS PASSED")
+    print("="*50)
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,83 @@
+"""
+Unit tests for e2D chunked data loaders
+Tests the .npy, raw binary and CSV chunk readers without a GL context (headless)
+"""
+
+import os
+import tempfile
+import numpy as np
+from e2D.loaders import file_shape, iter_bin_chunks, iter_csv_chunks, iter_file_chunks, iter_npy_chunks
+
+def test_npy_chunks():
+    """Test chunked .npy reading, tail selection and progress"""
+    print("\n=== NPY Chunks ===")
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "points.npy")
+        data = np.arange(20, dtype='f8').reshape(10, 2)
+        np.save(path, data)
+
+        progress = []
+        chunks = list(iter_npy_chunks(path, chunk_rows=4, progress=lambda done, total: progress.append((done, total))))
+        assert [len(chunk) for chunk in chunks] == [4, 4, 2], "Should split into chunk_rows rows"
+        assert all(chunk.dtype == np.float32 for chunk in chunks), "Chunks should be float32"
+        assert np.array_equal(np.concatenate(chunks), data), "Chunks should cover the file in order"
+        assert progress[-1] == (160, 160), "Progress should end at the total byte count"
+
+        tail = np.concatenate(list(iter_npy_chunks(path, chunk_rows=4, last_rows=3)))
+        assert np.array_equal(tail, data[-3:]), "last_rows should only read the tail"
+        assert file_shape(path) == (10, 2), "Shape should come from the header"
+    print("✓ NPY chunks")
+
+def test_bin_chunks():
+    """Test raw binary records with a header offset"""
+    print("\n=== Binary Chunks ===")
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "capture.bin")
+        data = np.arange(30, dtype='i2').reshape(10, 3)
+        with open(path, 'wb') as f:
+            f.write(b'HEAD')
+            f.write(data.tobytes())
+            f.write(b'\x00')  # Trailing partial record
+
+        chunks = list(iter_bin_chunks(path, dtype='i2', columns=3, offset=4, chunk_rows=6))
+        assert [len(chunk) for chunk in chunks] == [6, 4], "Partial records should be ignored"
+        assert np.array_equal(np.concatenate(chunks), data), "Records should be read after the header"
+        assert file_shape(path, dtype='i2', columns=3, offset=4) == (10, 3), "Shape should follow the file size"
+    print("✓ Binary chunks")
+
+def test_csv_chunks():
+    """Test chunked CSV parsing with a header, blank lines and column selection"""
+    print("\n=== CSV Chunks ===")
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "log.csv")
+        with open(path, 'w') as f:
+            f.write("t,a,b\n")
+            for i in range(7):
+                f.write(f"{i},{i * 2},{i * 3}\n")
+            f.write("\n")
+
+        chunks = list(iter_file_chunks(path, chunk_rows=3, skip_header=1, usecols=(0, 2)))
+        data = np.concatenate(chunks)
+        assert data.shape == (7, 2), "Should keep the selected columns of every data line"
+        assert np.array_equal(data[:, 1], np.arange(7) * 3), "Values should be parsed in order"
+        assert file_shape(path) is None, "CSV shape is not known in advance"
+    print("✓ CSV chunks")
+
+def run_all_tests():
+    print("\n" + "="*50)
+    print("Running e2D Loader Tests (Headless)")
+    print("="*50)
+
+    test_npy_chunks()
+    test_bin_chunks()
+    test_csv_chunks()
+
+    print("\n" + "="*50)
+    print("✓ ALL LOADER TESTS PASSED")
+    print("="*50)
+
+if __name__ == "__main__":
+    run_all_tests()
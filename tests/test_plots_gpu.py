@@ -0,0 +1,580 @@
+"""
+Unit tests for e2D plots that need a GPU
+Runs on a standalone OpenGL 4.3 context and skips every test when none can be created
+"""
+
+from types import SimpleNamespace
+import moderngl
+import numpy as np
+import pytest
+from e2D import V2
+from e2D.color_defs import RED, WHITE
+from e2D.plots import (
+    AxisLink, BoundsReducer, ComputeCurve, CurveFamily, CurveSettings, DensityPlot, DensitySettings, GpuStream,
+    HeatmapPlot, HeatmapSettings, HistogramPlot, HistogramSettings, ImplicitBackend, ImplicitPlot, ImplicitSettings,
+    MultiStream, Plot2D, ScatterPlot, SegmentDisplay, ShaderManager, StreamSettings, View2D, WaterfallPlot,
+    colormap_lut, colormap_texture,
+)
+
+def create_context():
+    """Standalone OpenGL 4.3 context, None when the driver cannot provide one."""
+    for backend in (None, 'egl'):
+        try:
+            options = {'backend': backend} if backend else {}
+            return moderngl.create_standalone_context(require=430, **options)
+        except Exception:
+            continue
+    return None
+
+def require_context():
+    """Standalone OpenGL 4.3 context, skipping the test when there is none."""
+    ctx = create_context()
+    if ctx is None:
+        pytest.skip("No OpenGL 4.3 context")
+    return ctx
+
+def lit_pixels(ctx, fbo, draw) -> int:
+    """Pixels touched by draw() on a cleared framebuffer."""
+    fbo.use()
+    fbo.clear(0.0, 0.0, 0.0, 1.0)
+    draw()
+    image = np.frombuffer(fbo.read(components=3), dtype=np.uint8)
+    return int(np.count_nonzero(image.reshape(-1, 3).any(axis=1)))
+
+def rendered_image(ctx, fbo, draw) -> np.ndarray:
+    """RGB image of draw() on a cleared framebuffer, row 0 at the bottom."""
+    fbo.use()
+    fbo.clear(0.0, 0.0, 0.0, 1.0)
+    draw()
+    width, height = fbo.size
+    return np.frombuffer(fbo.read(components=3), dtype=np.uint8).reshape(height, width, 3)
+
+def view_of(ctx, fbo, top_left, bottom_right) -> View2D:
+    view = View2D(ctx)
+    view.update_win_size(*fbo.size)
+    view.set_viewport(top_left, bottom_right)
+    view.use(0)
+    return view
+
+def paused_stream(ctx, **options) -> GpuStream:
+    """10 000 samples of a sine at 1 ms, then one more after a pause of about a second."""
+    stream = GpuStream(ctx, capacity=20000, settings=StreamSettings(show_points=False), **options)
+    x = np.arange(10000) * 0.001
+    stream.push(np.stack([x, np.sin(x * 3.0)], axis=1).astype('f4'))
+    stream.push(np.array([[11.0, 0.0]], dtype='f4'))
+    return stream
+
+def test_multistream_defaults():
+    """Test MultiStream construction with the default channel colors"""
+    print("\n=== MultiStream Defaults ===")
+
+    ctx = require_context()
+
+    stream = MultiStream(ctx, 3, capacity=16)
+    assert stream.colors.shape == (3, 4), "Should keep one RGBA color per channel"
+    assert np.allclose(stream.colors, tuple(stream.settings.line_color)), "Channels should default to the line color"
+
+    stream = MultiStream(ctx, 2, capacity=16, colors=[RED, (0.0, 1.0, 0.0, 1.0)])
+    assert np.allclose(stream.colors[0], tuple(RED)), "Color objects should be accepted"
+    stream.set_channel(1, color=RED)
+    assert np.allclose(stream.colors[1], tuple(RED)), "set_channel should accept Color objects"
+    ctx.release()
+    print("✓ MultiStream defaults")
+
+def test_segment_numbers_defaults():
+    """Test SegmentDisplay.add_numbers_numpy with the default color"""
+    print("\n=== Segment Numbers Defaults ===")
+
+    ctx = require_context()
+
+    display = SegmentDisplay(ctx)
+    display.add_numbers_numpy([12, 7], [(0, 0), (0, 40)])
+    data = display.instance_data[-1]
+    assert display.instance_count == 3, "Should queue one cell per digit"
+    assert np.allclose(data[:, 4:8], tuple(WHITE)), "Default color should be white"
+
+    display.add_numbers_numpy([1, 2], [(0, 0), (0, 40)], colors=[RED, WHITE])
+    assert np.allclose(display.instance_data[-1][:, 4:8], [tuple(RED), tuple(WHITE)]), "Color lists should be accepted"
+    display.clear()
+    ctx.release()
+    print("✓ Segment numbers defaults")
+
+def test_stream_culling_after_pause():
+    """Culling by view must keep every visible sample when the spacing is not uniform"""
+    print("\n=== Stream Culling After Pause ===")
+
+    ctx = require_context()
+
+    fbo = ctx.simple_framebuffer((400, 300))
+    view = view_of(ctx, fbo, V2(0.0, 1.5), V2(10.0, -1.5))
+    stream = paused_stream(ctx, lod=True)
+
+    s0, s1, level = stream._visible_range(view)
+    assert s0 == 0 and s1 == 10000, f"Visible samples should span the curve, got {s0}..{s1}"
+    assert level == 0, "LOD should not be used across the pause"
+
+    culled = lit_pixels(ctx, fbo, lambda: stream.draw(view))
+    full = lit_pixels(ctx, fbo, lambda: stream.draw())
+    assert culled > 1000 and culled == full, f"Culled draw lit {culled} pixels, full draw {full}"
+
+    # Zoomed in on the steady part, the LOD may be used again
+    view = view_of(ctx, fbo, V2(2.0, 1.5), V2(8.0, -1.5))
+    s0, s1, level = stream._visible_range(view)
+    assert 1998 <= s0 <= 2000 and 8000 <= s1 <= 8002 and level > 0, f"Steady range should use LOD, got {s0}..{s1} level {level}"
+
+    # Without LOD the same range is drawn at full resolution
+    assert paused_stream(ctx)._visible_range(view)[2] == 0, "LOD should be opt-in"
+    ctx.release()
+    print("✓ Stream culling after pause")
+
+def test_rolling_window_after_pause():
+    """The rolling window must keep every sample within rolling_window of the newest one"""
+    print("\n=== Rolling Window After Pause ===")
+
+    ctx = require_context()
+
+    stream = paused_stream(ctx, rolling_window=6.0)
+    first, last, _ = stream._visible_range(None)
+    assert (first, last) == (5000, 10000), f"Window [5, 11] should keep samples 5000..10000, got {first}..{last}"
+    ctx.release()
+    print("✓ Rolling window after pause")
+
+def test_auto_fit_after_pause():
+    """auto_fit and stream histograms must cover the whole live window of a paused stream"""
+    print("\n=== Auto Fit After Pause ===")
+
+    ctx = require_context()
+
+    fbo = ctx.simple_framebuffer((400, 300))
+    view = view_of(ctx, fbo, V2(-1.0, 1.0), V2(1.0, -1.0))
+    stream = paused_stream(ctx)
+    stream.auto_fit(view, margin=0.0)
+    stream.auto_fit(view, margin=0.0)  # Bounds arrive one call later
+    half_w = 1.0 / float(view.zoom[0])
+    x_min, x_max = float(view.center[0]) - half_w, float(view.center[0]) + half_w
+    assert abs(x_min - 0.0) < 1e-3 and abs(x_max - 11.0) < 1e-3, f"View should fit x 0..11, got {x_min}..{x_max}"
+
+    stream = paused_stream(ctx, rolling_window=6.0)
+    stream.bounds()
+    bounds = stream.bounds_reducer.flush()
+    assert bounds.count == 5001, f"Bounds should cover the 5001 samples of the window, got {bounds.count}"
+    assert abs(bounds.x_min + 6.0) < 1e-3 and abs(bounds.x_max) < 1e-3, "Window should end at the anchor"
+
+    histogram = HistogramPlot(ctx)
+    histogram.set_stream(stream)
+    histogram.update()
+    assert int(histogram.counts().sum()) == 5001, "Histogram should bin every sample of the window"
+    ctx.release()
+    print("✓ Auto fit after pause")
+
+def test_bounds_across_ring_wrap():
+    """BoundsReducer must reduce a range that wraps past the end of the ring"""
+    print("\n=== Bounds Across Ring Wrap ===")
+
+    ctx = require_context()
+    points = np.stack([np.arange(100), -np.arange(100)], axis=1).astype('f4')
+    points[50] = (1000.0, 1000.0)  # Outside the range, must not be read
+    buffer = ctx.buffer(points.tobytes())
+
+    reducer = BoundsReducer(ctx)
+    assert reducer.reduce(buffer, 90, 20, 100, offset=(1.0, 0.0)) is None, "First call has nothing collected yet"
+    bounds = reducer.flush()
+    assert bounds.count == 20, f"Should reduce 20 points, got {bounds.count}"
+    assert (bounds.x_min, bounds.x_max) == (1.0, 100.0), "x should span indices 90..99 and 0..9 plus the offset"
+    assert (bounds.y_min, bounds.y_max) == (-99.0, 0.0), "y should span indices 90..99 and 0..9"
+    assert abs(bounds.mean_x - 50.5) < 1e-4, f"Mean should cover both ends of the ring, got {bounds.mean_x}"
+    ctx.release()
+    print("✓ Bounds across ring wrap")
+
+def ubo_values(view: View2D) -> np.ndarray:
+    """center and scale as written to the view's UBO."""
+    return np.frombuffer(view.buffer.read(), dtype='f4')[2:6]
+
+def test_view_changes_on_use():
+    """pan/zoom/set_viewport must only mark the view dirty, and use() must write them once"""
+    print("\n=== View Changes On Use ===")
+
+    ctx = require_context()
+
+    fbo = ctx.simple_framebuffer((400, 300))
+    view = View2D(ctx)
+    view.update_win_size(*fbo.size)
+    view.use(0)
+    stream = GpuStream(ctx, capacity=64, settings=StreamSettings(show_points=False))
+    x = np.linspace(10.0, 12.0, 64)
+    stream.push(np.stack([x, np.zeros_like(x)], axis=1).astype('f4'))
+    assert lit_pixels(ctx, fbo, stream.draw) == 0, "Stream should start outside the view"
+
+    written = ubo_values(view).copy()
+    view.set_viewport(V2(9.0, 1.0), V2(13.0, -1.0))
+    view.pan(1.0, 0.0)
+    view.zoom_at(2.0, 0.0, 0.0)
+    assert view.dirty and np.array_equal(ubo_values(view), written), "Mutators should not write the UBO"
+    assert view.flush() and not view.dirty, "flush() should write a dirty view"
+    assert np.allclose(ubo_values(view), np.concatenate([view.center, view.zoom])), "The UBO should hold the new view"
+    assert not view.flush(), "A clean view should not be written again"
+
+    view.set_viewport(V2(9.0, 1.0), V2(13.0, -1.0))
+    view.use(0)
+    assert lit_pixels(ctx, fbo, stream.draw) > 0, "Draws after use() should see the new view"
+    ctx.release()
+    print("✓ View changes on use")
+
+def test_linked_plots():
+    """Panning a plot must reach the plots linked to it on their next render"""
+    print("\n=== Linked Plots ===")
+
+    ctx = require_context()
+    fbo = ctx.simple_framebuffer((400, 300))
+    fbo.use()
+    root = SimpleNamespace(ctx=ctx, window_size=V2(400, 300))
+    leader = Plot2D(root, (0, 0), (400, 150))
+    follower = Plot2D(root, (0, 150), (200, 300))  # Another size, linked through AxisLink
+    twin = Plot2D(root, (0, 0), (400, 150))        # Same size, shares the leader's view
+    follower.link(leader, y=False)
+    twin.link(leader)
+    assert twin.view is leader.view, "Same-size plots linked on both axes should share one view"
+    assert isinstance(follower.view.links[0], AxisLink) and follower.view.links[1] is None, "Only x should be linked"
+
+    follower_y = (float(follower.view.center[1]), float(follower.view.zoom[1]))
+    leader.view.pan(0.5, 0.25)
+    leader.view.zoom_step(2.0)
+    assert follower.view.center[0] == 0.0, "Followers should pull the link only on use()"
+
+    Plot2D.render_all([leader, follower, twin], [lambda: None] * 3)
+    assert follower.view.center[0] == leader.view.center[0] and follower.view.zoom[0] == leader.view.zoom[0], "Follower x should match the leader"
+    assert (float(follower.view.center[1]), float(follower.view.zoom[1])) == follower_y, "Unlinked y should not move"
+    for view in (leader.view, follower.view):
+        assert not view.dirty and np.allclose(ubo_values(view), np.concatenate([view.center, view.zoom])), "Rendered views should be written"
+    assert ctx.viewport == (0, 0, 400, 300) and ctx.scissor == (0, 0, 400, 300), "render_all should restore the viewport and reset the scissor"
+
+    follower.view.pan(-0.5, 0.0)
+    Plot2D.render_all([leader, follower], [lambda: None] * 2)
+    assert leader.view.center[0] == follower.view.center[0], "Links should work both ways"
+    ctx.release()
+    print("✓ Linked plots")
+
+def test_shader_manager_release():
+    """Programs must be cached per context, and release(ctx) must drop that context's entries"""
+    print("\n=== Shader Manager Release ===")
+
+    first = require_context()
+    second = create_context()
+    source = "#version 430\nlayout(local_size_x = 1) in;\nvoid main() {}\n"
+
+    program = ShaderManager.compute(first, source)
+    assert ShaderManager.compute(first, source) is program, "Same sources should share one program per context"
+    assert ShaderManager.compute(second, source) is not program, "Another context should get its own program"
+    texture = colormap_texture(first, 'viridis')
+    assert colormap_texture(first, 'viridis') is texture, "Named colormaps should be cached per context"
+
+    ShaderManager.release(first)
+    assert first not in ShaderManager._programs, "Released context should not keep programs"
+    assert second in ShaderManager._programs, "Other contexts should keep theirs"
+    assert colormap_texture(first, 'viridis') is not texture, "Released context should not keep colormap textures"
+    assert ShaderManager.compute(first, source) is not program, "Programs should be rebuilt after a release"
+
+    for ctx in (first, second):
+        ShaderManager.release(ctx)
+        assert ctx not in ShaderManager._programs
+        ctx.release()
+    print("✓ Shader manager release")
+
+def curve_plan(curve: ComputeCurve) -> tuple[int, float, float]:
+    """Vertex count and t span of the last adaptive plan."""
+    data = curve.command_buffer.read()
+    return int(np.frombuffer(data[:4], dtype='u4')[0]), *np.frombuffer(data[16:24], dtype='f4').tolist()
+
+def test_adaptive_curve_replans():
+    """An adaptive curve must be re-planned for the view bound at binding 0, over its visible part"""
+    print("\n=== Adaptive Curve Re-plans ===")
+
+    ctx = require_context()
+    fbo = ctx.simple_framebuffer((400, 300))
+    view = view_of(ctx, fbo, V2(0.0, 1.5), V2(10.0, -1.5))
+    curve = ComputeCurve(ctx, "x = t; y = sin(t * 3.0);", (0.0, 100.0), count=2048,
+                         settings=CurveSettings(adaptive=True, coarse_count=64))
+    assert lit_pixels(ctx, fbo, curve.draw) > 200, "Curve should be drawn in the view"
+    count, t0, t1 = curve_plan(curve)
+    assert t0 == 0.0 and 10.0 <= t1 < 15.0, f"Plan should cover only the visible part, got {t0}..{t1}"
+
+    view.pan(-1.0, 0.0)  # Now showing x 5..15
+    view.use(0)
+    lit_pixels(ctx, fbo, curve.draw)
+    count, t0, t1 = curve_plan(curve)
+    assert 0.0 < t0 <= 5.0 and 15.0 <= t1 < 20.0, f"Panning should re-plan the curve, got {t0}..{t1}"
+    xs = np.frombuffer(curve.vbo.read(), dtype='f4').reshape(-1, 2)[:count, 0]
+    assert np.all(np.diff(xs) > 0.0) and xs[0] >= t0 - 1e-4 and xs[-1] <= t1 + 1e-4, "Samples should stay in the planned span"
+
+    before = curve._adaptive_state
+    curve.t_range = (0.0, 50.0)
+    curve.draw()
+    assert curve._adaptive_state != before, "t_range should be part of the plan key"
+    before = curve._adaptive_state
+    curve.settings.tolerance = 1.0
+    curve.draw()
+    assert curve._adaptive_state != before, "tolerance should be part of the plan key"
+    before = curve._adaptive_state
+    curve.draw()
+    assert curve._adaptive_state == before, "An unchanged view should reuse the plan"
+    ctx.release()
+    print("✓ Adaptive curve re-plans")
+
+def test_contour_thickness():
+    """Marching squares contours must be drawn as quads of the requested thickness"""
+    print("\n=== Contour Thickness ===")
+
+    ctx = require_context()
+    fbo = ctx.simple_framebuffer((400, 400))
+    view = view_of(ctx, fbo, V2(-2.0, 2.0), V2(2.0, -2.0))
+    settings = ImplicitSettings(backend=ImplicitBackend.MARCHING_SQUARES, thickness=1.0)
+    plot = ImplicitPlot(ctx, "val = x * x + y * y - 1.0;", settings)
+
+    thin = lit_pixels(ctx, fbo, lambda: plot.draw(view))
+    assert len(plot.segments()) > 100, "The circle should be extracted"
+    settings.thickness = 6.0
+    thick = lit_pixels(ctx, fbo, lambda: plot.draw(view))
+    circumference = 2.0 * np.pi * 100.0  # Radius of 100 pixels
+    assert 0.7 * circumference < thin < 1.5 * circumference, f"1 px contour lit {thin} pixels"
+    assert 4.5 * thin < thick < 7.5 * thin, f"6 px contour lit {thick} pixels, 1 px {thin}"
+    ctx.release()
+    print("✓ Contour thickness")
+
+def test_scatter_pixels():
+    """ScatterPlot must draw each point at its position with its own size and color"""
+    print("\n=== Scatter Pixels ===")
+
+    ctx = require_context()
+    fbo = ctx.simple_framebuffer((200, 200))
+    view_of(ctx, fbo, V2(-1.0, 1.0), V2(1.0, -1.0))
+    positions = np.array([[-0.5, 0.0], [0.5, 0.0]], dtype='f4')  # Pixels (50, 100) and (150, 100)
+    scatter = ScatterPlot(ctx, positions, sizes=[8.0, 24.0], colors=[(1.0, 0.0, 0.0, 1.0), (0.0, 1.0, 0.0, 1.0)])
+
+    image = rendered_image(ctx, fbo, scatter.draw)
+    assert tuple(image[100, 50]) == (255, 0, 0) and tuple(image[100, 150]) == (0, 255, 0), "Points should have their own colors"
+    lit = image.any(axis=2)
+    small, large = int(lit[:, :100].sum()), int(lit[:, 100:].sum())
+    assert 40 < small < 80 and 6.0 < large / small < 12.0, f"Sizes 8 and 24 should light about 50 and 450 pixels, got {small} and {large}"
+
+    scatter.set_data(positions, values=[0.0, 1.0])
+    image = rendered_image(ctx, fbo, scatter.draw)
+    lut = np.round(colormap_lut(scatter.settings.colormap) * 255.0)[:, :3]
+    assert np.abs(image[100, 50] - lut[0]).max() <= 2 and np.abs(image[100, 150] - lut[-1]).max() <= 2, "Values should map through the colormap"
+    assert tuple(image[100, 100]) == (0, 0, 0), "Nothing should be drawn between the points"
+
+    scatter.update(0, positions=np.array([[-0.5, 0.5]], dtype='f4'))
+    image = rendered_image(ctx, fbo, scatter.draw)
+    assert image[150, 50].any() and not image[100, 50].any(), "update() should move the point in place"
+    ctx.release()
+    print("✓ Scatter pixels")
+
+def density_bins(density: DensityPlot) -> np.ndarray:
+    """Bin counts of the last binning pass, (rows, columns)."""
+    width, height = density.bins.size
+    return np.frombuffer(density.bins.read(), dtype=np.uint32).reshape(height, width)
+
+def test_density_totals():
+    """DensityPlot bins must hold every point inside the view once, square or hexagonal"""
+    print("\n=== Density Totals ===")
+
+    ctx = require_context()
+    fbo = ctx.simple_framebuffer((200, 200))
+    view = view_of(ctx, fbo, V2(-1.0, 1.0), V2(1.0, -1.0))
+    points = np.random.default_rng(3).normal(0.0, 0.6, size=(100000, 2)).astype('f4')
+    inside = int(np.all(np.abs(points) <= 1.0, axis=1).sum())
+    density = DensityPlot(ctx, points, DensitySettings(bin_size=10.0))
+
+    assert lit_pixels(ctx, fbo, lambda: density.draw(view)) > 10000, "Density should cover the view"
+    bins = density_bins(density)
+    assert int(bins.sum()) == inside, f"Bins should hold the {inside} points in the view, got {int(bins.sum())}"
+    max_count = int(np.frombuffer(density.stats_buffer.read(), dtype=np.uint32)[0])
+    assert max_count == int(bins.max()), "The largest bin should be found"
+
+    # Square bins are 10 pixels, 0.1 world units, from the bottom-left corner
+    edges = np.arange(0, 22) * 0.1 - 1.0
+    expected, _, _ = np.histogram2d(points[:, 1], points[:, 0], bins=(edges, edges))
+    assert np.abs(bins[:20, :20] - expected[:20, :20]).sum() < inside * 1e-3, "Square bins should match np.histogram2d"
+
+    density.settings.hexagonal = True
+    density.draw(view)
+    assert int(density_bins(density).sum()) == inside, "Hexagonal bins should hold every point in the view"
+    density.set_data(points[:1000])
+    density.draw(view)
+    assert int(density_bins(density).sum()) == int(np.all(np.abs(points[:1000]) <= 1.0, axis=1).sum()), "New data should be re-binned"
+    ctx.release()
+    print("✓ Density totals")
+
+def colormap_rgb(colormap: str, t: float) -> np.ndarray:
+    """8-bit RGB of the colormap texture, sampled at t like the shaders do."""
+    lut = np.round(colormap_lut(colormap) * 255.0)[:, :3]
+    position = t * (len(lut) - 1)
+    low = int(np.floor(position))
+    high = min(low + 1, len(lut) - 1)
+    return lut[low] + (lut[high] - lut[low]) * (position - low)
+
+def close_rgb(pixel, expected, tolerance: float = 2.0) -> bool:
+    return bool(np.abs(pixel.astype(float) - expected).max() <= tolerance)
+
+def test_heatmap_pixels():
+    """HeatmapPlot must map each cell through the colormap over its extent, with NaN left transparent"""
+    print("\n=== Heatmap Pixels ===")
+
+    ctx = require_context()
+    fbo = ctx.simple_framebuffer((200, 200))
+    view_of(ctx, fbo, V2(-1.0, 1.0), V2(1.0, -1.0))
+    heatmap = HeatmapPlot(ctx, [[0.0, 1.0], [2.0, np.nan]], extent=(-0.5, -0.5, 0.5, 0.5))  # Pixels 50..150
+    colormap = heatmap.settings.colormap
+    assert heatmap.shape == (2, 2) and heatmap.value_range == (0.0, 2.0), "NaN should be left out of the value range"
+
+    image = rendered_image(ctx, fbo, heatmap.draw)
+    assert close_rgb(image[75, 75], colormap_rgb(colormap, 0.0)), "Row 0 should be drawn at y_min"
+    assert close_rgb(image[75, 125], colormap_rgb(colormap, 0.5)), "Values should be scaled by the value range"
+    assert close_rgb(image[125, 75], colormap_rgb(colormap, 1.0)), "The maximum should get the last color"
+    assert not image[125, 125].any(), "NaN cells should be transparent"
+    assert not image[25, 25].any() and not image[175, 100].any(), "Nothing should be drawn outside the extent"
+
+    heatmap.update(np.array([[2.0]]), x=1, y=1)
+    heatmap.settings.value_range = (0.0, 4.0)
+    image = rendered_image(ctx, fbo, heatmap.draw)
+    assert close_rgb(image[125, 125], colormap_rgb(colormap, 0.5)), "update() should overwrite the sub-rectangle"
+    assert close_rgb(image[75, 125], colormap_rgb(colormap, 0.25)), "settings.value_range should override the data range"
+    ctx.release()
+    print("✓ Heatmap pixels")
+
+def test_waterfall_wrap():
+    """WaterfallPlot must draw the oldest row at y_min and the newest at y_max as the ring wraps"""
+    print("\n=== Waterfall Wrap ===")
+
+    ctx = require_context()
+    fbo = ctx.simple_framebuffer((100, 400))
+    view_of(ctx, fbo, V2(-1.0, 1.0), V2(1.0, -1.0))
+    waterfall = WaterfallPlot(ctx, bins=2, history=4, settings=HeatmapSettings(value_range=(0.0, 8.0)))
+    colormap = waterfall.settings.colormap
+    rows_at = lambda image: [image[y, 50] for y in (50, 150, 250, 350)]  # Texture rows are 100 pixels, bottom first
+
+    waterfall.push(np.full((2, 2), [[1.0], [2.0]]))
+    bottom, second, third, top = rows_at(rendered_image(ctx, fbo, waterfall.draw))
+    assert not bottom.any() and not second.any(), "Rows never written should be transparent"
+    assert close_rgb(third, colormap_rgb(colormap, 1 / 8)) and close_rgb(top, colormap_rgb(colormap, 2 / 8)), "The newest row should be at the top"
+
+    waterfall.push(np.full((3, 2), [[3.0], [4.0], [5.0]]))  # Wraps: row 0 is overwritten
+    assert (waterfall.head, waterfall.rows, waterfall.row_offset) == (1, 4, 0.25), "The ring should wrap"
+    for pixel, value in zip(rows_at(rendered_image(ctx, fbo, waterfall.draw)), (2.0, 3.0, 4.0, 5.0)):
+        assert close_rgb(pixel, colormap_rgb(colormap, value / 8)), f"Rows should go oldest to newest, expected {value}"
+
+    waterfall.push(np.arange(6.0).repeat(2).reshape(6, 2))  # More rows than history: only the last 4 stay
+    for pixel, value in zip(rows_at(rendered_image(ctx, fbo, waterfall.draw)), (2.0, 3.0, 4.0, 5.0)):
+        assert close_rgb(pixel, colormap_rgb(colormap, value / 8)), f"A long push should keep its last rows, expected {value}"
+    assert waterfall.value_range == (1.0, 5.0), "The running value range should cover every row kept so far"
+    ctx.release()
+    print("✓ Waterfall wrap")
+
+def test_curve_family_pixels():
+    """CurveFamily must evaluate one curve per parameter and draw each in its own color"""
+    print("\n=== Curve Family Pixels ===")
+
+    ctx = require_context()
+    fbo = ctx.simple_framebuffer((200, 200))
+    view_of(ctx, fbo, V2(-1.0, 1.0), V2(1.0, -1.0))
+    params = [-0.495, 0.005, 0.505]  # Pixel rows 50, 100 and 150
+    colors = [(1.0, 0.0, 0.0, 1.0), (0.0, 1.0, 0.0, 1.0), (0.0, 0.0, 1.0, 1.0)]
+    family = CurveFamily(ctx, "x = t; y = param.x;", (-1.0, 1.0), params, count=64, colors=colors)
+
+    vertices = np.frombuffer(family.vertex_buffer.read(), dtype='f4').reshape(3, 64, 2)
+    assert np.allclose(vertices[:, :, 0], np.linspace(-1.0, 1.0, 64)), "Every curve should span t_range"
+    assert np.allclose(vertices[:, :, 1], np.array(params)[:, None]), "Each curve should get its parameter"
+
+    image = rendered_image(ctx, fbo, family.draw)
+    for row, expected in zip((50, 100, 150), ((255, 0, 0), (0, 255, 0), (0, 0, 255))):
+        assert all(tuple(image[row, x]) == expected for x in (20, 100, 180)), f"Row {row} should be {expected}"
+    assert int(image.any(axis=2).sum()) < 3 * 200 * 3, "Only the three lines should be drawn"
+
+    family.set_params([0.505])
+    image = rendered_image(ctx, fbo, family.draw)
+    assert family.curves == 1 and not image[50].any() and image[150, 100].any(), "set_params should change the curves"
+    assert tuple(image[150, 100]) == (255, 255, 255), "Colors that no longer match should fall back to settings.color (white)"
+    ctx.release()
+    print("✓ Curve family pixels")
+
+def test_histogram_counts():
+    """HistogramPlot counts must match np.histogram, for fixed and automatic ranges and ring sources"""
+    print("\n=== Histogram Counts ===")
+
+    ctx = require_context()
+    rng = np.random.default_rng(5)
+    values = (np.floor(rng.normal(0.0, 1.0, 100000) * 10.0) + 0.5) / 10.0  # Bin centers, away from the edges
+    values[:10] = np.nan
+
+    histogram = HistogramPlot(ctx, HistogramSettings(bins=60, value_range=(-3.0, 3.0)))
+    histogram.set_data(values)
+    histogram.update()
+    expected, _ = np.histogram(values[~np.isnan(values)], bins=60, range=(-3.0, 3.0))
+    assert np.array_equal(histogram.counts(), expected), "Fixed range counts should match np.histogram"
+
+    # Half a step past the extreme centers, so the automatic bins are 0.1 wide around the centers again
+    values = np.concatenate([values, [np.nanmin(values) - 0.05, np.nanmax(values) + 0.05]]).astype('f4')
+    histogram.settings = HistogramSettings(bins=int(round((np.nanmax(values) - np.nanmin(values)) * 10.0)))
+    histogram.set_data(values)
+    histogram.update()
+    low, high = histogram.value_range()
+    assert (low, high) == (float(np.nanmin(values)), float(np.nanmax(values))), "Automatic range should be the data min/max"
+    expected, _ = np.histogram(values[~np.isnan(values)], bins=histogram.settings.bins, range=(low, high))
+    assert np.array_equal(histogram.counts(), expected), "Automatic range counts should match np.histogram"
+
+    # y of 50 vec2 points starting at index 80 of a 100 point ring
+    points = np.stack([np.zeros(100), np.arange(100) % 10 + 0.5], axis=1).astype('f4')
+    histogram.settings = HistogramSettings(bins=10, value_range=(0.0, 10.0))
+    histogram.set_source(ctx.buffer(points.tobytes()), 50, start_index=80, capacity=100, stride=2, component=1)
+    histogram.update()
+    expected, _ = np.histogram(np.roll(points[:, 1], -80)[:50], bins=10, range=(0.0, 10.0))
+    assert np.array_equal(histogram.counts(), expected), "Ring sources should wrap like np.roll"
+    ctx.release()
+    print("✓ Histogram counts")
+
+def test_histogram_bars():
+    """Histogram bars must be as tall as their counts, scaled to the tallest one when normalized"""
+    print("\n=== Histogram Bars ===")
+
+    ctx = require_context()
+    fbo = ctx.simple_framebuffer((200, 200))
+    view_of(ctx, fbo, V2(0.0, 1.0), V2(2.0, -1.0))
+    histogram = HistogramPlot(ctx, HistogramSettings(bins=2, value_range=(0.0, 2.0), baseline=-1.0, normalize=True))
+    histogram.set_data(np.repeat([0.5, 1.5], [200, 100]))
+
+    image = rendered_image(ctx, fbo, histogram.draw)
+    heights = image.any(axis=2).sum(axis=0)
+    assert abs(int(heights[50]) - 100) <= 1 and abs(int(heights[150]) - 50) <= 1, f"Bars should be 100 and 50 pixels, got {heights[50]} and {heights[150]}"
+    assert heights[2] == 0 and heights[100] == 0, "bar_gap should leave room between the bars"
+    ctx.release()
+    print("✓ Histogram bars")
+
+def run_all_tests():
+    print("\n" + "="*50)
+    print("Running e2D Plot GPU Tests")
+    print("="*50)
+
+    test_multistream_defaults()
+    test_segment_numbers_defaults()
+    test_stream_culling_after_pause()
+    test_rolling_window_after_pause()
+    test_auto_fit_after_pause()
+    test_bounds_across_ring_wrap()
+    test_view_changes_on_use()
+    test_linked_plots()
+    test_shader_manager_release()
+    test_adaptive_curve_replans()
+    test_contour_thickness()
+    test_scatter_pixels()
+    test_density_totals()
+    test_heatmap_pixels()
+    test_waterfall_wrap()
+    test_curve_family_pixels()
+    test_histogram_counts()
+    test_histogram_bars()
+
+    print("\n" + "="*50)
+    print("✓ ALL PLOT GPU TESTS PASSED")
+    print("="*50)
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,74 @@
+"""
+Unit tests for e2D stream culling
+Tests the x index GpuStream culls with, without a GL context (headless)
+"""
+
+import numpy as np
+from e2D.plots import SampleIndex
+
+def test_find_across_wrap():
+    """Test binary search over a ring that has wrapped"""
+    print("\n=== Find Across Wrap ===")
+
+    index = SampleIndex(8)
+    index.push(np.arange(5, dtype='f4'))
+    index.push(np.arange(5, 11, dtype='f4'))  # Oldest live sample is x = 3 at index 3
+    assert index.size == 8 and index.total == 11, "Should keep the last capacity samples"
+    assert index.find(3.0) == 3, "Oldest live sample should be found"
+    assert index.find(7.5) == 8, "Should find the first sample past the value"
+    assert index.find(7.0, 'right') == 8, "Right side should skip equal x"
+    assert index.find(-1.0) == 3 and index.find(99.0) == 11, "Out of range values should clamp to the live samples"
+    assert index.x_at(10) == 10.0, "x_at should follow the ring"
+    print("✓ Find across wrap")
+
+def test_irregular_spacing():
+    """A pause in the data must be found, and only ranges across it treated as uneven"""
+    print("\n=== Irregular Spacing ===")
+
+    index = SampleIndex(20000)
+    index.push(np.arange(10000, dtype='f8') * 0.001)
+    index.push(np.array([10.999]))
+    assert index.uniform(0, 9999), "Steady samples should be uniform"
+    assert not index.uniform(0, 10000), "A range across the pause should not be uniform"
+    assert index.ordered(0), "The pause keeps x increasing"
+    assert index.find(5.0) == 5000, "Search should follow the stored x, not the last step"
+
+    for i in range(1, 5):
+        index.push(np.array([10.999 + i * 0.001]))
+    assert index.uniform(10001, 10004), "Steady samples after the pause should be uniform again"
+
+    index.push(np.array([1.0]))
+    assert not index.ordered(0), "x going backwards should be recorded"
+    print("✓ Irregular spacing")
+
+def test_running_step():
+    """Single-sample pushes must be checked against the running step and follow a rate change"""
+    print("\n=== Running Step ===")
+
+    index = SampleIndex(1000)
+    x = np.cumsum(np.tile([0.9, 1.1, 1.0, 1.2, 0.8], 20))  # Jittered, around a step of 1
+    for value in x:
+        index.push(np.array([value]))
+    assert index.uniform(0, len(x) - 1), "Jitter within the tolerance should stay uniform"
+
+    for i in range(1, 6):
+        index.push(np.array([x[-1] + 2.0 * i]))
+    assert index.irregular == [len(x)], f"Only the first step at the new rate should be irregular, got {index.irregular}"
+    assert index.uniform(len(x), len(x) + 4), "The new rate should be adopted"
+    print("✓ Running step")
+
+def run_all_tests():
+    print("\n" + "="*50)
+    print("Running e2D Stream Culling Tests (Headless)")
+    print("="*50)
+
+    test_find_across_wrap()
+    test_irregular_spacing()
+    test_running_step()
+
+    print("\n" + "="*50)
+    print("✓ ALL STREAM CULLING TESTS PASSED")
+    print("="*50)
+
+if __name__ == "__main__":
+    run_all_tests()
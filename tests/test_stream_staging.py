@@ -0,0 +1,95 @@
+"""
+Unit tests for e2D stream staging
+Tests the thread-safe CPU staging ring of GpuStream without a GL context (headless)
+"""
+
+import threading
+import numpy as np
+from e2D.plots import Backpressure, StagingRing
+
+def points(start, count):
+    """(count, 2) points whose x is a running index."""
+    data = np.zeros((count, 2), dtype='f4')
+    data[:, 0] = np.arange(start, start + count)
+    return data
+
+def test_append_and_swap():
+    """Test staging and draining in order"""
+    print("\n=== Append / Swap ===")
+
+    ring = StagingRing(8)
+    assert ring.append(points(0, 3)) == 3, "Should accept points that fit"
+    assert ring.append(points(3, 2)) == 2, "Should accept points that fit"
+    assert ring.pending == 5, "Pending should count staged points"
+
+    drained = ring.swap()
+    assert drained[:, 0].tolist() == [0, 1, 2, 3, 4], "Swap should return staged points in order"
+    assert ring.pending == 0 and len(ring.swap()) == 0, "Swap should leave the ring empty"
+    print("✓ Append / swap")
+
+def test_drop_policies():
+    """Test the non-blocking backpressure policies"""
+    print("\n=== Drop Policies ===")
+
+    ring = StagingRing(4, policy=Backpressure.DROP_OLDEST)
+    ring.append(points(0, 3))
+    assert ring.append(points(3, 3)) == 3, "Drop oldest should accept every new point"
+    assert ring.swap()[:, 0].tolist() == [2, 3, 4, 5], "Drop oldest should keep the newest points"
+    ring.append(points(0, 10))
+    assert ring.swap()[:, 0].tolist() == [6, 7, 8, 9], "Oversized append should keep its tail"
+    assert ring.dropped == 2 + 6, "Dropped points should be counted"
+
+    ring = StagingRing(4, policy=Backpressure.DROP_NEWEST)
+    ring.append(points(0, 3))
+    assert ring.append(points(3, 3)) == 1, "Drop newest should only accept what fits"
+    assert ring.swap()[:, 0].tolist() == [0, 1, 2, 3], "Drop newest should keep the staged points"
+    assert ring.dropped == 2 and ring.appended == 4, "Counters should match accepted and rejected points"
+    print("✓ Drop policies")
+
+def test_threaded_producers():
+    """Producers on several threads must not lose or reorder points with the blocking policy"""
+    print("\n=== Threaded Producers ===")
+
+    ring = StagingRing(256, policy=Backpressure.BLOCK, timeout=5.0)
+    producers, chunks, chunk = 4, 200, 37
+
+    def produce(index):
+        for i in range(chunks):
+            data = points(i * chunk, chunk)
+            data[:, 1] = index
+            ring.append(data)
+
+    threads = [threading.Thread(target=produce, args=(i,)) for i in range(producers)]
+    for thread in threads:
+        thread.start()
+
+    received = []
+    while any(thread.is_alive() for thread in threads) or ring.pending:
+        received.append(ring.swap().copy())
+    for thread in threads:
+        thread.join()
+    received.append(ring.swap().copy())
+    received = np.concatenate(received)
+
+    assert ring.dropped == 0, "Blocking policy should never drop"
+    assert len(received) == producers * chunks * chunk, "Every point should be drained"
+    for index in range(producers):
+        xs = received[received[:, 1] == index, 0]
+        assert np.array_equal(xs, np.arange(chunks * chunk)), f"Producer {index} points out of order"
+    print("✓ Threaded producers")
+
+def run_all_tests():
+    print("\n" + "="*50)
+    print("Running e2D Stream Staging Tests (Headless)")
+    print("="*50)
+
+    test_append_and_swap()
+    test_drop_policies()
+    test_threaded_producers()
+
+    print("\n" + "="*50)
+    print("✓ ALL STREAM STAGING TESTS PASSED")
+    print("="*50)
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,125 @@
+"""
+Unit tests for e2D text rendering that need a GPU
+Runs on a standalone OpenGL 4.3 context and skips every test when none can be created
+"""
+
+import os
+import tempfile
+import moderngl
+import numpy as np
+import pytest
+from PIL import ImageFont
+from e2D.text_renderer import TextRenderer
+
+def create_context():
+    """Standalone OpenGL 4.3 context, None when the driver cannot provide one."""
+    for backend in (None, 'egl'):
+        try:
+            options = {'backend': backend} if backend else {}
+            return moderngl.create_standalone_context(require=430, **options)
+        except Exception:
+            continue
+    return None
+
+def require_context():
+    """Standalone OpenGL 4.3 context, skipping the test when there is none."""
+    ctx = create_context()
+    if ctx is None:
+        pytest.skip("No OpenGL 4.3 context")
+    return ctx
+
+def write_font(folder: str) -> str:
+    """Write Pillow's built-in TrueType font to a file, skipping the test when Pillow only has a bitmap font."""
+    source = getattr(ImageFont.load_default(), 'path', None)
+    if not hasattr(source, 'getvalue'):
+        pytest.skip("Pillow has no built-in TrueType font")
+    path = os.path.join(folder, "font.ttf")
+    with open(path, 'wb') as f:
+        f.write(source.getvalue())
+    return path
+
+def layer_pixels(atlas) -> np.ndarray:
+    """Read an atlas' layer of its texture array back, cropped to the atlas size."""
+    array = atlas.array
+    data = np.frombuffer(array.texture.read(), dtype=np.uint8).reshape(array.capacity, array.height, array.width)
+    return data[atlas.layer, :atlas.height, :atlas.width]
+
+def test_atlas_arrays_by_width():
+    """Atlases of different widths must live in separate, tightly sized texture arrays"""
+    print("\n=== Atlas Arrays By Width ===")
+
+    ctx = require_context()
+    with tempfile.TemporaryDirectory() as folder:
+        font = write_font(folder)
+        renderer = TextRenderer(ctx)
+        small = renderer._get_or_create_font_atlas(font, 12)
+        other = renderer._get_or_create_font_atlas(font, 13)
+        large = renderer._get_or_create_font_atlas(font, 64)
+
+    assert small.width < large.width and small.array is not large.array, "A large font should get its own array"
+    for width, array in renderer.atlas_arrays.items():
+        assert all(atlas.width == width for atlas in array.atlases), "Arrays should only hold atlases of their width"
+        assert array.width == width, "Layers should not be wider than their atlases"
+        assert array.height == max(atlas.height for atlas in array.atlases), "Layers should be as tall as the tallest atlas"
+        assert [atlas.layer for atlas in array.atlases] == list(range(len(array.atlases))), "Layers should follow the add order"
+        assert array.texture.size == (array.width, array.height, array.capacity), "Texture should match the bookkeeping"
+    if other.width == small.width:
+        assert other.array is small.array and other.layer == small.layer + 1, "Atlases of one width should share an array"
+
+    # Growing an atlas rebuilds its array without losing the other layers
+    height = small.height
+    small.request("".join(chr(c) for c in range(0x100, 0x300)))
+    assert small.height > height and small.array.height == small.height, "The array should follow the grown atlas"
+    for atlas in small.array.atlases:
+        assert np.array_equal(layer_pixels(atlas), atlas.bitmap), "Every layer should match its atlas after a rebuild"
+    assert np.array_equal(layer_pixels(large), large.bitmap), "Other arrays should be untouched"
+    ctx.release()
+    print("✓ Atlas arrays by width")
+
+def test_atlas_disk_cache():
+    """Atlases saved to the disk cache must load back, and size or charset changes must miss"""
+    print("\n=== Atlas Disk Cache ===")
+
+    ctx = require_context()
+    with tempfile.TemporaryDirectory() as folder:
+        font = write_font(folder)
+        cache = os.path.join(folder, "cache")
+
+        assert TextRenderer(ctx).atlas_cache_dir is None, "The disk cache should be opt-in"
+        first = TextRenderer(ctx, atlas_cache_dir=cache)
+        saved = first._get_or_create_font_atlas(font, 16)
+        files = sorted(os.listdir(cache))
+        assert len(files) == 2 and files[0].endswith('.json') and files[1].endswith('.npy'), f"Should save bitmap and metadata, got {files}"
+
+        second = TextRenderer(ctx, atlas_cache_dir=cache)
+        key = second._atlas_disk_key(saved.font, 16)
+        loaded = second._load_cached_atlas(key)
+        assert loaded is not None, "Saved atlas should load"
+        bitmap, meta = loaded
+        assert np.array_equal(bitmap, saved.bitmap) and meta == saved.to_cache_meta(), "Loaded atlas should match the saved one"
+        restored = second._get_or_create_font_atlas(font, 16)
+        assert restored.char_data.keys() == saved.char_data.keys(), "Restored atlas should know every preloaded glyph"
+        assert np.array_equal(layer_pixels(restored), saved.bitmap), "Restored atlas should upload the cached bitmap"
+
+        assert second._atlas_disk_key(saved.font, 17) != key, "Another size should use another entry"
+        second.chars = second.chars + "é"
+        assert second._atlas_disk_key(saved.font, 16) != key, "Another charset should use another entry"
+        second._get_or_create_font_atlas(font, 20)
+        assert len(os.listdir(cache)) == 4, "A cache miss should save a new entry"
+    ctx.release()
+    print("✓ Atlas disk cache")
+
+def run_all_tests():
+    print("\n" + "="*50)
+    print("Running e2D Text GPU Tests")
+    print("="*50)
+
+    test_atlas_arrays_by_width()
+    test_atlas_disk_cache()
+
+    print("\n" + "="*50)
+    print("✓ ALL TEXT GPU TESTS PASSED")
+    print("="*50)
+
+if __name__ == "__main__":
+    run_all_tests()
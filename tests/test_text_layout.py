@@ -0,0 +1,112 @@
+"""
+Unit tests for e2D paragraph layout
+Tests word wrapping of TextRenderer without requiring a window (headless)
+"""
+
+from e2D import TextRenderer
+from e2D.text_renderer import TextAlign, TextLayout, DEFAULT_16_TEXT_STYLE
+
+class FixedWidthAtlas:
+    """Stand-in for GlyphAtlas where every character advances 10px."""
+    line_height = 10.0
+    layer = 0
+
+    def measure(self, text: str) -> float:
+        return 10.0 * len(text)
+
+    def request(self, text: str) -> dict[str, dict]:
+        return {char: {'w': 10, 'h': 10, 'uv': (0.0, 0.0, 1.0, 1.0)} for char in text}
+
+    def pin(self, text: str) -> None:
+        pass
+
+def headless_renderer():
+    """TextRenderer laying out with FixedWidthAtlas, without a GL context."""
+    renderer = TextRenderer.__new__(TextRenderer)
+    renderer.ctx = None
+    atlas = FixedWidthAtlas()
+    renderer._get_or_create_font_atlas = lambda font, size: atlas
+    return renderer
+
+def break_lines(text, max_width, start=0):
+    lines = TextRenderer._break_lines(FixedWidthAtlas(), text, start, max_width, 1.0)
+    return [text[s:e] for s, e, _ in lines]
+
+def test_word_wrap():
+    """Test greedy wrapping on word boundaries"""
+    print("\n=== Word Wrap ===")
+    
+    assert break_lines("aaa bbb ccc", 70) == ["aaa bbb", "ccc"], "Should wrap before the word that overflows"
+    assert break_lines("aaa bbb ccc", 110) == ["aaa bbb ccc"], "Should fit on one line"
+    assert break_lines("aaa bbb ccc", None) == ["aaa bbb ccc"], "No wrap width should never wrap"
+    
+    lines = TextRenderer._break_lines(FixedWidthAtlas(), "aaa bbb ccc", 0, 70, 1.0)
+    assert [w for _, _, w in lines] == [70.0, 30.0], "Trailing spaces shouldn't count in the line width"
+    print("✓ Word wrap")
+
+def test_newlines_and_spaces():
+    """Test explicit line breaks and leading whitespace"""
+    print("\n=== Newlines ===")
+    
+    assert break_lines("aaa\nbbb", None) == ["aaa", "bbb"], "Newline should start a new line"
+    assert break_lines("aaa\n", None) == ["aaa", ""], "Trailing newline should leave an empty last line"
+    assert break_lines("  aa\nbb", None) == ["  aa", "bb"], "Paragraph indentation should be kept"
+    assert break_lines("aaa    bbb", 50) == ["aaa", "bbb"], "Spaces after a wrap should be dropped"
+    print("✓ Newlines")
+
+def test_hard_wrap():
+    """Test words wider than the wrap width"""
+    print("\n=== Hard Wrap ===")
+    
+    assert break_lines("abcdefgh", 30) == ["abc", "def", "gh"], "Long word should be split between characters"
+    assert break_lines("a abcdefgh", 30) == ["a", "abc", "def", "gh"], "Long word should start on its own line"
+    print("✓ Hard wrap")
+
+def test_relayout_from_line_start():
+    """Laying out again from a line start must match the full layout"""
+    print("\n=== Incremental Layout ===")
+    
+    text = "aaa bbb ccc ddd\n  eee fff"
+    full = TextRenderer._break_lines(FixedWidthAtlas(), text, 0, 70, 1.0)
+    for index, (start, _, _) in enumerate(full):
+        partial = TextRenderer._break_lines(FixedWidthAtlas(), text, start, 70, 1.0)
+        assert partial == full[index:], f"Relayout from line {index} differs"
+    print("✓ Incremental layout")
+
+def test_append_text():
+    """Appending text piece by piece must match laying it out at once"""
+    print("\n=== Append Text ===")
+    
+    renderer = headless_renderer()
+    text = "first entry\nsecond entry is longer\n  third\n"
+    full = renderer.layout_text(text, (0, 0), max_width=100, align=TextAlign.LEFT, style=DEFAULT_16_TEXT_STYLE)
+    
+    streamed = TextLayout(renderer, (0, 0), 100, TextAlign.LEFT, 1.2, 1.0, DEFAULT_16_TEXT_STYLE)
+    for char in text:
+        renderer.append_text(streamed, char)
+    assert len(streamed._chunks) == len(text), "Appends should be kept as chunks until the text is read"
+    assert streamed.lines == full.lines, "Streamed lines should match the one-shot layout"
+    assert streamed.vertex_count == full.vertex_count, "Streamed glyphs should match the one-shot layout"
+    assert streamed.text == text and len(streamed._chunks) == 1, "Reading the text should join the chunks once"
+    
+    renderer.append_text(streamed, "fourth")
+    assert streamed._text_from(len(text) - 1) == "\nfourth", "Tail should span the chunks after the offset"
+    print("✓ Append text")
+
+def run_all_tests():
+    print("\n" + "="*50)
+    print("Running e2D Text Layout Tests (Headless)")
+    print("="*50)
+    
+    test_word_wrap()
+    test_newlines_and_spaces()
+    test_hard_wrap()
+    test_relayout_from_line_start()
+    test_append_text()
+    
+    print("\n" + "="*50)
+    print("✓ ALL TEXT LAYOUT TESTS PASSED")
+    print("="*50)
+
+if __name__ == "__main__":
+    run_all_tests()